@@ -1,6 +1,5 @@
 """Finding best PSO parameters for problems."""
 
-import math
 from py_opt_collection.optimization import \
     Optimization, MultipleSolving
 from py_opt_collection.pso import PSO
@@ -35,8 +34,8 @@ class PSO4PSO(object):
     def _ms_gen(self, x):
         core_pso = PSO(
             optimization_object=self.ori_opt_object,
-            no_particles=math.ceil(x[0]),
-            no_iteration_steps=math.ceil(x[1]),
+            no_particles=x[0],
+            no_iteration_steps=x[1],
             c_1=x[2],
             c_2=x[3]
         )
@@ -66,12 +65,13 @@ class PSO4PSO(object):
         opt_obj = Optimization(
             optimizing_function=self._optimizing_function,
             boundaries=[
-                (0, self.max_particles),
-                (0, self.max_iteration),
+                (1, self.max_particles),
+                (2, self.max_iteration),
                 (0, self.max_learning_factor),
                 (0, self.max_learning_factor)
             ],
             no_dimensions=4,
+            variable_types=['integer', 'integer', 'continuous', 'continuous'],
             find_max=False
         )
         opt_obj.add_constraint(self._constraint_function)
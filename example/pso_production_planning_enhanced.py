@@ -263,3 +263,20 @@ print("Result for 2nd case:")
 ms_2nd = MultipleSolving(pso_2nd, 10)
 ms_2nd.run()
 print(ms_2nd)
+
+# The 3rd year's resources change: the plan is solved again, warm started
+# from the plans found above instead of random ones, with fewer iteration
+# steps.
+year_3.resources = [45, 170, 40]
+pso_replan = PSO(
+    optimization_object=optimization_3_years,
+    no_particles=40,
+    no_iteration_steps=5,
+    c_1=2.0,
+    c_2=2.0,
+    warm_start=ms_2nd
+)
+print("Result for 2nd case, re-planned:")
+ms_replan = MultipleSolving(pso_replan, 10)
+ms_replan.run()
+print(ms_replan)
@@ -31,12 +31,6 @@ def optimizing_function(x):
     return x[0] * 40 + x[1] * 50
 
 
-def constraint(x):
-    return (x[0] + x[1] <= 50) & \
-           (x[0] * 3 + x[1] * 4 <= 180) & \
-           (x[1] <= 40)
-
-
 optimization = Optimization(
     optimizing_function=optimizing_function,
     boundaries=[(0, 100), (0, 100)],
@@ -44,7 +38,13 @@ optimization = Optimization(
     find_max=True
 )
 
-optimization.add_constraint(constraint)
+# Resources' consumption, as linear constraints: N, H, Cl.
+optimization.add_linear_constraints(
+    a_ub=[[1, 1],
+          [3, 4],
+          [0, 1]],
+    b_ub=[50, 180, 40]
+)
 
 pso = PSO(
     optimization_object=optimization,
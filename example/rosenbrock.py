@@ -11,6 +11,7 @@ import statistics
 import csv
 from py_opt_collection.optimization import MultipleSolving
 from py_opt_collection.pso import PSO
+from py_opt_collection.results_store import ResultsStore
 from py_opt_collection.test_functions import ROSENBROCK
 from multiprocessing.dummy import Pool
 
@@ -29,7 +30,10 @@ if __name__ == '__main__':
     parser.add_argument('-a', '--algorithm', required=True)
     parser.add_argument('-o', '--output-file', required=True,
                         type=argparse.FileType('w'))
+    parser.add_argument('-d', '--database', default=':memory:',
+                        help='SQLite file keeping every trial.')
     args = parser.parse_args()
+    store = ResultsStore(args.database)
 
     if args.algorithm.lower() == 'pso':
         test_cases = []
@@ -54,6 +58,7 @@ if __name__ == '__main__':
             )
             ms = MultipleSolving(pso, 200)
             ms.run(Pool())
+            store.add(ms, problem='rosenbrock', configuration=test_case)
             writer.writerow([
                 # Particles
                 test_case['no_particles'],
@@ -70,3 +75,4 @@ if __name__ == '__main__':
             ])
 
         args.output_file.close()
+    store.close()
@@ -0,0 +1,184 @@
+"""
+This module contains the evaluation archive. Every evaluated position is
+kept together with its value and feasibility in growable arrays, and indexed
+by a k-d tree so duplicated (or nearly duplicated) positions do not have to
+be evaluated again, and nearest evaluated positions can be queried by
+surrogates and diagnostics.
+"""
+
+import heapq
+import math
+from array import array
+
+
+class EvaluationArchive(object):
+    """Archive of evaluated positions. Positions are stored flat in one
+    array of doubles, the k-d tree nodes are the archive's indexes, linked
+    through arrays of children."""
+
+    def __init__(self, no_dimensions, tolerance=0.0):
+        """
+        :param no_dimensions: Number of dimensions of the positions.
+        :type no_dimensions: int
+        :param tolerance: Distance under which two positions are considered
+        as duplicated, default is 0.0 (exact duplicates only).
+        :type tolerance: float
+        """
+
+        self.no_dimensions = no_dimensions
+        self.tolerance = tolerance
+        self.positions = array('d')
+        self.values = array('d')
+        self.feasible = array('b')
+        self._exact = dict()
+        self._left = array('l')
+        self._right = array('l')
+        self._split = array('l')
+
+    def __len__(self):
+        return len(self.values)
+
+    def position(self, index):
+        """
+        Get an archived position.
+
+        :param index: Index of the position.
+        :type index: int
+        :rtype: list[float]
+        """
+
+        start = index * self.no_dimensions
+        return self.positions[start:start + self.no_dimensions].tolist()
+
+    def add(self, position, value, feasible=True):
+        """
+        Archive an evaluated position.
+
+        :param position: Evaluated position.
+        :type position: list[number]
+        :param value: Its value.
+        :type value: number
+        :param feasible: The position satisfies the constraints or not.
+        :type feasible: bool
+        :return: Index of the position in the archive.
+        :rtype: int
+        """
+
+        index = len(self.values)
+        self.positions.extend(position)
+        self.values.append(value)
+        self.feasible.append(feasible)
+        self._exact.setdefault(tuple(position), index)
+        self._left.append(-1)
+        self._right.append(-1)
+
+        depth = 0
+        if index:
+            node = 0
+            while True:
+                split = self._split[node]
+                children = self._left \
+                    if position[split] < self.positions[
+                        node * self.no_dimensions + split
+                    ] else self._right
+                depth += 1
+                if children[node] < 0:
+                    children[node] = index
+                    break
+                node = children[node]
+        self._split.append(depth % self.no_dimensions)
+        return index
+
+    def lookup(self, position, tolerance=None):
+        """
+        Find an archived duplicate of a position.
+
+        :param position: Position to look for.
+        :type position: list[number]
+        :param tolerance: Maximum distance of a duplicate, default is the
+        archive's tolerance.
+        :type tolerance: float
+        :return: Index of the duplicate, None if there is not.
+        :rtype: int
+        """
+
+        index = self._exact.get(tuple(position), None)
+        if index is not None:
+            return index
+        tolerance = self.tolerance if tolerance is None else tolerance
+        if tolerance > 0.0 and self.values:
+            distance, index = self.nearest(position, 1)[0]
+            if distance <= tolerance:
+                return index
+        return None
+
+    def nearest(self, position, no_neighbors=1):
+        """
+        Find the nearest archived positions.
+
+        :param position: Position to look around.
+        :type position: list[number]
+        :param no_neighbors: Number of positions to find.
+        :type no_neighbors: int
+        :return: Distances and indexes of the nearest positions, from the
+        nearest.
+        :rtype: list[tuple[float, int]]
+        """
+
+        # Max-heap (negative distances) of the best candidates found.
+        found = list()
+        stack = [0] if self.values else []
+        no_dimensions = self.no_dimensions
+        positions = self.positions
+        while stack:
+            node = stack.pop()
+            start = node * no_dimensions
+            distance = math.sqrt(sum(
+                (position[i] - positions[start + i]) ** 2
+                for i in range(no_dimensions)
+            ))
+            if len(found) < no_neighbors:
+                heapq.heappush(found, (-distance, -node))
+            elif distance < -found[0][0]:
+                heapq.heapreplace(found, (-distance, -node))
+
+            split = self._split[node]
+            diff = position[split] - positions[start + split]
+            near, far = (self._left[node], self._right[node]) \
+                if diff < 0 else (self._right[node], self._left[node])
+            if far >= 0 and (len(found) < no_neighbors or
+                             abs(diff) < -found[0][0]):
+                stack.append(far)
+            if near >= 0:
+                stack.append(near)
+        return sorted((-distance, -node) for distance, node in found)
+
+    def within(self, position, radius):
+        """
+        Find every archived position within a distance.
+
+        :param position: Position to look around.
+        :type position: list[number]
+        :param radius: Maximum distance.
+        :type radius: float
+        :return: Indexes of the positions.
+        :rtype: list[int]
+        """
+
+        ret = list()
+        stack = [0] if self.values else []
+        no_dimensions = self.no_dimensions
+        positions = self.positions
+        while stack:
+            node = stack.pop()
+            start = node * no_dimensions
+            if sum((position[i] - positions[start + i]) ** 2
+                   for i in range(no_dimensions)) <= radius ** 2:
+                ret.append(node)
+            split = self._split[node]
+            diff = position[split] - positions[start + split]
+            if self._left[node] >= 0 and diff - radius < 0:
+                stack.append(self._left[node])
+            if self._right[node] >= 0 and diff + radius >= 0:
+                stack.append(self._right[node])
+        return sorted(ret)
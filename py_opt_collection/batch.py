@@ -0,0 +1,233 @@
+"""
+This module contains the vectorized state of PSO trials run in lockstep
+(see PSO.solve_batch()). The swarms of all the trials are kept as
+(tries, particles, dimensions) NumPy arrays and moved together by array
+operations, so an iteration step of every trial costs a few array
+operations instead of a Python loop over each particle of each trial. Each
+trial keeps its own random stream, seeded from its random generator, and its
+own local and global bests.
+
+NumPy is an optional dependency. Without it, or for features the vectorized
+state does not cover (constraints, discrete variables, archive, surrogate,
+neighborhoods, ...), the trials run in lockstep with the Python
+implementation of the particles.
+"""
+
+from importlib.util import find_spec
+from .optimization import MAX_SPAWNS
+
+
+def is_available():
+    """
+    :return: NumPy is installed or not, it is not imported.
+    :rtype: bool
+    """
+
+    return find_spec('numpy') is not None
+
+
+def is_supported(pso):
+    """
+    Tell if the swarms of a PSO object can be kept in arrays, by this
+    module or by the compiled kernel of py_opt_collection.jit: they do not
+    cover the features which need the particles' objects.
+
+    :param pso: The PSO object.
+    :type pso: py_opt_collection.pso.PSO
+    :rtype: bool
+    """
+
+    optimization = pso.optimization_object
+    return pso.surrogate is None and pso.local_search is None and \
+        pso.restart_after is None and not hasattr(pso, 'snapshots') and \
+        not optimization.constraints and not optimization.discrete_dims and \
+        optimization.linear_constraints is None and \
+        optimization.archive is None and optimization.profiler is None
+
+
+def create_batch(pso, trials):
+    """
+    Create the vectorized state of trials, if NumPy is installed and the
+    state supports their configuration.
+
+    :param pso: PSO object the trials have been copied from.
+    :type pso: py_opt_collection.pso.PSO
+    :param trials: Trials whose particles have been spawned and evaluated.
+    :type trials: list[py_opt_collection.pso.PSO]
+    :return: The vectorized state, None if the particles must be moved one
+    by one.
+    :rtype: TrialsBatch
+    """
+
+    if not is_available() or not is_supported(pso) or \
+            any(trial.neighborhoods is not None for trial in trials) or \
+            pso.history_file is not None:
+        return None
+    return TrialsBatch(trials)
+
+
+class TrialsBatch(object):
+    """Arrays of the trials' swarms (positions, velocities, local bests and
+    values) updated together. The trials' bests are updated every iteration
+    step, their particles' objects only by sync()."""
+
+    def __init__(self, trials):
+        """
+        :param trials: Trials whose particles have been spawned and
+        evaluated.
+        :type trials: list[py_opt_collection.pso.PSO]
+        """
+
+        # pylint: disable=import-outside-toplevel,import-error
+        import numpy
+        self.numpy = numpy
+        self.positions = numpy.array(
+            [[particle.position for particle in trial.particles]
+             for trial in trials], dtype=float
+        )
+        self.velocities = numpy.array(
+            [[particle.velocity for particle in trial.particles]
+             for trial in trials], dtype=float
+        )
+        self.best_positions = numpy.array(
+            [[particle.best[1] for particle in trial.particles]
+             for trial in trials], dtype=float
+        )
+        self.best_values = numpy.array(
+            [[particle.best[0] for particle in trial.particles]
+             for trial in trials], dtype=float
+        )
+        self.values = numpy.array(
+            [[particle.value for particle in trial.particles]
+             for trial in trials], dtype=float
+        )
+        template = trials[0]
+        self.find_max = template.find_max
+        self.lower = numpy.array(
+            [lower for lower, _upper in template.boundaries], dtype=float
+        )
+        self.upper = numpy.array(
+            [upper for _lower, upper in template.boundaries], dtype=float
+        )
+        rule = template.velocity_rule
+        self.max_velocity = numpy.array(
+            rule.max_velocity if rule.max_velocity is not None
+            else [float('inf')] * template.no_dimensions, dtype=float
+        )
+        self.constriction = rule.constriction_factor \
+            if rule.constriction_factor is not None else 1.0
+        self.learning_factors = template.learning_factors
+        # pylint: disable=no-member
+        self.random_states = [
+            numpy.random.RandomState(trial.random_generator.getrandbits(32))
+            for trial in trials
+        ]
+
+    def step(self, trials, evaluate):
+        """
+        Move and evaluate the swarms of every trial, then update the trials'
+        bests.
+
+        :param trials: The trials, in the order of the arrays.
+        :type trials: list[py_opt_collection.pso.PSO]
+        :param evaluate: Function returning the values of a list of
+        positions, in order.
+        :type evaluate: (list[list[float]]) -> list[number]
+        :return: Number of particles which improved their local best, for
+        each trial.
+        :rtype: list[int]
+        """
+
+        numpy = self.numpy
+        no_tries, no_particles, no_dimensions = self.positions.shape
+        # One pair of random factors per particle, as Particle draws them.
+        factors = numpy.array([
+            random_state.random_sample((no_particles, 2))
+            for random_state in self.random_states
+        ])
+        weights = numpy.array(
+            [trial.velocity_rule.weight for trial in trials], dtype=float
+        )[:, None, None]
+        social = numpy.array([trial.best[1] for trial in trials],
+                             dtype=float)[:, None, :]
+        self.velocities = self.constriction * (
+            weights * self.velocities +
+            self.learning_factors[0] * factors[:, :, :1] *
+            (self.best_positions - self.positions) +
+            self.learning_factors[1] * factors[:, :, 1:] *
+            (social - self.positions)
+        )
+        numpy.clip(self.velocities, -self.max_velocity, self.max_velocity,
+                   out=self.velocities)
+        self._keep_inside()
+
+        values = numpy.array(
+            evaluate(self.positions.reshape(-1, no_dimensions).tolist()),
+            dtype=float
+        ).reshape(no_tries, no_particles)
+        self.values = values
+        if self.find_max:
+            improved = values > self.best_values
+        else:
+            improved = values < self.best_values
+        self.best_values[improved] = values[improved]
+        self.best_positions[improved] = self.positions[improved]
+
+        best_indexes = values.argmax(axis=1) if self.find_max \
+            else values.argmin(axis=1)
+        for i, (trial, best_index) in enumerate(zip(trials, best_indexes)):
+            value = float(values[i, best_index])
+            if (self.find_max and value > trial.best[0]) or \
+                    (not self.find_max and value < trial.best[0]):
+                trial.best = (value, self.positions[i, best_index].tolist())
+        return improved.sum(axis=1).tolist()
+
+    def sync(self, trials):
+        """
+        Write the arrays back into the trials' particles.
+
+        :param trials: The trials, in the order of the arrays.
+        :type trials: list[py_opt_collection.pso.PSO]
+        """
+
+        for i, trial in enumerate(trials):
+            for j, particle in enumerate(trial.particles):
+                particle.position = self.positions[i, j].tolist()
+                particle.velocity = self.velocities[i, j].tolist()
+                particle.value = float(self.values[i, j])
+                particle.best = (float(self.best_values[i, j]),
+                                 self.best_positions[i, j].tolist())
+
+    def _keep_inside(self):
+        """Move the particles, repairing the moves leaving the boundaries as
+        Particle.repair() does: the velocity is halved up to 5 times, then
+        drawn again, and the particles still leaving them after MAX_SPAWNS
+        tries stay where they are."""
+        numpy = self.numpy
+        no_dimensions = self.positions.shape[2]
+        scale = max(self.learning_factors)
+        outside = self._outside()
+        retry = 0
+        while outside.any() and retry < MAX_SPAWNS:
+            if retry < 5:
+                self.velocities[outside] *= 0.5
+            else:
+                for i, random_state in enumerate(self.random_states):
+                    count = int(outside[i].sum())
+                    if count:
+                        self.velocities[i, outside[i]] = numpy.clip(
+                            (random_state.random_sample((count,
+                                                         no_dimensions)) -
+                             0.5) * scale,
+                            -self.max_velocity, self.max_velocity
+                        )
+            retry += 1
+            outside = self._outside()
+        self.velocities[outside] = 0.0
+        self.positions = self.positions + self.velocities
+
+    def _outside(self):
+        """Particles whose move leaves the boundaries."""
+        next_positions = self.positions + self.velocities
+        return ((next_positions < self.lower) |
+                (next_positions > self.upper)).any(axis=2)
@@ -0,0 +1,410 @@
+"""
+CMA-ES stand for Covariance Matrix Adaptation Evolution Strategy. Candidates
+are sampled from a multivariate normal distribution whose mean, step size
+and covariance matrix are adapted from the best candidates of each
+generation. For more please read https://arxiv.org/abs/1604.00772
+"""
+
+import math
+from importlib.util import find_spec
+from .optimization import AlgorithmObject
+from .profiling import SPAWN_REROLLS
+from .utils import symmetric_eigen
+
+
+IPOP = 'ipop'
+BIPOP = 'bipop'
+RESTART_STRATEGIES = (None, IPOP, BIPOP)
+
+
+class CMAES(AlgorithmObject):
+    """This class will be the AlgorithmObject for CMA-ES.
+
+    With separable=True, only the diagonal of the covariance matrix is
+    learnt (sep-CMA-ES): sampling and updates are linear in the number of
+    dimensions instead of quadratic, with an eigen decomposition never
+    needed, which is the variant to use for large dimensions.
+
+    With restarts='ipop' the search is restarted with a doubled population
+    whenever it stagnates; 'bipop' interleaves those runs with runs of small
+    populations and small step sizes, giving both regimes the same budget.
+    The best found over all runs is kept.
+
+    If NumPy is installed, the full covariance matrix is kept as an array:
+    a generation is sampled by one matrix product and the matrix is updated
+    and decomposed by NumPy, else by the Python implementation."""
+
+    def __init__(self, optimization_object, **kwargs):
+        """
+
+        :param optimization_object: Initialized Optimization object.
+        :type optimization_object: PyOptCollection.optimization.Optimization
+        :param no_iteration_steps: Total number of generations (over all
+        restarts), default is 100.
+        :type no_iteration_steps: int
+        :param population_size: Number of candidates of each generation,
+        default is 4 + 3 * ln(no_dimensions).
+        :type population_size: int
+        :param sigma: Starting step size, default is 0.3 times the mean width
+        of the boundaries.
+        :type sigma: float
+        :param separable: Only learn the diagonal of the covariance matrix,
+        default is False.
+        :type separable: bool
+        :param restarts: Restart strategy: None, 'ipop' or 'bipop'. Default
+        is None.
+        :type restarts: str
+        :param max_restarts: Maximum number of restarts, default is 9.
+        :type max_restarts: int
+        :param tolerance: Stagnation tolerance on the best values of the last
+        generations, default is 1e-12.
+        :type tolerance: float
+        :param pool: Object with a map() function used to evaluate the
+        candidates when the optimization has no batch function.
+        :param kwargs:
+        """
+
+        AlgorithmObject.__init__(self, optimization_object, **kwargs)
+        self.no_iteration_steps = kwargs.get('no_iteration_steps', 100)
+        self.population_size = kwargs.get(
+            'population_size',
+            4 + int(3 * math.log(self.no_dimensions))
+        )
+        self.sigma = kwargs.get('sigma', 0.3 * sum(
+            upper - lower for lower, upper in self.boundaries
+        ) / self.no_dimensions)
+        self.separable = kwargs.get('separable', False)
+        self.restarts = kwargs.get('restarts', None)
+        self.max_restarts = kwargs.get('max_restarts', 9)
+        self.tolerance = kwargs.get('tolerance', 1e-12)
+        self.pool = kwargs.get('pool', None)
+        if self.restarts not in RESTART_STRATEGIES:
+            raise ValueError("Unknown restart strategy '%s'." % self.restarts)
+
+        self.state = None
+        self.no_restarts = 0
+        # IPOP/BIPOP bookkeeping: the large regime's population size, the
+        # evaluations spent in each regime and the current regime.
+        self.large_population = self.population_size
+        self.budgets = {'large': 0, 'small': 0}
+        self.regime = 'large'
+
+    def _start_solving(self):
+        self.current_iteration_step = 0
+        self.no_restarts = 0
+        self.large_population = self.population_size
+        self.budgets = {'large': 0, 'small': 0}
+        self.regime = 'large'
+        self.state = _CMAState(self, self.population_size, self.sigma)
+
+    def _iterate(self):
+        self._cma_do_iter()
+        self.budgets[self.regime] += self.state.population_size
+        if self.verbose:
+            print("Iteration step #%d, best value: %s" % (
+                self.current_iteration_step, self.best
+            ))
+        self.current_iteration_step += 1
+
+        if self.restarts is None or \
+                self.no_restarts >= self.max_restarts or \
+                not self.state.is_stagnated(self.tolerance):
+            return
+        self.no_restarts += 1
+        if self.regime == 'large':
+            self.large_population *= 2
+        if self.restarts == BIPOP and \
+                self.budgets['small'] < self.budgets['large']:
+            self.regime = 'small'
+            factor = self.random_generator.random() ** 2
+            population_size = int(
+                self.population_size *
+                (0.5 * self.large_population / self.population_size) **
+                factor
+            )
+            sigma = self.sigma * 10 ** (-2 * factor)
+        else:
+            self.regime = 'large'
+            population_size = self.large_population
+            sigma = self.sigma
+        self.state = _CMAState(self, population_size, sigma)
+
+    def _cma_do_iter(self):
+        """For each generation, solve() function will make a call to this
+        function."""
+        candidates = self.state.sample()
+        feasible = [i for i, (_y, x) in enumerate(candidates)
+                    if x is not None]
+        values = self.optimization_object.evaluate_batch(
+            [candidates[i][1] for i in feasible], self.pool
+        )
+        ranked = sorted(zip(values, feasible),
+                        key=lambda item: item[0],
+                        reverse=self.find_max)
+        # Infeasible candidates are ranked after every feasible ones.
+        order = [i for _v, i in ranked] + \
+            [i for i in range(len(candidates)) if candidates[i][1] is None]
+        self.state.update([candidates[i][0] for i in order])
+        if ranked:
+            self.state.history.append(ranked[0][0])
+            value, index = ranked[0]
+            self._improve_best(value, candidates[index][1])
+
+        self._take_snapshot(self.state.mean, self.state.sigma, self.best)
+
+
+class _CMAState(object):
+    """Distribution and evolution paths of one CMA-ES run."""
+
+    def __init__(self, algorithm, population_size, sigma, vectorized=None):
+        """
+        :param algorithm: The CMAES object.
+        :type algorithm: CMAES
+        :param population_size: Number of candidates of each generation.
+        :type population_size: int
+        :param sigma: Starting step size.
+        :type sigma: float
+        :param vectorized: Keep the full covariance matrix as a NumPy array,
+        ignored if it is separable. Default is when NumPy is installed.
+        :type vectorized: bool
+        """
+
+        self.algorithm = algorithm
+        self.population_size = population_size
+        self.sigma = sigma
+        self.history = list()
+        self.generation = 0
+
+        size = algorithm.no_dimensions
+        random_generator = algorithm.random_generator
+        self.mean = [random_generator.uniform(lower, upper)
+                     for lower, upper in algorithm.boundaries]
+        self.no_parents = population_size // 2
+        weights = [math.log(self.no_parents + 0.5) - math.log(i + 1)
+                   for i in range(self.no_parents)]
+        self.weights = [w / sum(weights) for w in weights]
+        mueff = 1.0 / sum(w ** 2 for w in self.weights)
+        self.mueff = mueff
+
+        self.c_c = (4 + mueff / size) / (size + 4 + 2 * mueff / size)
+        self.c_s = (mueff + 2) / (size + mueff + 5)
+        self.c_1 = 2 / ((size + 1.3) ** 2 + mueff)
+        self.c_mu = min(1 - self.c_1, 2 * (mueff - 2 + 1 / mueff) /
+                        ((size + 2) ** 2 + mueff))
+        if algorithm.separable:
+            self.c_1 = min(1.0, self.c_1 * (size + 2) / 3.0)
+            self.c_mu = min(1 - self.c_1, self.c_mu * (size + 2) / 3.0)
+        self.damps = 1 + 2 * max(
+            0, math.sqrt((mueff - 1) / (size + 1)) - 1
+        ) + self.c_s
+        self.chi_n = math.sqrt(size) * \
+            (1 - 1.0 / (4 * size) + 1.0 / (21 * size ** 2))
+
+        self.p_c = [0.0] * size
+        self.p_s = [0.0] * size
+        if vectorized is None:
+            vectorized = find_spec('numpy') is not None
+        vectorized = vectorized and not algorithm.separable
+        self.vectorized = vectorized
+        self.random_state = None
+        if vectorized:
+            # pylint: disable=import-outside-toplevel,import-error
+            import numpy
+            self.covariance = numpy.identity(size)
+            self.eigen_basis = numpy.identity(size)
+            self.eigen_scales = numpy.ones(size)
+            # pylint: disable=no-member
+            self.random_state = numpy.random.RandomState(
+                random_generator.getrandbits(32)
+            )
+        else:
+            if algorithm.separable:
+                self.covariance = [1.0] * size
+            else:
+                self.covariance = [[float(i == j) for j in range(size)]
+                                   for i in range(size)]
+            self.eigen_basis = [[float(i == j) for j in range(size)]
+                                for i in range(size)]
+            self.eigen_scales = [1.0] * size
+        self.eigen_generation = 0
+
+    def sample(self):
+        """
+        Sample the candidates of a generation. Each of them is resampled up
+        to 10 times until it satisfies the constraints, its position is None
+        if it never does.
+
+        :return: Steps (in the distribution's coordinates) and positions.
+        :rtype: list[tuple[list[float], list[float]]]
+        """
+
+        algorithm = self.algorithm
+        optimization_object = algorithm.optimization_object
+        ret = list()
+        for step in self._sample_steps(self.population_size):
+            for retry in range(10):
+                if retry:
+                    step = self._sample_steps(1)[0]
+                position = optimization_object.discretize([
+                    min(max(m + self.sigma * y, lower), upper)
+                    for m, y, (lower, upper) in zip(
+                        self.mean, step, algorithm.boundaries
+                    )
+                ])
+                if optimization_object.check_constraints(position):
+                    break
+                if algorithm.profiler is not None and retry < 9:
+                    algorithm.profiler.count(SPAWN_REROLLS)
+            else:
+                ret.append((step, None))
+                continue
+            # Clipped and rounded positions are learnt as they have been
+            # evaluated.
+            ret.append(([(x - m) / self.sigma
+                         for x, m in zip(position, self.mean)], position))
+        return ret
+
+    def _sample_steps(self, number):
+        if self.vectorized:
+            scaled = self.random_state.standard_normal(
+                (number, len(self.mean))
+            ) * self.eigen_scales
+            return scaled.dot(self.eigen_basis.T).tolist()
+        return [self._sample_step() for _i in range(number)]
+
+    def _sample_step(self):
+        gauss = self.algorithm.random_generator.gauss
+        size = len(self.mean)
+        if self.algorithm.separable:
+            return [math.sqrt(c) * gauss(0.0, 1.0) for c in self.covariance]
+        scaled = [d * gauss(0.0, 1.0) for d in self.eigen_scales]
+        return [sum(self.eigen_basis[i][k] * scaled[k] for k in range(size))
+                for i in range(size)]
+
+    def update(self, steps):
+        """
+        Adapt the distribution from the steps of a generation, sorted from
+        the best.
+
+        :param steps: Steps of the candidates, from the best.
+        :type steps: list[list[float]]
+        """
+
+        size = len(self.mean)
+        self.generation += 1
+        parents = steps[:self.no_parents]
+        step_w = [sum(w * step[i] for w, step in zip(self.weights, parents))
+                  for i in range(size)]
+        self.mean = [m + self.sigma * y for m, y in zip(self.mean, step_w)]
+
+        factor = math.sqrt(self.c_s * (2 - self.c_s) * self.mueff)
+        whitened = self._inverse_sqrt_covariance(step_w)
+        self.p_s = [(1 - self.c_s) * p + factor * z
+                    for p, z in zip(self.p_s, whitened)]
+        norm_p_s = math.sqrt(sum(p ** 2 for p in self.p_s))
+        h_sig = norm_p_s / math.sqrt(
+            1 - (1 - self.c_s) ** (2 * self.generation)
+        ) / self.chi_n < 1.4 + 2.0 / (size + 1)
+        factor = h_sig * math.sqrt(self.c_c * (2 - self.c_c) * self.mueff)
+        self.p_c = [(1 - self.c_c) * p + factor * y
+                    for p, y in zip(self.p_c, step_w)]
+        self._update_covariance(parents, h_sig)
+
+        self.sigma *= math.exp(
+            (self.c_s / self.damps) * (norm_p_s / self.chi_n - 1)
+        )
+
+    def _update_covariance(self, parents, h_sig):
+        size = len(self.mean)
+        decay = 1 - self.c_1 - self.c_mu
+        correction = (1 - h_sig) * self.c_c * (2 - self.c_c)
+        if self.vectorized:
+            # pylint: disable=import-outside-toplevel,import-error
+            import numpy
+            p_c = numpy.array(self.p_c)
+            parents = numpy.array(parents)
+            # The rank-mu update is the weighted sum of the parents' outer
+            # products.
+            self.covariance = decay * self.covariance + self.c_1 * (
+                numpy.outer(p_c, p_c) + correction * self.covariance
+            ) + self.c_mu * (parents.T * self.weights).dot(parents)
+            self._update_eigen()
+        elif self.algorithm.separable:
+            self.covariance = [
+                decay * c + self.c_1 * (p ** 2 + correction * c) +
+                self.c_mu * sum(w * step[i] ** 2
+                                for w, step in zip(self.weights, parents))
+                for i, (c, p) in enumerate(zip(self.covariance, self.p_c))
+            ]
+        else:
+            for i in range(size):
+                row = self.covariance[i]
+                for j in range(i + 1):
+                    value = decay * row[j] + self.c_1 * (
+                        self.p_c[i] * self.p_c[j] + correction * row[j]
+                    ) + self.c_mu * sum(
+                        w * step[i] * step[j]
+                        for w, step in zip(self.weights, parents)
+                    )
+                    row[j] = self.covariance[j][i] = value
+            self._update_eigen()
+
+    def _update_eigen(self):
+        # The decomposition is O(n^3), it is only refreshed when the
+        # covariance matrix has changed enough.
+        size = len(self.mean)
+        if self.generation - self.eigen_generation < \
+                1.0 / (self.c_1 + self.c_mu) / size / 10.0:
+            return
+        self.eigen_generation = self.generation
+        if self.vectorized:
+            # pylint: disable=import-outside-toplevel,import-error
+            import numpy
+            eigenvalues, self.eigen_basis = numpy.linalg.eigh(self.covariance)
+            self.eigen_scales = numpy.sqrt(numpy.maximum(eigenvalues, 1e-20))
+            return
+        eigenvalues, self.eigen_basis = symmetric_eigen(self.covariance)
+        self.eigen_scales = [math.sqrt(max(value, 1e-20))
+                             for value in eigenvalues]
+
+    def _inverse_sqrt_covariance(self, vector):
+        size = len(vector)
+        if self.algorithm.separable:
+            return [v / math.sqrt(c) for v, c in zip(vector, self.covariance)]
+        if self.vectorized:
+            basis = self.eigen_basis
+            return basis.dot(
+                basis.T.dot(vector) / self.eigen_scales
+            ).tolist()
+        projected = [sum(self.eigen_basis[k][i] * vector[k]
+                         for k in range(size)) / self.eigen_scales[i]
+                     for i in range(size)]
+        return [sum(self.eigen_basis[i][k] * projected[k]
+                    for k in range(size))
+                for i in range(size)]
+
+    def is_stagnated(self, tolerance):
+        """
+        Tell if the run does not progress anymore: the best values of the
+        last generations are all within tolerance, or the step size has
+        become negligible, or the covariance matrix is ill-conditioned.
+
+        :param tolerance: Tolerance on the best values.
+        :type tolerance: float
+        :rtype: bool
+        """
+
+        size = len(self.mean)
+        window = 10 + int(30 * size / self.population_size)
+        if len(self.history) >= window and \
+                max(self.history[-window:]) - min(self.history[-window:]) \
+                <= tolerance:
+            return True
+        if self.algorithm.separable:
+            scales = [math.sqrt(c) for c in self.covariance]
+        else:
+            scales = self.eigen_scales
+        largest, smallest = float(max(scales)), float(min(scales))
+        if self.sigma * largest < tolerance:
+            return True
+        return largest > 1e7 * smallest
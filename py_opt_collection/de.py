@@ -0,0 +1,207 @@
+"""
+DE stand for Differential Evolution. A population based metaheuristic which
+creates new candidates by adding the weighted difference of two members to
+a third one, then crossing the result with the current member. For more
+please read https://en.wikipedia.org/wiki/Differential_evolution
+"""
+
+from .optimization import AlgorithmObject
+from .profiling import INFEASIBLE_REJECTIONS
+from .utils import is_better, numpy_random_state
+
+
+RAND_1_BIN = 'rand/1/bin'
+BEST_1_BIN = 'best/1/bin'
+CURRENT_TO_BEST_1_BIN = 'current-to-best/1/bin'
+STRATEGIES = (RAND_1_BIN, BEST_1_BIN, CURRENT_TO_BEST_1_BIN)
+
+
+class DE(AlgorithmObject):
+    """This class will be the AlgorithmObject for Differential Evolution.
+    The population is kept as a list of positions, every generation all the
+    trial positions are built first, then evaluated as one batch through
+    Optimization.evaluate_batch(). If NumPy is installed, the trial
+    positions of a generation are built as one array."""
+
+    def __init__(self, optimization_object, **kwargs):
+        """
+
+        :param optimization_object: Initialized Optimization object.
+        :type optimization_object: PyOptCollection.optimization.Optimization
+        :param no_individuals: Size of the population, at least 4. Default
+        is 20.
+        :type no_individuals: int
+        :param no_iteration_steps: Total number of generations, default is
+        50.
+        :type no_iteration_steps: int
+        :param strategy: Mutation strategy, rand/1/bin, best/1/bin or
+        current-to-best/1/bin. Default is rand/1/bin.
+        :type strategy: str
+        :param differential_weight: Weight of the differences (F), default
+        is 0.5.
+        :type differential_weight: float
+        :param crossover_rate: Probability of taking each dimension from the
+        mutant (CR), default is 0.9.
+        :type crossover_rate: float
+        :param pool: Object with a map() function used to evaluate the
+        population when the optimization has no batch function.
+        :param kwargs:
+        """
+
+        AlgorithmObject.__init__(self, optimization_object, **kwargs)
+        self.no_individuals = kwargs.get('no_individuals', 20)
+        self.no_iteration_steps = kwargs.get('no_iteration_steps', 50)
+        self.strategy = kwargs.get('strategy', RAND_1_BIN)
+        self.differential_weight = kwargs.get('differential_weight', 0.5)
+        self.crossover_rate = kwargs.get('crossover_rate', 0.9)
+        self.pool = kwargs.get('pool', None)
+        if self.strategy not in STRATEGIES:
+            raise ValueError("Unknown strategy '%s'." % self.strategy)
+        if self.no_individuals < 4:
+            raise ValueError('DE needs at least 4 individuals.')
+
+        self.population = list()
+        self.values = list()
+        self.random_state = None
+
+    def _start_solving(self):
+        self.current_iteration_step = 0
+        self._spawn_population()
+        if self.verbose:
+            print("Iteration step #%d, best value: %s" % (
+                self.current_iteration_step, self.best
+            ))
+        self.current_iteration_step += 1
+
+    def _iterate(self):
+        self._de_do_iter()
+        if self.verbose:
+            print("Iteration step #%d, best value: %s" % (
+                self.current_iteration_step, self.best
+            ))
+        self.current_iteration_step += 1
+
+    def _spawn_population(self):
+        self.population = [self._feasible_random_position()
+                           for _i in range(self.no_individuals)]
+        self.random_state = numpy_random_state(self.random_generator)
+        self.values = self.optimization_object.evaluate_batch(
+            self.population, self.pool
+        )
+        for value, position in zip(self.values, self.population):
+            self._improve_best(value, position)
+
+        self._take_snapshot(self.population, self.best)
+
+    def _de_do_iter(self):
+        """For each generation, solve() function will make a call to this
+        function."""
+        best_index = 0
+        for index in range(1, self.no_individuals):
+            if is_better(self.values[best_index], self.values[index],
+                         self.find_max):
+                best_index = index
+
+        trials = self._make_trials(best_index)
+        feasible = self.optimization_object.check_constraints_batch(trials)
+        if self.profiler is not None and not all(feasible):
+            self.profiler.count(INFEASIBLE_REJECTIONS,
+                                feasible.count(False))
+        trials = [(index, trial) for index, (trial, is_feasible)
+                  in enumerate(zip(trials, feasible)) if is_feasible]
+
+        values = self.optimization_object.evaluate_batch(
+            [trial for _i, trial in trials], self.pool
+        )
+        for (index, trial), value in zip(trials, values):
+            if not is_better(value, self.values[index], self.find_max):
+                self.population[index] = trial
+                self.values[index] = value
+                self._improve_best(value, trial)
+
+        self._take_snapshot(self.population, self.best)
+
+    def _make_trials(self, best_index):
+        """Trials of every individual, built as one array if NumPy is
+        installed, else one by one by _make_trial()."""
+        if self.random_state is None:
+            return [self._make_trial(index, best_index)
+                    for index in range(self.no_individuals)]
+        # pylint: disable=import-outside-toplevel,import-error
+        import numpy
+        size = self.no_individuals
+        population = numpy.array(self.population, dtype=float)
+        # Three distinct individuals other than the target, for each one:
+        # the first ones of a random order where the target comes last.
+        keys = self.random_state.random_sample((size, size))
+        numpy.fill_diagonal(keys, 2.0)
+        r_1, r_2, r_3 = keys.argsort(axis=1)[:, :3].T
+        if self.strategy == RAND_1_BIN:
+            base = population[r_3]
+        elif self.strategy == BEST_1_BIN:
+            base = population[[best_index] * size]
+        else:
+            base = population + self.differential_weight * (
+                population[best_index] - population
+            )
+        mutants = base + self.differential_weight * (population[r_1] -
+                                                     population[r_2])
+
+        crossed = self.random_state.random_sample(
+            (size, self.no_dimensions)
+        ) < self.crossover_rate
+        crossed[numpy.arange(size),
+                self.random_state.randint(self.no_dimensions,
+                                          size=size)] = True
+        trials = numpy.where(crossed, mutants, population)
+        # Bounce back half way between the target and the boundary.
+        lower = numpy.array([lower for lower, _upper in self.boundaries],
+                            dtype=float)
+        upper = numpy.array([upper for _lower, upper in self.boundaries],
+                            dtype=float)
+        trials = numpy.where(trials < lower, (lower + population) / 2.0,
+                             trials)
+        trials = numpy.where(trials > upper, (upper + population) / 2.0,
+                             trials)
+        return [self.optimization_object.discretize(trial)
+                for trial in trials.tolist()]
+
+    def _make_trial(self, index, best_index):
+        """Mutate then cross the individual at index, the trial is brought
+        back inside the boundaries and its discrete variables are
+        rounded."""
+        target = self.population[index]
+        others = [i for i in range(self.no_individuals) if i != index]
+        r_1, r_2, r_3 = self.random_generator.sample(others, 3)
+        weight = self.differential_weight
+        if self.strategy == RAND_1_BIN:
+            base = self.population[r_3]
+        elif self.strategy == BEST_1_BIN:
+            base = self.population[best_index]
+        else:
+            base = [
+                x + weight * (b - x)
+                for x, b in zip(target, self.population[best_index])
+            ]
+        mutant = [
+            b + weight * (x_1 - x_2)
+            for b, x_1, x_2 in zip(base, self.population[r_1],
+                                   self.population[r_2])
+        ]
+
+        forced_dim = self.random_generator.randrange(self.no_dimensions)
+        trial = list()
+        for dim in range(self.no_dimensions):
+            if dim == forced_dim or \
+                    self.random_generator.random() < self.crossover_rate:
+                value = mutant[dim]
+            else:
+                value = target[dim]
+            lower, upper = self.boundaries[dim]
+            # Bounce back half way between the target and the boundary.
+            if value < lower:
+                value = (lower + target[dim]) / 2.0
+            elif value > upper:
+                value = (upper + target[dim]) / 2.0
+            trial.append(value)
+        return self.optimization_object.discretize(trial)
@@ -0,0 +1,375 @@
+"""
+This module contains the arithmetic expressions front-end. An expression is
+parsed once, checked against a whitelist of syntax nodes, names and math
+functions, then compiled into a scalar function and a NumPy batch function.
+Compiling folds the constant subexpressions and evaluates the repeated ones
+only once. An expression only keeps its source and its variables' names, so
+it pickles into a few bytes and is compiled again where it is unpickled.
+"""
+
+import ast
+import math
+from importlib.util import find_spec
+from keyword import iskeyword
+
+
+FUNCTIONS = {
+    name: getattr(math, name)
+    for name in ['sqrt', 'exp', 'log', 'log10', 'sin', 'cos', 'tan', 'asin',
+                 'acos', 'atan', 'atan2', 'sinh', 'cosh', 'tanh', 'floor',
+                 'ceil', 'hypot']
+}
+FUNCTIONS.update(abs=abs, min=min, max=max, round=round, pow=pow)
+CONSTANTS = {'pi': math.pi, 'e': math.e, 'inf': float('inf')}
+
+_NODES = tuple(
+    getattr(ast, name) for name in [
+        'Expression', 'BinOp', 'UnaryOp', 'BoolOp', 'Compare', 'IfExp',
+        'Call', 'Name', 'Load', 'Constant', 'Num', 'Add', 'Sub', 'Mult',
+        'Div', 'FloorDiv', 'Mod', 'Pow', 'USub', 'UAdd', 'Not', 'And', 'Or',
+        'Eq', 'NotEq', 'Lt', 'LtE', 'Gt', 'GtE'
+    ] if hasattr(ast, name)
+)
+_GLOBALS = dict(FUNCTIONS, __builtins__={}, **CONSTANTS)
+# Larger integer constants are left to the generated function, folding them
+# could take any time or memory while the expression is parsed.
+_MAX_FOLDED_BITS = 1024
+
+
+class Expression(object):
+    """Arithmetic expression of named variables, called with a position:
+    its values are given to the variables in order. Only numbers, the
+    variables, CONSTANTS, calls of FUNCTIONS, arithmetic, comparisons,
+    boolean operators and conditional expressions are allowed.
+
+    evaluate_batch() evaluates many positions with NumPy array operations,
+    NumPy is an optional dependency only imported by its first call."""
+
+    def __init__(self, source, variables):
+        """
+        :param source: Source of the expression, "x ** 2 + y" for example.
+        :type source: str
+        :param variables: Names of the variables, in the positions' order.
+        :type variables: list[str]
+        """
+
+        self.source = source
+        self.variables = list(variables)
+        for name in self.variables:
+            if not name.isidentifier() or iskeyword(name) or \
+                    name.startswith('_') or name in _GLOBALS:
+                raise ValueError("Invalid variable name '%s'." % name)
+        compiler = _Compiler(parse(source, self.variables), self.variables)
+        self.scalar_source = compiler.generate(batch=False)
+        self.batch_source = compiler.generate(batch=True)
+        self._scalar = _define(self.scalar_source, _GLOBALS)
+        self._batch = None
+
+    @property
+    def vectorized(self):
+        """NumPy is available for evaluate_batch(), it is not imported."""
+        return find_spec('numpy') is not None
+
+    def __call__(self, position):
+        return self._scalar(position)
+
+    def evaluate_batch(self, positions):
+        """
+        Evaluate many positions with NumPy array operations.
+
+        :param positions: Positions to be evaluated.
+        :type positions: list[list[number]]
+        :return: Values of the positions.
+        :rtype: list[float]
+        """
+
+        if self._batch is None:
+            # pylint: disable=import-outside-toplevel,import-error
+            import numpy
+            self._batch = _define(self.batch_source,
+                                  dict(CONSTANTS, _np=numpy,
+                                       __builtins__={}))
+        return self._batch(positions)
+
+    def __getstate__(self):
+        return {'source': self.source, 'variables': self.variables}
+
+    def __setstate__(self, state):
+        self.__init__(state['source'], state['variables'])
+
+    def __repr__(self):
+        return self.source
+
+
+def parse(source, variables):
+    """
+    Parse an expression and check that it only uses allowed syntax and
+    names.
+
+    :param source: Source of the expression.
+    :type source: str
+    :param variables: Names of the variables.
+    :type variables: list[str]
+    :return: The syntax tree of the expression.
+    :rtype: ast.Expression
+    """
+
+    try:
+        tree = ast.parse(source, mode='eval')
+    except SyntaxError as error:
+        raise ValueError("Invalid expression '%s': %s." % (source, error)) \
+            from error
+    for node in ast.walk(tree):
+        if not isinstance(node, _NODES):
+            raise ValueError("Unsupported syntax '%s' in expression '%s'." %
+                             (type(node).__name__, source))
+        if isinstance(node, ast.Call) and (
+                not isinstance(node.func, ast.Name) or
+                node.func.id not in FUNCTIONS):
+            raise ValueError("Unsupported call in expression '%s'." % source)
+        if isinstance(node, ast.Name) and node.id not in variables and \
+                node.id not in FUNCTIONS and node.id not in CONSTANTS:
+            raise ValueError("Unknown name '%s' in expression '%s'." %
+                             (node.id, source))
+        if type(node).__name__ == 'Constant' and \
+                not isinstance(node.value, (int, float)):
+            raise ValueError("Unsupported constant in expression '%s'." %
+                             source)
+    return tree
+
+
+_OPERATORS = {
+    'Add': '+', 'Sub': '-', 'Mult': '*', 'Div': '/', 'FloorDiv': '//',
+    'Mod': '%', 'Pow': '**', 'USub': '-', 'UAdd': '+', 'Not': 'not ',
+    'And': 'and', 'Or': 'or', 'Eq': '==', 'NotEq': '!=', 'Lt': '<',
+    'LtE': '<=', 'Gt': '>', 'GtE': '>='
+}
+_NUMPY_FUNCTIONS = {
+    'asin': 'arcsin', 'acos': 'arccos', 'atan': 'arctan', 'atan2': 'arctan2',
+    'pow': 'power', 'min': 'minimum', 'max': 'maximum'
+}
+
+
+class _Compiler(object):
+    """Generate the source of the scalar and batch functions of a checked
+    syntax tree. Constant subexpressions are folded into literals, and the
+    subexpressions which are always evaluated more than once are assigned
+    to temporary variables first."""
+
+    def __init__(self, tree, variables):
+        self.variables = variables
+        self.tree = tree
+        self.batch = False
+        self.temporaries = dict()
+        self.statements = list()
+        self.used = set()
+        self.constants = dict()
+        self.counts = dict()
+        self._fold(tree.body)
+        self._count(tree.body)
+
+    def generate(self, batch):
+        """
+        :param batch: Generate the batch (NumPy) function or the scalar one.
+        :type batch: bool
+        :return: Source of the function.
+        :rtype: str
+        """
+
+        self.batch = batch
+        self.temporaries = dict()
+        self.statements = list()
+        self.used = set()
+        result = self._emit(self.tree.body)
+        if batch:
+            # The namespace has no builtins, only NumPy's names are used.
+            lines = ['def _function(_positions):',
+                     '    _array = _np.asarray(_positions, '
+                     'dtype=_np.float64)']
+            lines += ['    %s = _array[:, %d]' % (name, dim)
+                      for dim, name in enumerate(self.variables)
+                      if name in self.used]
+            result = '_np.broadcast_to(%s, _array.shape[:1])' \
+                     '.astype(_np.float64).tolist()' % result
+        else:
+            lines = ['def _function(_position):']
+            lines += ['    %s = _position[%d]' % (name, dim)
+                      for dim, name in enumerate(self.variables)
+                      if name in self.used]
+        lines += ['    ' + statement for statement in self.statements]
+        lines.append('    return ' + result)
+        return '\n'.join(lines) + '\n'
+
+    def _fold(self, node):
+        """Find the constant subexpressions, bottom-up, and keep their
+        values."""
+        operands = [operand for operand, _conditional in _operands(node)]
+        for operand in operands:
+            self._fold(operand)
+        if isinstance(node, ast.Name):
+            if node.id in CONSTANTS:
+                self.constants[id(node)] = CONSTANTS[node.id]
+            return
+        if not operands:
+            self.constants[id(node)] = _constant(node)
+            return
+        if all(id(operand) in self.constants for operand in operands):
+            if isinstance(node, ast.BinOp) and \
+                    isinstance(node.op, ast.Pow) and not _cheap_power(
+                        self.constants[id(node.left)],
+                        self.constants[id(node.right)]):
+                return
+            try:
+                # The operands are literals and the node has been checked.
+                # pylint: disable=eval-used
+                value = eval(self._emit(node), _GLOBALS)
+            except (ArithmeticError, ValueError, TypeError):
+                return
+            if isinstance(value, float) and not math.isnan(value) or \
+                    isinstance(value, int) and \
+                    value.bit_length() <= _MAX_FOLDED_BITS:
+                self.constants[id(node)] = value
+
+    def _count(self, node, conditional=False):
+        """Count the occurrences of the subexpressions which are always
+        evaluated. A repeated subexpression is only walked once, so its own
+        subexpressions are not hoisted because of it."""
+        if id(node) in self.constants or isinstance(node, ast.Name):
+            return
+        if not conditional:
+            key = ast.dump(node)
+            self.counts[key] = self.counts.get(key, 0) + 1
+            if self.counts[key] > 1:
+                return
+        for operand, operand_conditional in _operands(node):
+            self._count(operand, conditional or operand_conditional)
+
+    def _emit(self, node):
+        if id(node) in self.constants:
+            value = self.constants[id(node)]
+            return '(%r)' % value if value < 0 else repr(value)
+        if isinstance(node, ast.Name):
+            self.used.add(node.id)
+            return node.id
+        key = ast.dump(node)
+        if key in self.temporaries:
+            return self.temporaries[key]
+        code = self._emit_node(node)
+        if self.counts.get(key, 0) > 1:
+            name = '_t%d' % len(self.temporaries)
+            self.temporaries[key] = name
+            self.statements.append('%s = %s' % (name, code))
+            return name
+        return code
+
+    def _emit_node(self, node):
+        # pylint: disable=too-many-return-statements
+        operator = _OPERATORS.get(type(getattr(node, 'op', None)).__name__)
+        if isinstance(node, ast.BinOp):
+            return '(%s %s %s)' % (self._emit(node.left), operator,
+                                   self._emit(node.right))
+        if isinstance(node, ast.UnaryOp):
+            if self.batch and operator == 'not ':
+                # Booleans are numbers, as Python's ones.
+                return '(_np.logical_not(%s) + 0.0)' % \
+                    self._emit(node.operand)
+            return '(%s%s)' % (operator, self._emit(node.operand))
+        if isinstance(node, ast.BoolOp):
+            values = [self._emit(value) for value in node.values]
+            if self.batch:
+                return _select(operator, values)
+            return '(%s)' % (' %s ' % operator).join(values)
+        if isinstance(node, ast.Compare):
+            operands = [self._emit(node.left)] + \
+                [self._emit(comparator) for comparator in node.comparators]
+            operators = [_OPERATORS[type(op).__name__] for op in node.ops]
+            if self.batch:
+                return '(%s + 0.0)' % _nest('_np.logical_and', [
+                    '(%s %s %s)' % (left, op, right) for left, op, right
+                    in zip(operands, operators, operands[1:])
+                ])
+            return '(%s)' % ' '.join(
+                [operands[0]] + ['%s %s' % (op, right) for op, right
+                                 in zip(operators, operands[1:])]
+            )
+        if isinstance(node, ast.IfExp):
+            test, body, orelse = self._emit(node.test), \
+                self._emit(node.body), self._emit(node.orelse)
+            if self.batch:
+                return '_np.where(%s, %s, %s)' % (test, body, orelse)
+            return '(%s if %s else %s)' % (body, test, orelse)
+        return self._emit_call(node)
+
+    def _emit_call(self, node):
+        args = [self._emit(arg) for arg in node.args]
+        if not self.batch:
+            return '%s(%s)' % (node.func.id, ', '.join(args))
+        name = '_np.' + _NUMPY_FUNCTIONS.get(node.func.id, node.func.id)
+        if node.func.id in ('min', 'max'):
+            return _nest(name, args)
+        if node.func.id == 'log' and len(args) == 2:
+            # NumPy's second argument is the output array, not the base.
+            return '(_np.log(%s) / _np.log(%s))' % tuple(args)
+        return '%s(%s)' % (name, ', '.join(args))
+
+
+def _cheap_power(base, exponent):
+    """A constant power can be folded without computing a huge integer."""
+    if not isinstance(base, int) or not isinstance(exponent, int):
+        return True
+    return exponent < 0 or \
+        abs(base).bit_length() * exponent <= _MAX_FOLDED_BITS
+
+
+def _operands(node):
+    """Subexpressions of a node in their evaluation order, each one with a
+    flag telling if it is only evaluated under a condition."""
+    # pylint: disable=too-many-return-statements
+    if isinstance(node, ast.BinOp):
+        return [(node.left, False), (node.right, False)]
+    if isinstance(node, ast.UnaryOp):
+        return [(node.operand, False)]
+    if isinstance(node, ast.BoolOp):
+        return [(node.values[0], False)] + \
+            [(value, True) for value in node.values[1:]]
+    if isinstance(node, ast.Compare):
+        return [(node.left, False), (node.comparators[0], False)] + \
+            [(comparator, True) for comparator in node.comparators[1:]]
+    if isinstance(node, ast.IfExp):
+        return [(node.test, False), (node.body, True), (node.orelse, True)]
+    if isinstance(node, ast.Call):
+        return [(arg, False) for arg in node.args]
+    return []
+
+
+def _constant(node):
+    """Value of a number node, for every Python version's syntax tree."""
+    return node.value if hasattr(node, 'value') else node.n
+
+
+def _nest(function, args):
+    """Nest calls of a binary function over many arguments."""
+    ret = args[-1]
+    for arg in reversed(args[:-1]):
+        ret = '%s(%s, %s)' % (function, arg, ret)
+    return ret
+
+
+def _select(operator, values):
+    """Batch code of and/or over many values, giving one of them as Python
+    does."""
+    ret = values[-1]
+    for value in reversed(values[:-1]):
+        if operator == 'or':
+            ret = '_np.where(%s, %s, %s)' % (value, value, ret)
+        else:
+            ret = '_np.where(%s, %s, %s)' % (value, ret, value)
+    return ret
+
+
+def _define(source, namespace):
+    """Execute the source of a generated function and return it."""
+    namespace = dict(namespace)
+    # The source has been generated from a checked syntax tree.
+    exec(source, namespace)  # pylint: disable=exec-used
+    return namespace['_function']
@@ -0,0 +1,301 @@
+"""
+This module contains the on-disk history of a swarm. Instead of keeping
+deep copies of every particle in memory (see AlgorithmObject's historical
+argument), each iteration step is written into a memory-mapped file, so the
+full trajectories of large runs are only limited by the disk.
+
+The file is a header followed by one column per recorded quantity, each
+column holds the float64 values (in native byte order) of every iteration
+step:
+
+- positions, velocities and best_positions: steps x particles x dimensions,
+- values and best_values: steps x particles,
+- global_best_value: steps,
+- global_best_position: steps x dimensions.
+
+The file is allocated for the expected number of iteration steps when it is
+created, the header keeps the number of steps already written, so a run can
+be read while it is going on or after it has been interrupted.
+"""
+
+import mmap
+import struct
+from array import array
+from itertools import chain
+
+
+MAGIC = b'PYOCHIST'
+HEADER_SIZE = 64
+_HEADER = struct.Struct('=8s4q')
+
+
+def columns(no_particles, no_dimensions):
+    """
+    Columns of a history file, in the file's order.
+
+    :param no_particles: Number of particles.
+    :type no_particles: int
+    :param no_dimensions: Number of dimensions.
+    :type no_dimensions: int
+    :return: Name and number of values per iteration step of each column.
+    :rtype: list[tuple]
+    """
+
+    return [
+        ('positions', no_particles * no_dimensions),
+        ('velocities', no_particles * no_dimensions),
+        ('values', no_particles),
+        ('best_values', no_particles),
+        ('best_positions', no_particles * no_dimensions),
+        ('global_best_value', 1),
+        ('global_best_position', no_dimensions)
+    ]
+
+
+class _HistoryFile(object):
+    """Layout of a history file, shared by its writer and reader."""
+
+    def __init__(self, capacity, no_particles, no_dimensions,
+                 no_iterations):
+        self.capacity = capacity
+        self.no_particles = no_particles
+        self.no_dimensions = no_dimensions
+        self.no_iterations = no_iterations
+        self.offsets = dict()
+        self.sizes = dict()
+        offset = 0
+        for name, size in columns(self.no_particles, self.no_dimensions):
+            self.offsets[name] = offset
+            self.sizes[name] = size
+            offset += self.capacity * size
+        self.no_values = offset
+
+    def _slice(self, name, iteration):
+        """Start and end indexes of a column's values at one step."""
+        if iteration < 0:
+            iteration += self.no_iterations
+        if not 0 <= iteration < self.no_iterations:
+            raise IndexError('Iteration step %d has not been recorded.' %
+                             iteration)
+        start = self.offsets[name] + iteration * self.sizes[name]
+        return start, start + self.sizes[name]
+
+
+class HistoryWriter(_HistoryFile):
+    """Append the iteration steps of a swarm into a history file."""
+
+    def __init__(self, path, no_iterations, no_particles, no_dimensions):
+        """
+        :param path: Path of the file, it is overwritten.
+        :type path: str
+        :param no_iterations: Maximum number of iteration steps.
+        :type no_iterations: int
+        :param no_particles: Number of particles.
+        :type no_particles: int
+        :param no_dimensions: Number of dimensions.
+        :type no_dimensions: int
+        """
+
+        _HistoryFile.__init__(self, no_iterations, no_particles,
+                              no_dimensions, 0)
+        self.path = path
+
+        size = HEADER_SIZE + 8 * self.no_values
+        self._file = open(path, 'w+b')  # pylint: disable=consider-using-with
+        # Sparse allocation, the pages are only written when they are used.
+        self._file.truncate(size)
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+        self._write_header()
+        self._data = memoryview(self._mmap)[HEADER_SIZE:].cast('d')
+
+    def append(self, positions, velocities, values, best_values,
+               best_positions, best_value, best_position):
+        """
+        Write one iteration step. Each argument is a flat sequence (or a
+        C-contiguous buffer, a NumPy array for example) of the column's
+        values, in the particles' order. None values are written as NaN.
+
+        :param best_value: Value of the global best.
+        :type best_value: float
+        :param best_position: Position of the global best.
+        :type best_position: list[float]
+        """
+
+        if self.no_iterations >= self.capacity:
+            raise ValueError('The history file is full (%d iteration '
+                             'steps).' % self.capacity)
+        self.no_iterations += 1
+        for name, data in [('positions', positions),
+                           ('velocities', velocities),
+                           ('values', values),
+                           ('best_values', best_values),
+                           ('best_positions', best_positions),
+                           ('global_best_value', [best_value]),
+                           ('global_best_position', best_position)]:
+            start, end = self._slice(name, self.no_iterations - 1)
+            self._data[start:end] = _as_doubles(data)
+        self._write_header()
+
+    def append_swarm(self, particles, best):
+        """
+        Write one iteration step from the particles of a swarm.
+
+        :param particles: Particles of the swarm.
+        :type particles: list[py_opt_collection.pso.Particle]
+        :param best: Global best value and position.
+        :type best: tuple
+        """
+
+        if len(particles) != self.no_particles:
+            raise ValueError('The history file needs a constant number of '
+                             'particles.')
+        self.append(
+            chain.from_iterable(particle.position for particle in particles),
+            chain.from_iterable(particle.velocity for particle in particles),
+            [particle.value for particle in particles],
+            [particle.best[0] for particle in particles],
+            chain.from_iterable(particle.best[1] for particle in particles),
+            best[0],
+            best[1] if best[1] is not None else [None] * self.no_dimensions
+        )
+
+    def close(self):
+        """Flush and close the file."""
+        if self._mmap is not None:
+            self._data.release()
+            self._mmap.flush()
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write_header(self):
+        _HEADER.pack_into(self._mmap, 0, MAGIC, self.capacity,
+                          self.no_particles, self.no_dimensions,
+                          self.no_iterations)
+
+
+class HistoryReader(_HistoryFile):
+    """Read a history file without copying it: the columns are memory
+    views on the mapped file, sliced by iteration step and particle."""
+
+    def __init__(self, path):
+        """
+        :param path: Path of the file.
+        :type path: str
+        """
+
+        with open(path, 'rb') as history_file:
+            self._mmap = mmap.mmap(history_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        header = _HEADER.unpack_from(self._mmap, 0)
+        if header[0] != MAGIC:
+            self._mmap.close()
+            raise ValueError("'%s' is not a history file." % path)
+        _HistoryFile.__init__(self, *header[1:])
+        self.path = path
+        self._data = memoryview(self._mmap)[HEADER_SIZE:].cast('d')
+
+    def __len__(self):
+        return self.no_iterations
+
+    def column(self, name, iteration):
+        """
+        Values of a column at one iteration step.
+
+        :param name: Name of the column, see columns().
+        :type name: str
+        :param iteration: Iteration step, negative ones count from the end.
+        :type iteration: int
+        :return: Flat view of the values, in the particles' order.
+        :rtype: memoryview
+        """
+
+        start, end = self._slice(name, iteration)
+        return self._data[start:end]
+
+    def position(self, iteration, particle, name='positions'):
+        """
+        Position (or velocity, or local best position) of one particle at
+        one iteration step.
+
+        :param iteration: Iteration step.
+        :type iteration: int
+        :param particle: Index of the particle.
+        :type particle: int
+        :param name: positions, velocities or best_positions.
+        :type name: str
+        :rtype: memoryview
+        """
+
+        start = particle * self.no_dimensions
+        return self.column(name, iteration)[
+            start:start + self.no_dimensions
+        ]
+
+    def trajectory(self, particle, name='positions'):
+        """
+        Positions (or velocities, or local best positions) of one particle
+        over every recorded iteration step.
+
+        :param particle: Index of the particle.
+        :type particle: int
+        :param name: positions, velocities or best_positions.
+        :type name: str
+        :rtype: list[list[float]]
+        """
+
+        return [self.position(iteration, particle, name).tolist()
+                for iteration in range(self.no_iterations)]
+
+    def as_array(self, name):
+        """
+        NumPy view of a whole column over the recorded iteration steps,
+        shaped (steps, particles, dimensions), (steps, particles), (steps,)
+        or (steps, dimensions). Nothing is copied. It needs NumPy.
+
+        :param name: Name of the column, see columns().
+        :type name: str
+        :rtype: numpy.ndarray
+        """
+
+        # pylint: disable=import-outside-toplevel,import-error
+        import numpy
+        shape = {
+            'values': (self.no_particles,),
+            'best_values': (self.no_particles,),
+            'global_best_value': (),
+            'global_best_position': (self.no_dimensions,)
+        }.get(name, (self.no_particles, self.no_dimensions))
+        return numpy.frombuffer(
+            self._mmap, dtype=numpy.float64,
+            count=self.no_iterations * self.sizes[name],
+            offset=HEADER_SIZE + 8 * self.offsets[name]
+        ).reshape((self.no_iterations,) + shape)
+
+    def close(self):
+        """Close the file, the views taken from it must not be used
+        anymore."""
+        if self._mmap is not None:
+            self._data.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _as_doubles(data):
+    """Flat float64 view (or copy) of a sequence or buffer."""
+    try:
+        return memoryview(data).cast('B').cast('d')
+    except TypeError:
+        return array('d', [float('nan') if x is None else x for x in data])
@@ -0,0 +1,307 @@
+"""
+This module contains the optional JIT-compiled kernels of PSO. With the
+numba backend, a swarm is moved and evaluated by one compiled loop over
+preallocated arrays: the velocity rule, the clamping, the repair into the
+boundaries and the objective are fused, so an iteration step does not
+allocate anything.
+
+Numba (with NumPy) is an optional dependency. Without it, for objectives it
+can not compile, or for features the kernel does not cover (constraints,
+discrete variables, archive, surrogate, neighborhoods, ...), PSO silently
+keeps its pure Python implementation.
+"""
+
+import types
+import weakref
+from importlib.util import find_spec
+from .batch import is_supported
+from .optimization import MAX_SPAWNS
+
+
+PYTHON = 'python'
+NUMBA = 'numba'
+BACKENDS = (PYTHON, NUMBA)
+
+# Compiled objectives and steps, by objective. An objective which is not
+# used anymore is released with them.
+_OBJECTIVES = weakref.WeakKeyDictionary()
+_STEPS = weakref.WeakKeyDictionary()
+_GENERATORS = dict()
+
+
+def is_available():
+    """
+    :return: Numba is installed or not, it is not imported.
+    :rtype: bool
+    """
+
+    return find_spec('numba') is not None
+
+
+def compile_objective(func):
+    """
+    Compile an objective with Numba: a plain Python function (the bundled
+    test functions for example) or a formula (see
+    py_opt_collection.expression). It is compiled for positions given as
+    one dimensional float arrays, without being called.
+
+    :param func: The objective.
+    :type func: (list[number]) -> number
+    :return: The compiled objective, None if it can not be compiled or
+    does not return a number. Only functions can be compiled, not other
+    callables (partials, callable instances, ...).
+    """
+
+    if func in _OBJECTIVES:
+        return _OBJECTIVES[func]
+    # Formulas are compiled from their generated scalar function.
+    # pylint: disable=protected-access
+    target = getattr(func, '_scalar', func)
+    if not isinstance(target, types.FunctionType):
+        return _cache(_OBJECTIVES, func, None)
+    # pylint: disable=import-outside-toplevel,import-error
+    import numba
+    from numba.core.errors import TypingError, LoweringError, \
+        UnsupportedError
+    target = _detached(target)
+    try:
+        ret = numba.njit(target)
+        ret.compile((numba.types.float64[::1],))
+    except (TypingError, LoweringError, UnsupportedError):
+        ret = None
+    else:
+        if not isinstance(ret.nopython_signatures[0].return_type,
+                          (numba.types.Number, numba.types.Boolean)):
+            ret = None
+    return _cache(_OBJECTIVES, func, ret)
+
+
+def create_kernel(pso):
+    """
+    Create the kernel of a PSO object, if its backend is numba and the
+    kernel supports its configuration.
+
+    :param pso: PSO object whose particles have been spawned.
+    :type pso: py_opt_collection.pso.PSO
+    :return: The kernel, None if the Python implementation must be used.
+    :rtype: SwarmKernel
+    """
+
+    optimization = pso.optimization_object
+    if pso.backend != NUMBA or not is_available() or not is_supported(pso):
+        return None
+    if pso.update_mode == 'steady_state' or pso.neighborhoods is not None or \
+            optimization.parameters is not None:
+        return None
+    objective = compile_objective(optimization.func)
+    if objective is None:
+        return None
+    step = _STEPS.get(optimization.func)
+    if step is None:
+        step = _cache(_STEPS, optimization.func, _make_step(objective))
+    return SwarmKernel(pso, step)
+
+
+class SwarmKernel(object):
+    """Arrays of a swarm (positions, velocities, local bests, values and the
+    best) updated in place by the compiled step. The particles' objects are
+    only written back by sync()."""
+
+    def __init__(self, pso, step):
+        """
+        :param pso: PSO object whose particles have been spawned.
+        :type pso: py_opt_collection.pso.PSO
+        :param step: Compiled step function.
+        """
+
+        # pylint: disable=import-outside-toplevel,import-error
+        import numpy
+        particles = pso.particles
+        self.step_function = step
+        self.positions = numpy.array(
+            [particle.position for particle in particles], dtype=float
+        )
+        self.velocities = numpy.array(
+            [particle.velocity for particle in particles], dtype=float
+        )
+        self.best_positions = numpy.array(
+            [particle.best[1] for particle in particles], dtype=float
+        )
+        self.best_values = numpy.array(
+            [particle.best[0] for particle in particles], dtype=float
+        )
+        self.values = numpy.array(
+            [particle.value for particle in particles], dtype=float
+        )
+        self.best = numpy.array(pso.best[1], dtype=float)
+        self.best_value = numpy.array([pso.best[0]], dtype=float)
+        # Asynchronous particles move toward the best found so far, in the
+        # same step, synchronous ones toward the last step's best.
+        self.asynchronous = pso.update_mode == 'asynchronous'
+        self.social = self.best if self.asynchronous else self.best.copy()
+        self.lower = numpy.array([lower for lower, _upper in pso.boundaries],
+                                 dtype=float)
+        self.upper = numpy.array([upper for _lower, upper in pso.boundaries],
+                                 dtype=float)
+        rule = pso.velocity_rule
+        self.max_velocity = numpy.array(
+            rule.max_velocity if rule.max_velocity is not None
+            else [float('inf')] * pso.no_dimensions, dtype=float
+        )
+        self.constriction = rule.constriction_factor \
+            if rule.constriction_factor is not None else 1.0
+        _seed(pso.random_generator.getrandbits(32))
+
+    def step(self, pso):
+        """
+        Move and evaluate the whole swarm, then update the PSO's best.
+
+        :param pso: The PSO object.
+        :type pso: py_opt_collection.pso.PSO
+        :return: Number of particles which improved their local best.
+        :rtype: int
+        """
+
+        if not self.asynchronous:
+            self.social[:] = self.best
+        no_improved = self.step_function(
+            self.positions, self.velocities, self.best_positions,
+            self.best_values, self.values, self.social, self.best,
+            self.best_value, self.lower, self.upper, self.max_velocity,
+            pso.velocity_rule.weight, self.constriction,
+            pso.learning_factors[0], pso.learning_factors[1], pso.find_max
+        )
+        if self.best_value[0] != pso.best[0]:
+            pso.best = (float(self.best_value[0]), self.best.tolist())
+        return no_improved
+
+    def record(self, history):
+        """
+        Write the swarm into a history file, straight from the arrays.
+
+        :param history: The history file.
+        :type history: py_opt_collection.history.HistoryWriter
+        """
+
+        history.append(self.positions, self.velocities, self.values,
+                       self.best_values, self.best_positions,
+                       self.best_value[0], self.best)
+
+    def sync(self, pso):
+        """
+        Write the arrays back into the particles.
+
+        :param pso: The PSO object.
+        :type pso: py_opt_collection.pso.PSO
+        """
+
+        for i, particle in enumerate(pso.particles):
+            particle.position = self.positions[i].tolist()
+            particle.velocity = self.velocities[i].tolist()
+            particle.value = float(self.values[i])
+            particle.best = (float(self.best_values[i]),
+                             self.best_positions[i].tolist())
+
+
+def _detached(func):
+    """Copy of a plain function, so the compiled function kept in the
+    caches does not keep the original one alive."""
+    ret = types.FunctionType(func.__code__, func.__globals__, func.__name__,
+                             func.__defaults__, func.__closure__)
+    ret.__kwdefaults__ = func.__kwdefaults__
+    return ret
+
+
+def _cache(cache, func, value):
+    """Keep a value in a cache by objective, unless the objective can not
+    be weakly referenced."""
+    try:
+        cache[func] = value
+    except TypeError:
+        pass
+    return value
+
+
+def _seed(seed):
+    """Seed the random generator of the compiled functions."""
+    if 'seed' not in _GENERATORS:
+        # pylint: disable=import-outside-toplevel,import-error
+        import numba
+        import numpy
+
+        @numba.njit
+        def seed_generator(value):
+            numpy.random.seed(value)
+
+        _GENERATORS['seed'] = seed_generator
+    _GENERATORS['seed'](seed)
+
+
+def _make_step(objective):
+    """Compile the step function of a swarm around a compiled objective."""
+    # pylint: disable=import-outside-toplevel,import-error
+    import numba
+    import numpy
+
+    @numba.njit
+    def is_inside(position, velocity, lower, upper):
+        for dim in range(position.shape[0]):
+            x = position[dim] + velocity[dim]
+            if x < lower[dim] or x > upper[dim]:
+                return False
+        return True
+
+    # pylint: disable=too-many-arguments,too-many-locals
+    @numba.njit
+    def step(positions, velocities, best_positions, best_values, values,
+             social, best, best_value, lower, upper, max_velocity, weight,
+             constriction, c_1, c_2, find_max):
+        no_particles, no_dimensions = positions.shape
+        no_improved = 0
+        scale = max(c_1, c_2)
+        for i in range(no_particles):
+            r_1 = c_1 * numpy.random.random()
+            r_2 = c_2 * numpy.random.random()
+            for dim in range(no_dimensions):
+                x = positions[i, dim]
+                velocity = constriction * (
+                    weight * velocities[i, dim] +
+                    r_1 * (best_positions[i, dim] - x) +
+                    r_2 * (social[dim] - x)
+                )
+                velocities[i, dim] = min(max(velocity, -max_velocity[dim]),
+                                         max_velocity[dim])
+
+            # Repair the move as Particle.repair() does: halve the
+            # velocity up to 5 times, then draw it again, and stay if the
+            # move still leaves the boundaries after MAX_SPAWNS tries.
+            retry = 0
+            while retry < MAX_SPAWNS and not is_inside(
+                    positions[i], velocities[i], lower, upper):
+                for dim in range(no_dimensions):
+                    if retry < 5:
+                        velocities[i, dim] *= 0.5
+                    else:
+                        velocities[i, dim] = min(max(
+                            (numpy.random.random() - 0.5) * scale,
+                            -max_velocity[dim]), max_velocity[dim])
+                retry += 1
+            if not is_inside(positions[i], velocities[i], lower, upper):
+                velocities[i, :] = 0.0
+            for dim in range(no_dimensions):
+                positions[i, dim] += velocities[i, dim]
+
+            value = objective(positions[i])
+            values[i] = value
+            if (find_max and value > best_values[i]) or \
+                    (not find_max and value < best_values[i]):
+                no_improved += 1
+                best_values[i] = value
+                best_positions[i, :] = positions[i, :]
+                if (find_max and value > best_value[0]) or \
+                        (not find_max and value < best_value[0]):
+                    best_value[0] = value
+                    best[:] = positions[i, :]
+        return no_improved
+
+    return step
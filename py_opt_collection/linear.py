@@ -0,0 +1,247 @@
+"""
+This module contains the linear constraints of an optimization, in matrix
+form: A_ub x <= b_ub and A_eq x = b_eq. Unlike the constraint functions, the
+feasible region they define is a known polytope, so the algorithms can check
+many positions with one matrix product, repair an infeasible position by
+projecting it onto the polytope, and sample positions inside it.
+
+NumPy is an optional dependency: without it, the positions are checked one
+by one.
+"""
+
+from importlib.util import find_spec
+from operator import mul
+from .utils import solve_linear_system
+
+
+class LinearConstraints(object):
+    """Linear inequality and equality constraints. Positions are projected
+    onto the polytope (intersected with the boundaries) by Dykstra's
+    alternating projections, and sampled inside it by hit-and-run walks,
+    whose directions stay in the null space of the equalities."""
+
+    def __init__(self, no_dimensions, tolerance=1e-9, max_iterations=1000):
+        """
+        :param no_dimensions: Number of variables.
+        :type no_dimensions: int
+        :param tolerance: Violation allowed when checking a constraint,
+        default is 1e-9.
+        :type tolerance: float
+        :param max_iterations: Maximum number of sweeps of a projection,
+        default is 1000.
+        :type max_iterations: int
+        """
+
+        self.no_dimensions = no_dimensions
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.a_ub = list()
+        self.b_ub = list()
+        self.a_eq = list()
+        self.b_eq = list()
+        self._gram_eq = None
+        self._arrays = None
+
+    def __len__(self):
+        return len(self.b_ub) + len(self.b_eq)
+
+    def add(self, a_ub=None, b_ub=None, a_eq=None, b_eq=None):
+        """
+        Add rows of constraints.
+
+        :param a_ub: Coefficients of the inequalities, one row each.
+        :type a_ub: list[list[number]]
+        :param b_ub: Upper bounds of the inequalities.
+        :type b_ub: list[number]
+        :param a_eq: Coefficients of the equalities, one row each.
+        :type a_eq: list[list[number]]
+        :param b_eq: Right hand sides of the equalities.
+        :type b_eq: list[number]
+        """
+
+        for matrix, vector in ((a_ub, b_ub), (a_eq, b_eq)):
+            if (matrix is None) != (vector is None) or \
+                    len(matrix or ()) != len(vector or ()):
+                raise ValueError('Each row of coefficients needs one bound.')
+            for row in matrix or ():
+                if len(row) != self.no_dimensions:
+                    raise ValueError('Rows of coefficients must have one '
+                                     'coefficient per dimension.')
+        self.a_ub.extend(list(map(float, row)) for row in a_ub or ())
+        self.b_ub.extend(map(float, b_ub or ()))
+        self.a_eq.extend(list(map(float, row)) for row in a_eq or ())
+        self.b_eq.extend(map(float, b_eq or ()))
+        self._gram_eq = None
+        self._arrays = None
+
+    def check(self, position):
+        """
+        Check if one position satisfies every linear constraint.
+
+        :type position: list[number]
+        :rtype: bool
+        """
+
+        tolerance = self.tolerance
+        return all(sum(map(mul, row, position)) <= b + tolerance
+                   for row, b in zip(self.a_ub, self.b_ub)) and \
+            all(abs(sum(map(mul, row, position)) - b) <= tolerance
+                for row, b in zip(self.a_eq, self.b_eq))
+
+    def check_batch(self, positions):
+        """
+        Check many positions with one product of the constraints' matrices
+        by the positions' matrix if NumPy is installed, else one by one.
+
+        :param positions: Positions to be checked.
+        :type positions: list[list[number]]
+        :return: Each position satisfies every linear constraint or not.
+        :rtype: list[bool]
+        """
+
+        if not positions or find_spec('numpy') is None:
+            return [self.check(position) for position in positions]
+        # pylint: disable=import-outside-toplevel,import-error
+        import numpy
+        if self._arrays is None:
+            self._arrays = tuple(
+                numpy.array(values, dtype=float).reshape(-1, size)
+                for values, size in ((self.a_ub, self.no_dimensions),
+                                     (self.b_ub, 1),
+                                     (self.a_eq, self.no_dimensions),
+                                     (self.b_eq, 1))
+            )
+        a_ub, b_ub, a_eq, b_eq = self._arrays
+        matrix = numpy.array(positions, dtype=float).T
+        return (
+            (a_ub.dot(matrix) <= b_ub + self.tolerance).all(axis=0) &
+            (abs(a_eq.dot(matrix) - b_eq) <= self.tolerance).all(axis=0)
+        ).tolist()
+
+    def project(self, position, boundaries):
+        """
+        Project a position onto the polytope intersected with the
+        boundaries, by Dykstra's alternating projections onto each
+        constraint then the boundaries' box.
+
+        :param position: Position to be projected.
+        :type position: list[number]
+        :param boundaries: Boundaries of the variables.
+        :type boundaries: list[tuple[number]]
+        :return: The projected position, which may still slightly violate
+        the constraints if the projection has not converged.
+        :rtype: list[float]
+        """
+
+        ret = list(map(float, position))
+        if self.check(ret) and all(lower <= x <= upper for x, (lower, upper)
+                                   in zip(ret, boundaries)):
+            return ret
+        rows = [(row, b, False) for row, b in zip(self.a_ub, self.b_ub)] + \
+            [(row, b, True) for row, b in zip(self.a_eq, self.b_eq)]
+        rows = [(row, b, is_equality, sum(a * a for a in row))
+                for row, b, is_equality in rows]
+        increments = [[0.0] * self.no_dimensions
+                      for _i in range(len(rows) + 1)]
+        for _i in range(self.max_iterations):
+            for increment, row_data in zip(increments, rows):
+                row, b, is_equality, norm = row_data
+                shifted = [x + d for x, d in zip(ret, increment)]
+                excess = sum(map(mul, row, shifted)) - b
+                if norm and (is_equality or excess > 0.0):
+                    ret = [x - excess / norm * a
+                           for x, a in zip(shifted, row)]
+                else:
+                    ret = shifted
+                increment[:] = [s - x for s, x in zip(shifted, ret)]
+            shifted = [x + d for x, d in zip(ret, increments[-1])]
+            ret = [min(max(x, lower), upper)
+                   for x, (lower, upper) in zip(shifted, boundaries)]
+            increments[-1] = [s - x for s, x in zip(shifted, ret)]
+            if self.check(ret):
+                break
+        return ret
+
+    def sample(self, random_generator, boundaries, start=None,
+               no_steps=None):
+        """
+        Sample a position inside the polytope intersected with the
+        boundaries by a hit-and-run walk: each step draws a random direction
+        (in the null space of the equalities) and jumps to a uniformly drawn
+        point of the feasible segment along it.
+
+        :param random_generator: Random generator of the optimization.
+        :type random_generator: random.Random
+        :param boundaries: Boundaries of the variables.
+        :type boundaries: list[tuple[number]]
+        :param start: Feasible starting position, default is the projection
+        of a uniformly drawn position. An infeasible one is projected.
+        :type start: list[number]
+        :param no_steps: Number of steps of the walk, default is 10 times
+        the number of dimensions.
+        :type no_steps: int
+        :return: The sampled position. If the projection has not found a
+        feasible starting position, it is returned as is, without walk: it
+        is the closest position found and the caller has to check it.
+        :rtype: list[float]
+        """
+
+        if start is None:
+            start = [random_generator.uniform(lower, upper)
+                     for lower, upper in boundaries]
+        ret = self.project(start, boundaries)
+        if not self.check(ret):
+            return ret
+        if no_steps is None:
+            no_steps = 10 * self.no_dimensions
+        for _i in range(no_steps):
+            direction = self._null_space_direction(
+                [random_generator.gauss(0.0, 1.0)
+                 for _dim in range(self.no_dimensions)]
+            )
+            lowest, highest = self._feasible_segment(ret, direction,
+                                                     boundaries)
+            if lowest < highest:
+                step = random_generator.uniform(lowest, highest)
+                ret = [min(max(x + step * d, lower), upper)
+                       for x, d, (lower, upper)
+                       in zip(ret, direction, boundaries)]
+        return ret
+
+    def _null_space_direction(self, direction):
+        """Remove the components of a direction along the equalities' rows:
+        d - A^T (A A^T)^-1 A d."""
+        if not self.a_eq:
+            return direction
+        if self._gram_eq is None:
+            self._gram_eq = [[sum(map(mul, row_i, row_j))
+                              for row_j in self.a_eq] for row_i in self.a_eq]
+        try:
+            weights = solve_linear_system(
+                self._gram_eq,
+                [sum(map(mul, row, direction)) for row in self.a_eq]
+            )
+        except ValueError as error:
+            raise ValueError('The equality constraints are linearly '
+                             'dependent.') from error
+        for weight, row in zip(weights, self.a_eq):
+            direction = [d - weight * a for d, a in zip(direction, row)]
+        return direction
+
+    def _feasible_segment(self, position, direction, boundaries):
+        """Range of the steps t such that position + t * direction satisfies
+        the inequalities and the boundaries."""
+        lowest, highest = float('-inf'), float('inf')
+        limits = [(sum(map(mul, row, direction)),
+                   b - sum(map(mul, row, position)))
+                  for row, b in zip(self.a_ub, self.b_ub)]
+        for x, d, (lower, upper) in zip(position, direction, boundaries):
+            limits.append((d, upper - x))
+            limits.append((-d, x - lower))
+        for rate, slack in limits:
+            slack = max(slack, 0.0)
+            if rate > 1e-12:
+                highest = min(highest, slack / rate)
+            elif rate < -1e-12:
+                lowest = max(lowest, slack / rate)
+        return lowest, highest
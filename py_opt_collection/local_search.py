@@ -0,0 +1,254 @@
+"""
+This module contains the local searches used to refine the best position
+found by a global algorithm. Global metaheuristics get close to the optimum
+quickly but are slow at polishing it, a local search started from their best
+reaches tight tolerances with far fewer evaluations. Every local search
+stays inside the optimization's boundaries and only accepts positions which
+satisfy its constraints.
+"""
+
+from abc import ABC, abstractmethod
+from .utils import is_better
+
+
+class LocalSearch(ABC):
+    """Base class of the local searches. A local search minimizes a signed
+    version of the optimizing function (so maximizations are handled too),
+    positions are clipped into the boundaries and infeasible positions are
+    valued as infinitely bad."""
+
+    name = None
+
+    def __init__(self, max_evaluations=None, tolerance=1e-10,
+                 initial_step=0.05):
+        """
+        :param max_evaluations: Maximum number of evaluations of one
+        refinement, default is 100 times the number of dimensions.
+        :type max_evaluations: int
+        :param tolerance: Convergence tolerance, on the values and on the
+        steps relative to the boundaries' widths. Default is 1e-10.
+        :type tolerance: float
+        :param initial_step: First step size, relative to the boundaries'
+        widths. Default is 0.05.
+        :type initial_step: float
+        """
+
+        self.max_evaluations = max_evaluations
+        self.tolerance = tolerance
+        self.initial_step = initial_step
+
+    def refine(self, optimization_object, position):
+        """
+        Run the local search from a position.
+
+        :param optimization_object: Optimization object to be refined.
+        :type optimization_object: py_opt_collection.optimization.Optimization
+        :param position: Starting position, it must satisfy the constraints.
+        :type position: list[number]
+        :return: Best value and position found, the starting position if
+        nothing better has been found.
+        :rtype: tuple
+        """
+
+        objective = _Objective(
+            optimization_object,
+            self.max_evaluations if self.max_evaluations is not None
+            else 100 * optimization_object.no_dimensions
+        )
+        value, position = objective.evaluate(position)
+        self._search(objective, position, value)
+        return objective.best
+
+    @abstractmethod
+    def _search(self, objective, position, value):
+        """Search from the starting position and its value, the
+        objective keeps the best position evaluated."""
+
+
+class NelderMead(LocalSearch):
+    """Nelder-Mead downhill simplex method. It does not need any gradient
+    and copes well with non smooth functions."""
+
+    name = 'nelder_mead'
+
+    def _search(self, objective, position, value):
+        size = len(position)
+        widths = objective.widths
+        simplex = [(value, position)]
+        for dim in range(size):
+            vertex = list(position)
+            step = self.initial_step * widths[dim]
+            upper = objective.boundaries[dim][1]
+            vertex[dim] += step if vertex[dim] + step <= upper else -step
+            simplex.append(objective.evaluate(vertex))
+
+        while not objective.is_exhausted:
+            simplex.sort(key=lambda vertex: vertex[0])
+            best_value, best = simplex[0]
+            worst_value, worst = simplex[-1]
+            if abs(worst_value - best_value) <= self.tolerance and max(
+                    abs(x - b) / w
+                    for vertex in simplex[1:]
+                    for x, b, w in zip(vertex[1], best, widths)
+            ) <= self.tolerance:
+                break
+
+            centroid = [sum(vertex[1][dim] for vertex in simplex[:-1]) / size
+                        for dim in range(size)]
+            reflected = objective.evaluate(
+                [2 * c - x for c, x in zip(centroid, worst)]
+            )
+            if reflected[0] < best_value:
+                expanded = objective.evaluate(
+                    [3 * c - 2 * x for c, x in zip(centroid, worst)]
+                )
+                simplex[-1] = min(expanded, reflected,
+                                  key=lambda vertex: vertex[0])
+                continue
+            if reflected[0] < simplex[-2][0]:
+                simplex[-1] = reflected
+                continue
+
+            if reflected[0] < worst_value:
+                contracted = objective.evaluate(
+                    [(c + r) / 2.0 for c, r in zip(centroid, reflected[1])]
+                )
+            else:
+                contracted = objective.evaluate(
+                    [(c + x) / 2.0 for c, x in zip(centroid, worst)]
+                )
+            if contracted[0] < min(reflected[0], worst_value):
+                simplex[-1] = contracted
+                continue
+
+            # Shrink every vertex toward the best one.
+            simplex[1:] = [
+                objective.evaluate([(b + x) / 2.0
+                                    for b, x in zip(best, vertex[1])])
+                for vertex in simplex[1:]
+            ]
+
+
+class PatternSearch(LocalSearch):
+    """Compass pattern search: try a step forward and backward along each
+    dimension, move to the first improvement, halve the step when none of
+    them improves."""
+
+    name = 'pattern_search'
+
+    def _search(self, objective, position, value):
+        step = self.initial_step
+        while step > self.tolerance and not objective.is_exhausted:
+            improved = False
+            for dim in range(len(position)):
+                for direction in (1.0, -1.0):
+                    trial = list(position)
+                    trial[dim] += direction * step * objective.widths[dim]
+                    trial_value, trial = objective.evaluate(trial)
+                    if trial_value < value:
+                        value, position = trial_value, trial
+                        improved = True
+                        break
+            if not improved:
+                step /= 2.0
+
+
+class LBFGSB(LocalSearch):
+    """L-BFGS-B quasi-Newton method of scipy, with finite differences
+    gradients. scipy is an optional dependency, it is only imported when
+    this local search is created."""
+
+    name = 'lbfgsb'
+
+    def __init__(self, max_evaluations=None, tolerance=1e-10,
+                 initial_step=0.05):
+        try:
+            # pylint: disable=unused-import,import-error
+            import scipy.optimize  # noqa: F401
+        except ImportError as error:
+            raise ImportError('L-BFGS-B local search needs scipy.') \
+                from error
+        LocalSearch.__init__(self, max_evaluations, tolerance, initial_step)
+
+    def _search(self, objective, position, value):
+        from scipy.optimize import minimize  # pylint: disable=import-error
+
+        # Infeasible positions get a large but finite value, so the finite
+        # differences stay usable.
+        penalty = abs(value) * 1e6 + 1e6
+
+        def func(x):
+            """Signed, penalized optimizing function."""
+            ret = objective.evaluate(list(x))[0]
+            return ret if ret != float('inf') else penalty
+
+        minimize(func, position, method='L-BFGS-B',
+                 bounds=objective.boundaries,
+                 options={
+                     'maxfun': max(objective.max_evaluations -
+                                   objective.no_evaluations, 1),
+                     'ftol': self.tolerance,
+                     'gtol': self.tolerance
+                 })
+
+
+LOCAL_SEARCHES = {
+    local_search.name: local_search
+    for local_search in [NelderMead, PatternSearch, LBFGSB]
+}
+
+
+def get_local_search(local_search):
+    """
+    Get a local search object from its name.
+
+    :param local_search: Name of the local search (nelder_mead,
+    pattern_search or lbfgsb) or an initialized local search object.
+    :type local_search: str | LocalSearch
+    :rtype: LocalSearch
+    """
+
+    if isinstance(local_search, str):
+        if local_search not in LOCAL_SEARCHES:
+            raise ValueError("Unknown local search '%s'." % local_search)
+        return LOCAL_SEARCHES[local_search]()
+    return local_search
+
+
+class _Objective(object):
+    """Signed, bounded and budgeted view of an optimization, which also keeps
+    the best feasible position it has evaluated."""
+
+    def __init__(self, optimization_object, max_evaluations):
+        self.optimization_object = optimization_object
+        self.boundaries = optimization_object.boundaries
+        self.widths = [float(upper - lower) or 1.0
+                       for lower, upper in self.boundaries]
+        self.sign = -1.0 if optimization_object.find_max else 1.0
+        self.max_evaluations = max_evaluations
+        self.no_evaluations = 0
+        self.best = (None, None)
+
+    @property
+    def is_exhausted(self):
+        """The evaluation budget has been spent."""
+        return self.no_evaluations >= self.max_evaluations
+
+    def evaluate(self, position):
+        """
+        Evaluate a position after clipping it into the boundaries.
+
+        :return: Signed value (infinity if the position does not satisfy the
+        constraints) and the clipped position.
+        :rtype: tuple
+        """
+
+        position = [min(max(x, lower), upper)
+                    for x, (lower, upper) in zip(position, self.boundaries)]
+        self.no_evaluations += 1
+        if not self.optimization_object.check_constraints(position):
+            return float('inf'), position
+        value = self.optimization_object.evaluate(position)
+        if is_better(self.best[0], value, self.optimization_object.find_max):
+            self.best = (value, position)
+        return self.sign * value, position
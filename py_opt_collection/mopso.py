@@ -0,0 +1,152 @@
+"""
+MOPSO stand for Multi-Objective Particle Swarm Optimization. The swarm looks
+for the Pareto front of an optimization whose function returns a tuple of
+values: the non-dominated positions are kept in an external Pareto archive,
+and each particle follows a leader picked in the less crowded regions of
+that archive. For more please read https://doi.org/10.1109/TEVC.2004.826067
+"""
+
+from copy import deepcopy
+from .optimization import AlgorithmObject
+from .pareto import ParetoArchive
+from .profiling import BEST_UPDATES
+from .pso import VelocityRule, Particle
+from .utils import dominates
+
+
+class MOParticle(Particle):
+    """Particle of a multi-objective swarm, its values are tuples and its
+    local best is only replaced by values which dominate it (or, half of the
+    time, by values which are not dominated by it)."""
+
+    def accept(self, value):
+        self.value = value
+        if self.best[0] is None or \
+                dominates(value, self.best[0], self.find_max):
+            self.best = (value, deepcopy(self.position))
+            return True
+        if not dominates(self.best[0], value, self.find_max) and \
+                self.random_generator.random() < 0.5:
+            self.best = (value, deepcopy(self.position))
+            return True
+        return False
+
+
+class MOPSO(AlgorithmObject):
+    """This class will be the AlgorithmObject for MOPSO. The optimization's
+    find_max is a list telling, for each objective, if it is maximized (a
+    single bool applies to every objective). The swarm is updated
+    synchronously: every particle moves toward its leader, then the whole
+    swarm is evaluated as one batch through Optimization.evaluate_batch().
+
+    solve() returns the Pareto front, as a list of values and positions."""
+
+    def __init__(self, optimization_object, **kwargs):
+        """
+
+        :param optimization_object: Initialized Optimization object, its
+        optimizing function returns a tuple of values.
+        :type optimization_object: PyOptCollection.optimization.Optimization
+        :param no_particles: Total number of particles inside the swarm,
+        default is 30.
+        :type no_particles: int
+        :param no_iteration_steps: Total number of iteration steps, default
+        is 50.
+        :type no_iteration_steps: int
+        :param c_1: Local learning factor, default is 1.0.
+        :type c_1: float
+        :param c_2: Global learning factor, default is 1.0.
+        :type c_2: float
+        :param inertia: Inertia weight, see VelocityRule. Default is 0.4.
+        :type inertia: float | tuple[float]
+        :param velocity_clamp: Maximum velocity as a ratio of boundaries'
+        width, default is None (no clamping).
+        :type velocity_clamp: float
+        :param archive_size: Maximum number of positions kept in the Pareto
+        archive, default is 100.
+        :type archive_size: int
+        :param pool: Object with a map() function used to evaluate the swarm
+        when the optimization has no batch function.
+        :param kwargs:
+        """
+
+        AlgorithmObject.__init__(self, optimization_object, **kwargs)
+        self.learning_factors = kwargs.get(
+            'learning_factors',
+            (kwargs.get('c_1', 1.0), kwargs.get('c_2', 1.0))
+        )
+        self.no_particles = kwargs.get('no_particles', 30)
+        self.no_iteration_steps = kwargs.get('no_iteration_steps', 50)
+        self.inertia = kwargs.get('inertia', 0.4)
+        self.velocity_clamp = kwargs.get('velocity_clamp', None)
+        self.velocity_rule = VelocityRule(
+            self.learning_factors, self.boundaries,
+            inertia=self.inertia,
+            velocity_clamp=self.velocity_clamp
+        )
+        self.archive_size = kwargs.get('archive_size', 100)
+        self.pool = kwargs.get('pool', None)
+        if self.optimization_object.archive is not None:
+            raise ValueError('The evaluation archive only stores single '
+                             'objective values.')
+
+        self.pareto_archive = ParetoArchive(self.find_max, self.archive_size)
+        self.particles = list()
+
+    def _start_solving(self):
+        self.current_iteration_step = 0
+        self.velocity_rule.reset()
+        self.pareto_archive = ParetoArchive(self.find_max, self.archive_size)
+        self.particles = [
+            MOParticle(self.optimization_object, self.learning_factors,
+                       self.velocity_rule, evaluate=False)
+            for _i in range(self.no_particles)
+        ]
+        self._accept_batch()
+        self._take_snapshot(self.particles, self.pareto_archive.front)
+        if self.verbose:
+            print("Iteration step #%d, front size: %d" % (
+                self.current_iteration_step, len(self.pareto_archive)
+            ))
+
+        self.current_iteration_step += 1
+
+    def _iterate(self):
+        self._mopso_do_iter()
+        if self.verbose:
+            print("Iteration step #%d, front size: %d" % (
+                self.current_iteration_step, len(self.pareto_archive)
+            ))
+        self.current_iteration_step += 1
+
+    def _result(self):
+        """The solve's result is the Pareto front."""
+        return self.pareto_archive.front
+
+    def _mopso_do_iter(self):
+        """For each iteration step, solve() function will make a call to this
+        function."""
+        distances = self.pareto_archive.crowding_distances()
+        for particle in self.particles:
+            particle.move(self.pareto_archive.select(self.random_generator,
+                                                     distances))
+        no_improved = self._accept_batch()
+        self.velocity_rule.step(
+            self.current_iteration_step / float(self.no_iteration_steps - 1),
+            no_improved / float(len(self.particles))
+        )
+        self._take_snapshot(self.particles, self.pareto_archive.front)
+
+    def _accept_batch(self):
+        """Evaluate the particles' current positions as one batch, update
+        their local bests and the Pareto archive."""
+        values = self.optimization_object.evaluate_batch(
+            [particle.position for particle in self.particles], self.pool
+        )
+        no_improved = 0
+        for particle, value in zip(self.particles, values):
+            no_improved += particle.accept(tuple(value))
+            if self.pareto_archive.add(particle.value, particle.position) \
+                    and self.profiler is not None:
+                self.profiler.count(BEST_UPDATES)
+        return no_improved
@@ -1,10 +1,27 @@
 """Docstring for Optimization module."""
 
+import math
+import os
 import time
-import inspect
-import statistics
-from copy import copy
-from random import Random, randint
+from copy import copy, deepcopy
+from random import Random
+from .archive import EvaluationArchive
+from .expression import Expression
+from .linear import LinearConstraints
+from .profiling import Profiler, OBJECTIVE_CALLS, CONSTRAINT_CALLS, \
+    SPAWN_REROLLS, BEST_UPDATES, SNAPSHOTS
+from .utils import is_better
+
+
+CONTINUOUS = 'continuous'
+INTEGER = 'integer'
+
+MAX_ITERATIONS = 'max_iterations'
+TIME_BUDGET = 'time_budget'
+INTERRUPTED = 'interrupted'
+
+# Random positions drawn at most to find a feasible one.
+MAX_SPAWNS = 1000
 
 
 class Optimization(object):
@@ -19,41 +36,296 @@ class Optimization(object):
         """
 
         :param optimizing_function: A function which received a tuple of number
-        and return a final calculated value.
-        :type optimizing_function: (tuple[number]) -> number
+        and return a final calculated value, or the formula of that value
+        over the variables x0 .. xn, "(1 - x0) ** 2 + 100 * x1" for example.
+        A formula is compiled once, and if NumPy is available it is also
+        used as a vectorized batch function.
+        :type optimizing_function: ((tuple[number]) -> number) | str
         :param boundaries: list of tuples contains upper and lower limit of
         variables.
         :type boundaries: list[tuple[number]]
         :param no_dimensions: Number of total variable in the problem.
         :type no_dimensions: int
         :param find_max: Is this optimization used to find Max
-        (if not then it is Min).
-        :type find_max: bool
+        (if not then it is Min). For multi-objective optimizations, whose
+        optimizing function returns a tuple of values, it can be a list
+        telling it for each objective.
+        :type find_max: bool | list[bool]
         :param seed: used as an predefined method to control how example data
-        being generated.
+        being generated. If not given, a seed is drawn from the operating
+        system's randomness source, it is kept in the seed attribute so the
+        run can be reproduced.
         :type seed: int
+        :param batch_function: Optional function which received a list of
+        positions and return the list of their values at once, for example a
+        vectorized version of optimizing_function.
+        :type batch_function: (list[tuple[number]]) -> list[number]
+        :param variable_types: Type of each variable: 'continuous'
+        (default), 'integer', or the list of values of a categorical
+        variable. Integer variables' boundaries are rounded inward,
+        categorical variables are coded by the index of their value and
+        their boundaries are replaced by the range of these indexes.
+        :type variable_types: list[str | list]
         """
 
         self.func = optimizing_function
+        self.batch_func = kwargs.get('batch_function', None)
         self.boundaries = boundaries
         self.no_dimensions = kwargs.get('no_dimensions', 1)
+        if isinstance(self.func, str):
+            self.func = self._expression(self.func)
+        if self.batch_func is None and isinstance(self.func, Expression) \
+                and self.func.vectorized:
+            self.batch_func = self.func.evaluate_batch
         self.find_max = kwargs.get('find_max', False)
 
-        self.random_generator = Random()
-        seed = kwargs.get('seed', None)
-        self.random_generator.seed(int(time.time()) if seed is None else seed)
+        self.variable_types = kwargs.get(
+            'variable_types', [CONTINUOUS] * self.no_dimensions
+        )
+        if len(self.variable_types) != self.no_dimensions:
+            raise ValueError('Expecting one variable type per dimension.')
+        self.discrete_dims = [
+            dim for dim, variable_type in enumerate(self.variable_types)
+            if variable_type != CONTINUOUS
+        ]
+        if self.discrete_dims:
+            self.boundaries = list(boundaries)
+            for dim in self.discrete_dims:
+                if self.variable_types[dim] == INTEGER:
+                    lower, upper = boundaries[dim]
+                    self.boundaries[dim] = (int(math.ceil(lower)),
+                                            int(math.floor(upper)))
+                else:
+                    self.boundaries[dim] = \
+                        (0, len(self.variable_types[dim]) - 1)
+
+        self.seed = kwargs.get('seed', None)
+        if self.seed is None:
+            self.seed = new_seed()
+        self.random_generator = Random(self.seed)
 
         self.constraints = list()
+        self.linear_constraints = None
+        self.profiler = None
+        self.archive = None
+        self.parameters = None
+
+    def enable_archive(self, tolerance=0.0):
+        """
+        Start archiving every evaluated position. Positions which are already
+        in the archive (or nearer than tolerance to an archived one) will not
+        be evaluated again.
+
+        :param tolerance: Distance under which two positions are considered
+        as duplicated, default is 0.0 (exact duplicates only).
+        :type tolerance: float
+        :return: The archive.
+        :rtype: py_opt_collection.archive.EvaluationArchive
+        """
+
+        if self.archive is None:
+            self.archive = EvaluationArchive(self.no_dimensions, tolerance)
+        return self.archive
+
+    def import_archive(self, archive, transform=None):
+        """
+        Reuse the evaluations of another archive, the one of a previous
+        solve of this problem for example, so they are not evaluated again.
+        Only import them while the optimizing function gives the same values
+        to these positions (when only the resources or the constraints have
+        changed, for example). The positions are validated again: the ones
+        outside the boundaries are dropped, and their feasibility is checked
+        against the constraints of this optimization. The archive is enabled,
+        with the tolerance of the imported one, if it is not already.
+
+        :param archive: The archive to import.
+        :type archive: py_opt_collection.archive.EvaluationArchive
+        :param transform: Function mapping an archived position to this
+        optimization's variables, or returning None to drop it. Default is
+        None, the positions are kept as they are.
+        :type transform: (list[number]) -> list[number] | None
+        :return: Number of imported evaluations.
+        :rtype: int
+        """
+
+        own_archive = self.enable_archive(archive.tolerance)
+        ret = 0
+        for index in range(len(archive)):
+            position = archive.position(index)
+            if transform is not None:
+                position = transform(position)
+                if position is None:
+                    continue
+            if len(position) != self.no_dimensions:
+                raise ValueError('Imported positions must have %d '
+                                 'dimensions.' % self.no_dimensions)
+            position = self.discretize(position)
+            if not all(lower <= x <= upper for x, (lower, upper)
+                       in zip(position, self.boundaries)) or \
+                    own_archive.lookup(position, 0.0) is not None:
+                continue
+            own_archive.add(position, archive.values[index],
+                            self.check_constraints(position))
+            ret += 1
+        return ret
+
+    def discretize(self, position):
+        """
+        Round the integer and categorical variables of a position to their
+        nearest allowed value. Continuous variables are left as they are.
+
+        :param position: Position to be discretized.
+        :type position: list[number]
+        :return: The discretized position, position itself if every variable
+        is continuous.
+        :rtype: list[number]
+        """
+
+        if not self.discrete_dims:
+            return position
+        ret = list(position)
+        for dim in self.discrete_dims:
+            lower, upper = self.boundaries[dim]
+            ret[dim] = min(max(int(round(ret[dim])), lower), upper)
+        return ret
+
+    def decode(self, position):
+        """
+        Translate a position into the variables' values: integer variables
+        are rounded and categorical ones are replaced by their values. This
+        is what the optimizing function and the constraints receive.
+
+        :param position: Position to be decoded.
+        :type position: list[number]
+        :return: The variables' values, position itself if every variable is
+        continuous.
+        :rtype: list
+        """
+
+        if not self.discrete_dims:
+            return position
+        ret = self.discretize(position)
+        for dim in self.discrete_dims:
+            if self.variable_types[dim] != INTEGER:
+                ret[dim] = self.variable_types[dim][ret[dim]]
+        return ret
+
+    def evaluate(self, position, feasible=True):
+        """
+        Evaluate one position, through the archive if it is enabled.
+
+        :param position: Position to be evaluated.
+        :type position: list[number]
+        :param feasible: The position satisfies the constraints or not, kept
+        in the archive.
+        :type feasible: bool
+        :return: Value of the position.
+        :rtype: number
+        """
+
+        if self.archive is None:
+            return self.func(self.decode(position))
+        position = self.discretize(position)
+        index = self.archive.lookup(position)
+        if index is not None:
+            return self.archive.values[index]
+        value = self.func(self.decode(position))
+        self.archive.add(position, value, feasible)
+        return value
+
+    def evaluate_batch(self, positions, pool=None):
+        """
+        Evaluate many positions at once, using the batch function if there
+        is one, else the pool if given, else one by one. If the archive is
+        enabled, archived and repeated positions are evaluated only once. So
+        are positions with discrete variables which discretize to the same
+        configuration.
+
+        :param positions: Positions to be evaluated.
+        :type positions: list[list[number]]
+        :param pool: Object with a map() function, multiprocessing.Pool for
+        example.
+        :return: Values of the positions, in the same order.
+        :rtype: list[number]
+        """
+
+        if self.archive is None and not self.discrete_dims:
+            return self._evaluate_batch(positions, pool)
+
+        values = [None] * len(positions)
+        missed = dict()
+        for i, position in enumerate(positions):
+            position = self.discretize(position)
+            index = None if self.archive is None \
+                else self.archive.lookup(position)
+            if index is None:
+                missed.setdefault(tuple(position), list()).append(i)
+            else:
+                values[i] = self.archive.values[index]
+        missed_positions = [list(position) for position in missed]
+        for position, value, indexes in zip(
+                missed_positions,
+                self._evaluate_batch(missed_positions, pool),
+                missed.values()):
+            if self.archive is not None:
+                self.archive.add(position, value)
+            for i in indexes:
+                values[i] = value
+        return values
+
+    def _evaluate_batch(self, positions, pool):
+        if not positions:
+            return list()
+        if self.discrete_dims:
+            positions = [self.decode(position) for position in positions]
+        if self.batch_func is not None:
+            return list(self.batch_func(positions))
+        if pool is not None:
+            return list(pool.map(self.func, positions))
+        return [self.func(position) for position in positions]
 
     def add_constraint(self, constraint_func):
         """
 
-        :param constraint_func:
-        :type constraint_func: optimizing_function: (tuple[number]) -> bool
+        :param constraint_func: A function which received a tuple of number
+        and return if they satisfy the constraint, or its formula over the
+        variables x0 .. xn, "x0 + x1 <= 10" for example.
+        :type constraint_func: ((tuple[number]) -> bool) | str
         """
 
+        if isinstance(constraint_func, str):
+            constraint_func = self._expression(constraint_func)
+        if self.profiler is not None:
+            constraint_func = \
+                self.profiler.wrap(CONSTRAINT_CALLS, constraint_func)
         self.constraints.append(constraint_func)
 
+    def add_linear_constraints(self, a_ub=None, b_ub=None, a_eq=None,
+                               b_eq=None):
+        """
+        Add linear constraints in matrix form: a_ub * x <= b_ub and
+        a_eq * x = b_eq. They apply to the coded positions (categorical
+        variables are coded by the index of their value). The algorithms use
+        them to repair infeasible positions by projection and to spawn
+        positions inside the feasible polytope.
+
+        :param a_ub: Coefficients of the inequalities, one row each.
+        :type a_ub: list[list[number]]
+        :param b_ub: Upper bounds of the inequalities.
+        :type b_ub: list[number]
+        :param a_eq: Coefficients of the equalities, one row each.
+        :type a_eq: list[list[number]]
+        :param b_eq: Right hand sides of the equalities.
+        :type b_eq: list[number]
+        :return: The linear constraints of the optimization.
+        :rtype: py_opt_collection.linear.LinearConstraints
+        """
+
+        if self.linear_constraints is None:
+            self.linear_constraints = LinearConstraints(self.no_dimensions)
+        self.linear_constraints.add(a_ub, b_ub, a_eq, b_eq)
+        return self.linear_constraints
+
     def check_constraints(self, position):
         """Check if one position satisfy all the constraints of the
         optimization including individual variable's boundaries."""
@@ -62,15 +334,113 @@ class Optimization(object):
             ret &= self.boundaries[dim][0] <= \
                    position[dim] <= \
                    self.boundaries[dim][1]
+        if self.linear_constraints is not None:
+            ret &= self.linear_constraints.check(position)
+        if self.constraints:
+            position = self.decode(position)
         for func in self.constraints:
             ret &= func(position)
         return ret
 
+    def check_constraints_batch(self, positions):
+        """
+        Check many positions at once, the linear constraints of all the
+        positions are checked by one matrix product if NumPy is installed
+        (see LinearConstraints.check_batch()).
+
+        :param positions: Positions to be checked.
+        :type positions: list[list[number]]
+        :return: Each position satisfies all the constraints or not.
+        :rtype: list[bool]
+        """
+
+        ret = [
+            all(lower <= x <= upper
+                for x, (lower, upper) in zip(position, self.boundaries))
+            for position in positions
+        ]
+        if self.linear_constraints is not None:
+            ret = [feasible and linear_feasible for feasible, linear_feasible
+                   in zip(ret, self.linear_constraints.check_batch(positions))]
+        if self.constraints:
+            for i, position in enumerate(positions):
+                if ret[i]:
+                    position = self.decode(position)
+                    ret[i] = all(func(position) for func in self.constraints)
+        return ret
+
+    def enable_profiling(self, profiler=None):
+        """
+        Start counting and timing the objective and constraints' calls. The
+        functions are wrapped only while profiling is enabled, so there is no
+        overhead when it is not.
+
+        :param profiler: Profiler to report into, a new one will be created
+        if not given.
+        :type profiler: py_opt_collection.profiling.Profiler
+        :return: The attached profiler.
+        :rtype: py_opt_collection.profiling.Profiler
+        """
+
+        if self.profiler is None:
+            self.profiler = profiler if profiler is not None else Profiler()
+            self.func = self.profiler.wrap(OBJECTIVE_CALLS, self.func)
+            if self.batch_func is not None:
+                self.batch_func = self.profiler.wrap(
+                    OBJECTIVE_CALLS, self.batch_func, batch=True
+                )
+            self.constraints = [
+                self.profiler.wrap(CONSTRAINT_CALLS, func)
+                for func in self.constraints
+            ]
+        return self.profiler
+
+    def disable_profiling(self):
+        """Detach the profiler and restore the original functions."""
+        if self.profiler is not None:
+            self.func = self.func.__wrapped__
+            if self.batch_func is not None:
+                self.batch_func = self.batch_func.__wrapped__
+            self.constraints = [
+                func.__wrapped__ for func in self.constraints
+            ]
+            self.profiler = None
+
+    def _expression(self, source):
+        return Expression(source,
+                          ['x%d' % dim for dim in range(self.no_dimensions)])
+
+    def bind(self, parameters):
+        """
+        Make one instance of a parameterized optimization, whose functions
+        (optimizing, batch and constraints) receive the instance's parameters
+        as their second argument: f(position, parameters), and for the batch
+        function f(positions, list of parameters of each position). The
+        instance is a shallow copy of this object, its parameters attribute
+        is set, and it gets its own archive if this object has one.
+
+        :param parameters: Parameters of the instance.
+        :return: The instance.
+        :rtype: Optimization
+        """
+
+        ret = copy(self)
+        ret.parameters = parameters
+        ret.func = _BoundFunction(self.func, parameters)
+        if self.batch_func is not None:
+            ret.batch_func = _BoundBatchFunction(self.batch_func, parameters)
+        ret.constraints = [_BoundFunction(func, parameters)
+                           for func in self.constraints]
+        if self.archive is not None:
+            ret.archive = EvaluationArchive(self.no_dimensions,
+                                            self.archive.tolerance)
+        return ret
+
     def __repr__(self):
         return "Optimization Object\n" \
                "===================\n" \
-               "  Optimization Function: \n  " + \
-               "  ".join(inspect.getsourcelines(self.func)[0]) + \
+               "  Optimization Function: \n    " + \
+               _describe(self.func) + "\n" + \
                "  ------------------\n" + \
                "  Variables: " + \
                "  ".join(["x%d" % i for i in range(self.no_dimensions)]) + \
@@ -83,11 +453,45 @@ class Optimization(object):
                ) + "\n" + \
                "  ------------------\n" + \
                "  Constraints: \n    " + \
-               "    ".join([
-                   "    ".join(
-                       inspect.getsourcelines(f)[0]
-                   ) for f in self.constraints
-               ]) + "\n==================="
+               "\n    ".join(
+                   [_describe(f) for f in self.constraints] +
+                   (["%d linear constraints" % len(self.linear_constraints)]
+                    if self.linear_constraints is not None else [])
+               ) + "\n==================="
+
+
+class _BoundFunction(object):
+    """Function of a parameterized optimization bound to the parameters of
+    one instance, it can be pickled to be used in a process pool."""
+
+    def __init__(self, func, parameters):
+        self.func = func
+        self.parameters = parameters
+
+    def __call__(self, position):
+        return self.func(position, self.parameters)
+
+    def __repr__(self):
+        return '%s bound to %r' % (_describe(self.func), self.parameters)
+
+
+class _BoundBatchFunction(_BoundFunction):
+    """Batch function of a parameterized optimization bound to the
+    parameters of one instance."""
+
+    def __call__(self, positions):
+        return self.func(positions, [self.parameters] * len(positions))
+
+
+def _describe(func):
+    """Name of a function, or representation of a callable object, without
+    reading any source file."""
+    while hasattr(func, '__wrapped__'):
+        func = func.__wrapped__
+    name = getattr(func, '__qualname__', None)
+    if name is None:
+        return repr(func)
+    return '%s.%s' % (getattr(func, '__module__', None), name)
 
 
 class OptimizationMixin(object):
@@ -118,10 +522,22 @@ class OptimizationMixin(object):
         attribute."""
         return self.optimization_object.random_generator
 
+    @property
+    def profiler(self):
+        """Shortening the way to access Optimization.profiler attribute,
+        None if profiling is not enabled."""
+        return self.optimization_object.profiler
+
 
 class AlgorithmObject(OptimizationMixin):
     """This is the skeleton for other algorithm objects, for example: PSO.
-    The skeleton has some class' functions and properties to be used."""
+    The skeleton has some class' functions and properties to be used.
+
+    A solve runs step-wise: _start_solving() initializes it (the first
+    iteration step), each call of _iterate() runs the next iteration step,
+    and _end_solving() releases what the solve used. solve(), iter_solve()
+    and step() are built on them, so a solve can be paused, resumed,
+    interleaved with other work or stopped by a time budget."""
 
     def __init__(self, optimization_object, **kwargs):
         """
@@ -140,38 +556,207 @@ class AlgorithmObject(OptimizationMixin):
         :param is_copy: This object is copy from other Algorithm object,
         therefore need to update the seed. Default False.
         :type is_copy: bool
+        :param profiling: Count and time the hot paths of the solver, pass a
+        Profiler object to report into it. Default False.
+        :type profiling: bool | py_opt_collection.profiling.Profiler
+        :param no_iteration_steps: Total number of iteration steps, default
+        is 1 (the algorithms have their own defaults).
+        :type no_iteration_steps: int
         """
 
         self.optimization_object = optimization_object
         self.best = (None, None)
+        self.no_iteration_steps = kwargs.get('no_iteration_steps', 1)
+        self.current_iteration_step = 0
+        # Why the last solve stopped: MAX_ITERATIONS, TIME_BUDGET or
+        # INTERRUPTED (its iter_solve() generator has been closed).
+        self.stop_reason = None
+        self._solving = None
 
         self.verbose = kwargs.get('verbose', False)
 
         if kwargs.get('historical', False):
             self.snapshots = list()
 
+        self.profiling = kwargs.get('profiling', False)
+        if self.profiling:
+            self.optimization_object.enable_profiling(
+                None if self.profiling is True else self.profiling
+            )
+
         if kwargs.get('is_copy', False):
-            timestamp = int(time.time())
+            self.optimization_object.seed = new_seed()
             self.optimization_object.random_generator.\
-                seed(timestamp + randint(1, timestamp))
+                seed(self.optimization_object.seed)
 
-    def solve(self):
+    def solve(self, time_budget=None):
         """
         Do solving and return the best result of the optimization.
 
+        :param time_budget: Stop the solve once this many seconds (of wall
+        clock time) have passed, the budget is checked after each iteration
+        step. Default is None, running every iteration step.
+        :type time_budget: float
         :return: Optimized position and value.
         :rtype: (number, list[number])
         """
 
+        self._stop_solving()
+        deadline = None if time_budget is None \
+            else time.monotonic() + time_budget
+        steps = self.iter_solve()
+        for _result in steps:
+            if deadline is not None and self.stop_reason is None and \
+                    time.monotonic() >= deadline:
+                self.stop_reason = TIME_BUDGET
+                steps.close()
+        return self._result()
+
+    def iter_solve(self):
+        """
+        Generator running a new solve, one iteration step at a time. It
+        yields the result so far (the best value and position) after each
+        iteration step, the solve is paused between them. Closing the
+        generator stops the solve.
+
+        :rtype: collections.Iterable[(number, list[number])]
+        """
+
+        self.stop_reason = None
+        self._start_solving()
+        try:
+            yield self._result()
+            while self.current_iteration_step < self.no_iteration_steps:
+                self._iterate()
+                yield self._result()
+            self.stop_reason = MAX_ITERATIONS
+        finally:
+            if self.stop_reason is None:
+                self.stop_reason = INTERRUPTED
+            self._end_solving()
+
+    def step(self):
+        """
+        Run the next iteration step of the current solve, the first call
+        starts a new one. Once the last iteration step has run, the solve is
+        ended (stop_reason is set) and the next call starts a new solve.
+
+        :return: The result so far, see iter_solve().
+        :rtype: (number, list[number])
+        """
+
+        if self._solving is None:
+            self._solving = self.iter_solve()
+        ret = next(self._solving)
+        if self.current_iteration_step >= self.no_iteration_steps:
+            # The last iteration step has run, the solve ends normally.
+            next(self._solving, None)
+            self._solving = None
+        return ret
+
+    def _stop_solving(self):
+        """Stop the solve started by step(), if there is one, without
+        running its remaining iteration steps."""
+        if self._solving is not None:
+            self._solving.close()
+            self._solving = None
+
+    def _start_solving(self):
+        """Initialize a solve, this is its first iteration step."""
         self.best = (self.random_generator.random(),
                      [self.random_generator.random()])
+        self.current_iteration_step = 1
+
+    def _iterate(self):
+        """Run the next iteration step."""
+        self.current_iteration_step += 1
+
+    def _end_solving(self):
+        """Release what the solve used, it is called once the solve has
+        ended or has been stopped."""
+
+    def _result(self):
+        """Result of the solve so far."""
         return self.best
 
+    def _take_snapshot(self, *state):
+        """Store deep copies of the given state if the object is
+        historical."""
+        try:
+            snapshots = self.snapshots
+        except AttributeError:
+            return
+        if self.profiler is None:
+            snapshots.append(tuple(deepcopy(s) for s in state))
+        else:
+            with self.profiler.measure(SNAPSHOTS):
+                snapshots.append(tuple(deepcopy(s) for s in state))
+
+    def _random_position(self):
+        """Position drawn uniformly inside the boundaries, with its
+        discrete variables rounded."""
+        return self.optimization_object.discretize([
+            self.random_generator.uniform(self.boundaries[dim][0],
+                                          self.boundaries[dim][1])
+            for dim in range(self.no_dimensions)
+        ])
+
+    def _feasible_random_position(self):
+        """Random position satisfying the constraints, it is drawn again
+        until it does, at most MAX_SPAWNS times."""
+        position = self._random_position()
+        no_spawns = 1
+        while not self.optimization_object.check_constraints(position):
+            if no_spawns >= MAX_SPAWNS:
+                raise ValueError('No feasible position has been found in %d '
+                                 'spawns, the constraints may be '
+                                 'unsatisfiable.' % MAX_SPAWNS)
+            position = self._random_position()
+            no_spawns += 1
+            if self.profiler is not None:
+                self.profiler.count(SPAWN_REROLLS)
+        return position
+
+    def _improve_best(self, value, position):
+        """Replace the best by a value and its position if it is
+        better."""
+        if is_better(self.best[0], value, self.find_max):
+            self.best = (value, deepcopy(position))
+            if self.profiler is not None:
+                self.profiler.count(BEST_UPDATES)
+
     def __copy__(self):
         kwargs = copy(self.__dict__)
         kwargs['is_copy'] = True
         return type(self)(**kwargs)
 
+    def copy_trial(self, **kwargs):
+        """
+        Copy the algorithm object for an independent trial: the copy works
+        on a shallow copy of the optimization object (sharing its functions,
+        constraints and archive) which has its own, newly seeded, random
+        generator.
+
+        :param kwargs: Attributes to be overridden in the copy, the
+        optimization_object one replaces the optimization object to be
+        copied, and seed is the seed of the copy's random generator
+        (default is a new one drawn from the operating system).
+        :return: The copy.
+        :rtype: AlgorithmObject
+        """
+
+        optimization_object = copy(
+            kwargs.pop('optimization_object', self.optimization_object)
+        )
+        seed = kwargs.pop('seed', None)
+        optimization_object.seed = seed if seed is not None else new_seed()
+        optimization_object.random_generator = \
+            Random(optimization_object.seed)
+        copy_kwargs = copy(self.__dict__)
+        copy_kwargs.update(kwargs)
+        copy_kwargs['optimization_object'] = optimization_object
+        return type(self)(**copy_kwargs)
+
 
 class MultipleSolving(object):
     """Use this class whenever you want to run one optimization more than one
@@ -193,31 +778,68 @@ class MultipleSolving(object):
         self.results = list()
         self.totals_time = list()
         self.results_value_only = list()
+        self.trials = list()
         self.stat = dict()
         self.is_run = False
 
-    def _exec_algorithm_object(self, algorithm_obj):
+    @staticmethod
+    def _exec_algorithm_object(algorithm_obj):
         _t = time.process_time()
-        self.results.append(algorithm_obj.solve())
-        self.totals_time.append(time.process_time() - _t)
+        result = algorithm_obj.solve()
+        return _trial(algorithm_obj.optimization_object.seed, result,
+                      time.process_time() - _t, algorithm_obj.stop_reason)
 
-    def run(self, pool=None):
+    def run(self, pool=None, batched=False):
         """
-        Start running the optimizations, then sort the results.
+        Start running the optimizations, then sort the results. Every trial
+        is also recorded in the trials attribute, in the order it was run, as
+        a dictionary of its seed, best value and position, process time and
+        stop reason (see py_opt_collection.results_store to keep them).
 
         :param pool: multiprocessing.Pool object, used for parallel computing.
+        In batched mode, it is used to evaluate the batches.
+        :param batched: Run all the trials at once, in lockstep, through the
+        algorithm object's solve_batch() function. Each iteration step of
+        every trial is evaluated as one batch, so a vectorized batch function
+        serves all of them together, and PSO moves the swarms of all the
+        trials together with NumPy when it can. Default is False.
+        :type batched: bool
         :return: None
         """
-        algorithm_objects = list()
-        for _i in range(self.no_tries):
-            algorithm_objects.append(copy(self.ori_algorithm_obj))
-        if pool:
-            pool.map(self._exec_algorithm_object, algorithm_objects)
-            pool.close()
-            pool.join()
+        import statistics
+        if batched:
+            if not hasattr(self.ori_algorithm_obj, 'solve_batch'):
+                raise ValueError('%s does not support batched runs.' %
+                                 type(self.ori_algorithm_obj).__name__)
+            seeds = [new_seed() for _i in range(self.no_tries)]
+            _t = time.process_time()
+            results = self.ori_algorithm_obj.solve_batch(self.no_tries, pool,
+                                                         seeds)
+            # Trials run together, the time is shared between them.
+            _t = (time.process_time() - _t) / self.no_tries
+            trials = [_trial(seed, result, _t, MAX_ITERATIONS)
+                      for seed, result in zip(seeds, results)]
+            if pool:
+                pool.close()
+                pool.join()
         else:
-            for algorithm_object in algorithm_objects:
-                self._exec_algorithm_object(algorithm_object)
+            # Each trial has its own random generator, so its seed can be
+            # recorded to reproduce it.
+            algorithm_objects = [self.ori_algorithm_obj.copy_trial()
+                                 for _i in range(self.no_tries)]
+            if pool:
+                trials = pool.map(self._exec_algorithm_object,
+                                  algorithm_objects)
+                pool.close()
+                pool.join()
+            else:
+                trials = [self._exec_algorithm_object(algorithm_object)
+                          for algorithm_object in algorithm_objects]
+        self.trials.extend(trials)
+        self.results.extend(
+            (trial['value'], trial['position']) for trial in trials
+        )
+        self.totals_time.extend(trial['time'] for trial in trials)
 
         self.results = sorted(self.results,
                               reverse=self.ori_algorithm_obj.find_max)
@@ -257,3 +879,20 @@ class MultipleSolving(object):
                 format(**self.stat)
 
         return ret_str
+
+
+def _trial(seed, result, process_time, stop_reason):
+    """Record of one trial of MultipleSolving."""
+    return {'seed': seed, 'value': result[0], 'position': result[1],
+            'time': process_time, 'stop_reason': stop_reason}
+
+
+def new_seed():
+    """
+    Draw a new seed from the operating system's randomness source, so
+    processes started at the same time do not share their random numbers.
+
+    :rtype: int
+    """
+
+    return int.from_bytes(os.urandom(8), 'big')
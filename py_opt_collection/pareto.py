@@ -0,0 +1,176 @@
+"""
+This module contains the Pareto archive of multi-objective algorithms. The
+archive keeps the non-dominated positions found so far (the Pareto front),
+and bounds its size by pruning the most crowded ones, so the front stays
+spread along the trade-off between the objectives.
+"""
+
+from bisect import bisect_left
+from .utils import dominates
+
+
+class ParetoArchive(object):
+    """Archive of non-dominated positions. Values are kept signed so every
+    objective is minimized internally.
+
+    With two objectives, the front is kept sorted by the first objective, on
+    which the second one is strictly decreasing: an insertion only needs a
+    binary search and looks at its neighbors, and the positions it dominates
+    are the contiguous run following it. With more objectives, insertions
+    scan the whole front."""
+
+    def __init__(self, find_max, capacity=100):
+        """
+        :param find_max: Look for the max of every objective, or a list
+        telling it for each objective.
+        :type find_max: bool | list[bool]
+        :param capacity: Maximum number of positions, the most crowded ones
+        are pruned beyond it. Default is 100.
+        :type capacity: int
+        """
+
+        self.find_max = find_max
+        self.capacity = capacity
+        self.values = list()
+        self.positions = list()
+        self._signed = list()
+        self._keys = list()
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def front(self):
+        """Values and positions of the front, sorted by the first
+        objective."""
+        return list(zip(self.values, self.positions))
+
+    def add(self, values, position):
+        """
+        Try to add a position into the front. It is rejected if a position
+        of the front dominates or equals it, otherwise the positions it
+        dominates are removed.
+
+        :param values: Values of the position.
+        :type values: tuple[number]
+        :param position: The position.
+        :type position: list[number]
+        :return: The position has been added (and not pruned right away) or
+        not.
+        :rtype: bool
+        """
+
+        signed = self._sign(values)
+        if len(signed) == 2:
+            index = self._insert_2d(signed)
+        else:
+            index = self._insert_nd(signed)
+        if index is None:
+            return False
+        self.values.insert(index, tuple(values))
+        self.positions.insert(index, list(position))
+        self._signed.insert(index, signed)
+        self._keys.insert(index, signed[0])
+
+        if len(self.values) > self.capacity:
+            distances = self.crowding_distances()
+            pruned = min(range(len(distances)), key=distances.__getitem__)
+            self._remove(pruned)
+            return pruned != index
+        return True
+
+    def crowding_distances(self):
+        """
+        Crowding distance of each position of the front: the sum over the
+        objectives of the normalized gap between its two neighbors. The
+        extreme positions get an infinite distance.
+
+        :return: Distances, in the order of the front.
+        :rtype: list[float]
+        """
+
+        size = len(self._signed)
+        distances = [0.0] * size
+        if size < 3:
+            return [float('inf')] * size
+        for objective in range(len(self._signed[0])):
+            if len(self._signed[0]) == 2:
+                # The front is already sorted on both objectives.
+                order = list(range(size))
+            else:
+                order = sorted(range(size), key=lambda i, o=objective:
+                               self._signed[i][o])
+            low = self._signed[order[0]][objective]
+            high = self._signed[order[-1]][objective]
+            distances[order[0]] = distances[order[-1]] = float('inf')
+            if high == low:
+                continue
+            for rank in range(1, size - 1):
+                distances[order[rank]] += abs(
+                    self._signed[order[rank + 1]][objective] -
+                    self._signed[order[rank - 1]][objective]
+                ) / abs(high - low)
+        return distances
+
+    def select(self, random_generator, distances=None):
+        """
+        Pick a leader in the front by a binary tournament on the crowding
+        distances, which favors the less crowded regions.
+
+        :param random_generator: Random generator of the optimization.
+        :type random_generator: random.Random
+        :param distances: Crowding distances, computed if not given.
+        :type distances: list[float]
+        :return: Values and position of the leader.
+        :rtype: tuple
+        """
+
+        if distances is None:
+            distances = self.crowding_distances()
+        index_a = random_generator.randrange(len(self.values))
+        index_b = random_generator.randrange(len(self.values))
+        index = index_a if distances[index_a] >= distances[index_b] \
+            else index_b
+        return self.values[index], self.positions[index]
+
+    def _sign(self, values):
+        if isinstance(self.find_max, bool):
+            find_max = [self.find_max] * len(values)
+        else:
+            find_max = self.find_max
+        return tuple(-v if is_greater else v
+                     for v, is_greater in zip(values, find_max))
+
+    def _insert_2d(self, signed):
+        index = bisect_left(self._keys, signed[0])
+        # The previous position is the best on the second objective among
+        # those which are better on the first one.
+        if index > 0 and self._signed[index - 1][1] <= signed[1]:
+            return None
+        if index < len(self._signed) and \
+                self._signed[index][0] == signed[0] and \
+                self._signed[index][1] <= signed[1]:
+            return None
+        end = index
+        while end < len(self._signed) and self._signed[end][1] >= signed[1]:
+            end += 1
+        del self.values[index:end]
+        del self.positions[index:end]
+        del self._signed[index:end]
+        del self._keys[index:end]
+        return index
+
+    def _insert_nd(self, signed):
+        for other in self._signed:
+            if other == signed or dominates(other, signed, False):
+                return None
+        for index in reversed(range(len(self._signed))):
+            if dominates(signed, self._signed[index], False):
+                self._remove(index)
+        return len(self._signed)
+
+    def _remove(self, index):
+        del self.values[index]
+        del self.positions[index]
+        del self._signed[index]
+        del self._keys[index]
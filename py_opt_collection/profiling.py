@@ -0,0 +1,162 @@
+"""
+This module contains the opt-in instrumentation layer of the solvers. A
+Profiler counts and times the hot paths of an optimization (objective calls,
+constraint calls, repairs, ...) and exports them as a structured report or
+as OpenMetrics text which can be read by a local scraper.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+
+OBJECTIVE_CALLS = 'objective_calls'
+CONSTRAINT_CALLS = 'constraint_calls'
+REPAIR_RETRIES = 'repair_retries'
+PROJECTIONS = 'projections'
+SPAWN_REROLLS = 'spawn_rerolls'
+INFEASIBLE_REJECTIONS = 'infeasible_rejections'
+BEST_UPDATES = 'best_updates'
+SNAPSHOTS = 'snapshots'
+
+
+class Profiler(object):
+    """Collect counters and timers. A Profiler is only attached to an
+    Optimization object when profiling is enabled, the solvers do not pay
+    anything for it otherwise."""
+
+    def __init__(self):
+        self.counters = dict()
+        self.timers = dict()
+        self._lock = threading.Lock()
+
+    def count(self, name, value=1):
+        """
+        Increase a counter.
+
+        :param name: Name of the counter.
+        :type name: str
+        :param value: Amount to be added, default is 1.
+        :type value: int
+        """
+
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_time(self, name, seconds, value=1):
+        """
+        Increase a counter and add the time spent into its timer.
+
+        :param name: Name of the counter.
+        :type name: str
+        :param seconds: Time spent.
+        :type seconds: float
+        :param value: Amount to be added into the counter, default is 1.
+        :type value: int
+        """
+
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+            self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+    def wrap(self, name, func, batch=False):
+        """
+        Return a function which does the same as func, but every call of it
+        is counted and timed under name.
+
+        :param name: Name of the counter.
+        :type name: str
+        :param func: Function to be wrapped.
+        :type func: function
+        :param batch: func receives a list of items as its first argument,
+        each item is counted as one call. Default is False.
+        :type batch: bool
+        :rtype: function
+        """
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            """Counted and timed function call."""
+            _t = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add_time(name, time.perf_counter() - _t,
+                              len(args[0]) if batch else 1)
+
+        return wrapper
+
+    @contextmanager
+    def measure(self, name):
+        """Context manager which counts and times the wrapped block."""
+        _t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - _t)
+
+    def reset(self):
+        """Clear all counters and timers."""
+        with self._lock:
+            self.counters.clear()
+            self.timers.clear()
+
+    def report(self):
+        """
+        Return a structured report of the collected metrics.
+
+        :return: Dictionary of metrics' names and their count, total time
+        and mean time (None for counters which are not timed).
+        :rtype: dict
+        """
+
+        with self._lock:
+            ret = dict()
+            for name, count in self.counters.items():
+                total_time = self.timers.get(name, None)
+                ret[name] = {
+                    'count': count,
+                    'total_time': total_time,
+                    'mean_time':
+                        total_time / count
+                        if total_time is not None and count else None
+                }
+        return ret
+
+    def to_openmetrics(self, prefix='py_opt_collection'):
+        """
+        Export the collected metrics in OpenMetrics text format.
+
+        :param prefix: Prefix of the metrics' names.
+        :type prefix: str
+        :rtype: str
+        """
+
+        lines = list()
+        for name, metric in sorted(self.report().items()):
+            metric_name = '%s_%s' % (prefix, name)
+            lines.append('# TYPE %s counter' % metric_name)
+            lines.append('%s_total %d' % (metric_name, metric['count']))
+            if metric['total_time'] is not None:
+                lines.append('# TYPE %s_seconds counter' % metric_name)
+                lines.append('# UNIT %s_seconds seconds' % metric_name)
+                lines.append('%s_seconds_total %r' % (
+                    metric_name, metric['total_time']
+                ))
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def __deepcopy__(self, memo):
+        # Snapshots deep copy the optimization object, they should keep
+        # reporting into the same profiler.
+        return self
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -3,18 +3,176 @@ PSO stand for Particle Swarm Optimization. A metaheuristic optimize method
 based on how particles in a swarm looking for food. For more please read
 https://viisix.space/algorijs/01-particles-swarm-optimization/
 """
+# pylint: disable=too-many-lines
 
+import math
+import pickle
 from copy import deepcopy
-from .optimization import AlgorithmObject, OptimizationMixin
+from .optimization import MAX_ITERATIONS, MAX_SPAWNS, AlgorithmObject, \
+    OptimizationMixin
+from .profiling import REPAIR_RETRIES, PROJECTIONS, SPAWN_REROLLS, \
+    BEST_UPDATES
+from .batch import create_batch
+from .history import HistoryWriter
+from .jit import BACKENDS, PYTHON, create_kernel
+from .local_search import get_local_search
+from .topologies import get_topology
+from .warm_start import warm_positions
 from .utils import is_better
 
 
+ASYNCHRONOUS = 'asynchronous'
+SYNCHRONOUS = 'synchronous'
+STEADY_STATE = 'steady_state'
+UPDATE_MODES = (ASYNCHRONOUS, SYNCHRONOUS, STEADY_STATE)
+
+
+class VelocityRule(object):
+    """Velocity update rule shared by all particles of a swarm. Beside the
+    original rule, it supports inertia weight (constant, linearly decreasing
+    or adaptive), Clerc's constriction factor and velocity clamping:
+
+        v = chi * (w * v + c_1 * r_1 * (p - x) + c_2 * r_2 * (g - x))
+
+    The rule works on whole position and velocity lists at once, so it can be
+    applied to one particle or to every particle of the swarm."""
+
+    def __init__(self, learning_factors, boundaries, **kwargs):
+        """
+
+        :param learning_factors: Local and global learning factors.
+        :type learning_factors: tuple
+        :param boundaries: Boundaries of the optimization, used to calculate
+        the maximum velocity of each dimension.
+        :type boundaries: list[tuple[number]]
+        :param inertia: Inertia weight. A number for a constant weight, a
+        tuple (start, end) for a linearly decreasing weight or 'adaptive' for
+        a weight adapted from the swarm's success rate. Default is 1.0 which
+        is the original PSO rule.
+        :type inertia: float | tuple[float] | str
+        :param inertia_range: Minimum and maximum weight used by the adaptive
+        inertia, default is (0.4, 0.9).
+        :type inertia_range: tuple[float]
+        :param constriction: Apply Clerc's constriction factor, the sum of
+        learning factors must be larger than 4. Default is False.
+        :type constriction: bool
+        :param velocity_clamp: Maximum velocity of each dimension, as a ratio
+        of the dimension's boundary width. Default is None (no clamping).
+        :type velocity_clamp: float
+        """
+
+        self.learning_factors = learning_factors
+        self.inertia = kwargs.get('inertia', 1.0)
+        self.inertia_range = kwargs.get('inertia_range', (0.4, 0.9))
+        if isinstance(self.inertia, str) and self.inertia != 'adaptive':
+            raise ValueError("Unknown inertia '%s'." % self.inertia)
+
+        self.constriction_factor = None
+        if kwargs.get('constriction', False):
+            phi = sum(learning_factors)
+            if phi <= 4.0:
+                raise ValueError(
+                    'Constriction requires c_1 + c_2 > 4, got %s.' % phi
+                )
+            self.constriction_factor = \
+                2.0 / abs(2.0 - phi - math.sqrt(phi ** 2 - 4.0 * phi))
+
+        self.max_velocity = None
+        velocity_clamp = kwargs.get('velocity_clamp', None)
+        if velocity_clamp is not None:
+            self.max_velocity = [
+                velocity_clamp * (boundary[1] - boundary[0])
+                for boundary in boundaries
+            ]
+
+        self.weight = None
+        self.reset()
+
+    def reset(self):
+        """Set the inertia weight back to its starting value."""
+        if self.inertia == 'adaptive':
+            self.weight = self.inertia_range[1]
+        elif isinstance(self.inertia, (tuple, list)):
+            self.weight = self.inertia[0]
+        else:
+            self.weight = self.inertia
+
+    def step(self, progress, success_rate):
+        """
+        Update the inertia weight after an iteration step.
+
+        :param progress: Ratio of finished iteration steps, from 0 to 1.
+        :type progress: float
+        :param success_rate: Ratio of particles which improved their local
+        best in the last iteration step.
+        :type success_rate: float
+        """
+
+        if self.inertia == 'adaptive':
+            self.weight = self.inertia_range[0] + \
+                (self.inertia_range[1] - self.inertia_range[0]) * \
+                success_rate
+        elif isinstance(self.inertia, (tuple, list)):
+            self.weight = self.inertia[0] + \
+                (self.inertia[1] - self.inertia[0]) * min(progress, 1.0)
+
+    def apply(self, velocity, position, local_best, global_best, r_1, r_2):
+        """
+        Calculate the next velocity.
+
+        :param velocity: Current velocity.
+        :type velocity: list[float]
+        :param position: Current position.
+        :type position: list[float]
+        :param local_best: Position of the local best.
+        :type local_best: list[float]
+        :param global_best: Position of the global (or neighborhood) best.
+        :type global_best: list[float]
+        :param r_1: Random factor of the local learning part.
+        :type r_1: float
+        :param r_2: Random factor of the global learning part.
+        :type r_2: float
+        :return: The new velocity.
+        :rtype: list[float]
+        """
+
+        c_1 = self.learning_factors[0] * r_1
+        c_2 = self.learning_factors[1] * r_2
+        weight = self.weight
+        if weight == 1.0:
+            new_velocity = [
+                v + c_1 * (p - x) + c_2 * (g - x)
+                for v, x, p, g in zip(velocity, position,
+                                      local_best, global_best)
+            ]
+        else:
+            new_velocity = [
+                weight * v + c_1 * (p - x) + c_2 * (g - x)
+                for v, x, p, g in zip(velocity, position,
+                                      local_best, global_best)
+            ]
+        if self.constriction_factor is not None:
+            new_velocity = [self.constriction_factor * v
+                            for v in new_velocity]
+        return self.clamp(new_velocity)
+
+    def clamp(self, velocity):
+        """Limit each dimension of the velocity to its maximum velocity."""
+        if self.max_velocity is None:
+            return velocity
+        return [
+            max(-v_max, min(v_max, v))
+            for v, v_max in zip(velocity, self.max_velocity)
+        ]
+
+
 class Particle(OptimizationMixin):
     """Particles of the swarm. Each particle has its own position and velocity.
     Every iteration step, each particle will try to move to different location
     base on local and global best."""
 
-    def __init__(self, optimization_object, learning_factors):
+    def __init__(self, optimization_object, learning_factors,
+                 velocity_rule=None, evaluate=True, position=None):
         """
 
         :param optimization_object: Initialized Optimization object passed
@@ -22,18 +180,46 @@ class Particle(OptimizationMixin):
         :type optimization_object: PyOptCollection.optimization.Optimization
         :param learning_factors: Local and global learning factors.
         :type learning_factors: tuple
+        :param velocity_rule: Velocity update rule shared by the swarm,
+        default is the original PSO rule.
+        :type velocity_rule: VelocityRule
+        :param evaluate: Evaluate the spawned position right away, otherwise
+        the value must be given later through Particle.accept(). Default is
+        True.
+        :type evaluate: bool
+        :param position: Position to spawn at (a warm start), it is clipped
+        into the boundaries and, if it is infeasible, projected onto the
+        linear constraints or replaced by a random one. Default is a random
+        position.
+        :type position: list[number]
         """
         self.optimization_object = optimization_object
         self.learning_factors = learning_factors
+        self.velocity_rule = velocity_rule if velocity_rule is not None \
+            else VelocityRule(learning_factors, self.boundaries)
 
         self.position = [0.0] * self.no_dimensions
         self.velocity = [0.0] * self.no_dimensions
-        self._spawn()
+        if position is None:
+            self._spawn()
+        else:
+            self._spawn(position=False)
+            self._place(position)
+        no_spawns = 1
         while not self._check_constraint():
+            if no_spawns >= MAX_SPAWNS:
+                raise ValueError('No feasible position has been found in %d '
+                                 'spawns, the constraints may be '
+                                 'unsatisfiable.' % MAX_SPAWNS)
             self._spawn()
+            no_spawns += 1
+            if self.profiler is not None:
+                self.profiler.count(SPAWN_REROLLS)
 
-        self.value = self.optimization_object.func(self.position)
-        self.best = (self.value, deepcopy(self.position))
+        self.value = None
+        self.best = (None, deepcopy(self.position))
+        if evaluate:
+            self.accept(self.optimization_object.evaluate(self.position))
 
     def update(self, global_best):
         """
@@ -41,33 +227,117 @@ class Particle(OptimizationMixin):
         with all constraints of the optimization.
 
         :param global_best: Global best from the last iteration step.
+        :return: The particle's local best has been improved or not.
+        :rtype: bool
+        """
+        self.move(global_best)
+        return self.accept(self.optimization_object.evaluate(self.position))
+
+    def move(self, global_best):
+        """
+        Update velocity and position of the particle without evaluating the
+        new position. New position must match with all constraints of the
+        optimization.
+
+        :param global_best: Global (or neighborhood) best to move toward.
         :return: None
         """
+        next_position = self.propose(global_best)
+        if not self._check_constraint(next_position):
+            next_position = self.repair(next_position)
+        self.position = next_position
+
+    def propose(self, global_best):
+        """
+        Update the velocity of the particle and return the position it leads
+        to, which may not match the constraints of the optimization.
+
+        :param global_best: Global (or neighborhood) best to move toward.
+        :return: The proposed position.
+        :rtype: list[number]
+        """
         self._update_velocity(global_best)
+        return self._get_new_position()
 
-        next_position = self._get_new_position()
+    def repair(self, next_position):
+        """Replace an infeasible proposed position by a feasible one. It is
+        first projected onto the polytope of the linear constraints if there
+        are some, otherwise (or if still infeasible) the velocity is halved up
+        to 5 times, then drawn again until the new position is feasible. If
+        none is found in MAX_SPAWNS draws, the particle stays where it is."""
+        linear_constraints = self.optimization_object.linear_constraints
+        if linear_constraints is not None:
+            if self.profiler is not None:
+                self.profiler.count(PROJECTIONS)
+            next_position = self.optimization_object.discretize(
+                linear_constraints.project(next_position, self.boundaries)
+            )
+            if self._check_constraint(next_position):
+                return next_position
 
         loop_count = 0
         while not self._check_constraint(next_position):
             if loop_count < 5:
                 self._resize_velocity(0.5)
                 loop_count += 1
-            else:
+                if self.profiler is not None:
+                    self.profiler.count(REPAIR_RETRIES)
+            elif loop_count < MAX_SPAWNS:
                 self._spawn(position=False)
+                loop_count += 1
+                if self.profiler is not None:
+                    self.profiler.count(SPAWN_REROLLS)
+            else:
+                self.velocity = [0.0] * self.no_dimensions
+                return list(self.position)
             next_position = self._get_new_position()
+        return next_position
 
-        self.position = next_position
-        self.value = self.optimization_object.func(self.position)
+    def accept(self, value):
+        """
+        Set the value of the current position and update the local best.
+
+        :param value: Evaluated value of the current position.
+        :type value: number
+        :return: The particle's local best has been improved or not.
+        :rtype: bool
+        """
+        self.value = value
         if is_better(self.best[0], self.value,
                      self.optimization_object.find_max):
             self.best = (self.value, deepcopy(self.position))
+            return True
+        return False
 
     def _check_constraint(self, position=None):
         if position is None:
             return self.optimization_object.check_constraints(self.position)
         return self.optimization_object.check_constraints(position)
 
+    def _place(self, position):
+        """Move to a given position, clipped into the boundaries, and
+        projected onto the linear constraints if it is infeasible."""
+        self.position = self.optimization_object.discretize([
+            min(max(x, lower), upper)
+            for x, (lower, upper) in zip(position, self.boundaries)
+        ])
+        linear_constraints = self.optimization_object.linear_constraints
+        if linear_constraints is not None and not self._check_constraint():
+            if self.profiler is not None:
+                self.profiler.count(PROJECTIONS)
+            self.position = self.optimization_object.discretize(
+                linear_constraints.project(self.position, self.boundaries)
+            )
+
     def _spawn(self, position=True, velocity=True):
+        linear_constraints = self.optimization_object.linear_constraints
+        if position and linear_constraints is not None:
+            # Spawn inside the polytope of the linear constraints.
+            self.position = self.optimization_object.discretize(
+                linear_constraints.sample(self.random_generator,
+                                          self.boundaries)
+            )
+            position = False
         for dim in range(self.no_dimensions):
             if position:
                 self.position[dim] = \
@@ -79,25 +349,30 @@ class Particle(OptimizationMixin):
                 self.velocity[dim] = \
                     (self.random_generator.random() - 0.5) * \
                     max(self.learning_factors)
+        if position and self.optimization_object.discrete_dims:
+            for dim in self.optimization_object.discrete_dims:
+                # Every allowed value gets the same chance to be spawned.
+                self.position[dim] = self.random_generator.randint(
+                    *self.boundaries[dim]
+                )
+        if velocity:
+            self.velocity = self.velocity_rule.clamp(self.velocity)
 
     def _get_new_position(self):
         new_position = [0.0] * self.no_dimensions
         for dim in range(self.optimization_object.no_dimensions):
             new_position[dim] = self.position[dim] + self.velocity[dim]
 
-        return new_position
+        return self.optimization_object.discretize(new_position)
 
     def _update_velocity(self, global_best):
         r_1 = self.random_generator.random()
         r_2 = self.random_generator.random()
 
-        for dim in range(self.no_dimensions):
-            d_v1 = self.learning_factors[0] * r_1 * \
-                (self.best[1][dim] - self.position[dim])
-            d_v2 = self.learning_factors[1] * r_2 * \
-                (global_best[1][dim] - self.position[dim])
-
-            self.velocity[dim] = self.velocity[dim] + d_v1 + d_v2
+        self.velocity = self.velocity_rule.apply(
+            self.velocity, self.position,
+            self.best[1], global_best[1], r_1, r_2
+        )
 
     def _resize_velocity(self, factor):
         for dim in range(self.no_dimensions):
@@ -105,7 +380,29 @@ class Particle(OptimizationMixin):
 
 
 class PSO(AlgorithmObject):
-    """This class will be the AlgorithmObject for PSO."""
+    # pylint: disable=too-many-instance-attributes
+    """This class will be the AlgorithmObject for PSO.
+
+    The swarm can be updated in two modes:
+
+    - asynchronous (default): particles move and are evaluated one after
+      another, each of them sees the bests found earlier in the same
+      iteration step.
+    - synchronous: every particle moves toward the bests of the last
+      iteration step, then the whole swarm is evaluated as one batch through
+      Optimization.evaluate_batch() and the bests are updated afterward. The
+      batch can be vectorized or spread over a pool.
+
+    Both modes draw their random numbers in the particles' order, so given
+    a seed, they are deterministic.
+
+    For objectives with very different runtimes, the steady_state mode feeds
+    the evaluations to a concurrent.futures executor as a work queue: each
+    particle moves again as soon as its own evaluation returns, toward the
+    bests known at that moment, so no worker waits for the slowest particle
+    of an iteration step. The total number of evaluations is the same as in
+    the other modes. As results arrive in a different order on each run,
+    this mode is not deterministic."""
 
     def __init__(self, optimization_object, **kwargs):
         """
@@ -120,64 +417,741 @@ class PSO(AlgorithmObject):
         :type c_1: float
         :param c_2: Global learning factor, default is 2.0.
         :type c_2: float
+        :param inertia: Inertia weight, see VelocityRule. Default is 1.0.
+        :type inertia: float | tuple[float] | str
+        :param inertia_range: Range of the adaptive inertia weight, default
+        is (0.4, 0.9).
+        :type inertia_range: tuple[float]
+        :param constriction: Use Clerc's constriction factor, default False.
+        :type constriction: bool
+        :param velocity_clamp: Maximum velocity as a ratio of boundaries'
+        width, default is None (no clamping).
+        :type velocity_clamp: float
+        :param topology: Neighborhood topology, its name (global, ring,
+        von_neumann, random, dynamic) or a topology object from
+        py_opt_collection.topologies. Default is global.
+        :type topology: str | py_opt_collection.topologies.GlobalTopology
+        :param update_mode: asynchronous, synchronous or steady_state,
+        default is asynchronous. CPU bound objectives only gain from the
+        steady_state mode with a process pool, see pool.
+        :type update_mode: str
+        :param pool: Object with a map() function (multiprocessing.Pool,
+        ...) used to evaluate the swarm in synchronous mode when the
+        optimization has no batch function. In steady_state mode it must be
+        a concurrent.futures executor. If it is not given, a
+        ProcessPoolExecutor is used when the optimizing function can be
+        pickled, else a ThreadPoolExecutor, whose evaluations only run in
+        parallel when the function releases the GIL (I/O, NumPy, ...).
+        Default is None.
+        :param surrogate: Surrogate model (see py_opt_collection.surrogate)
+        used to screen the particles' moves, only the most promising
+        particles are evaluated with the optimizing function. It is cleared
+        at the start of each solve, so trials do not learn from each other
+        unless it shares the optimization's archive. Default is None.
+        :type surrogate: py_opt_collection.surrogate.KNNSurrogate
+        :param surrogate_ratio: Ratio of particles evaluated in each
+        iteration step when a surrogate is used, default is 0.2.
+        :type surrogate_ratio: float
+        :param surrogate_min_size: Number of evaluated positions the
+        surrogate needs before screening, until then every particle is
+        evaluated. Default is twice the number of particles.
+        :type surrogate_min_size: int
+        :param local_search: Local search (see py_opt_collection.local_search)
+        refining the best position when the swarm stalls, its name
+        (nelder_mead, pattern_search, lbfgsb) or an initialized object.
+        Default is None.
+        :type local_search: str | py_opt_collection.local_search.LocalSearch
+        :param stall_iterations: Number of iteration steps without any
+        improvement of the best after which the local search is run, default
+        is 10.
+        :type stall_iterations: int
+        :param stall_tolerance: Improvements of the best smaller than this
+        do not count when looking for stalls, default is 0.0.
+        :type stall_tolerance: float
+        :param restart_after: Number of iteration steps without any
+        improvement of the best after which the swarm is restarted, default
+        is None (no restart). The best and the optimization's evaluation
+        archive are kept across restarts.
+        :type restart_after: int
+        :param restart_fraction: Ratio of particles, the ones with the worst
+        local bests, which are spawned again at each restart. Default is 1.0
+        (the whole swarm).
+        :type restart_fraction: float
+        :param population_growth: Factor the number of particles is
+        multiplied by at each restart (IPOP-style), default is 1.0. The
+        number of iteration steps stays the total over all restarts.
+        :type population_growth: float
+        :param max_restarts: Maximum number of restarts, default is 9.
+        :type max_restarts: int
+        :param backend: python (default) or numba, which moves and evaluates
+        the swarm with a compiled kernel (see py_opt_collection.jit). If
+        Numba is not installed, can not compile the optimizing function or
+        does not support the configuration, the Python implementation is
+        used silently.
+        :type backend: str
+        :param history_file: Path of a history file (see
+        py_opt_collection.history) which each solve() overwrites with the
+        particles and the best of every iteration step. Unlike historical
+        snapshots, the history is kept on disk. Default is None.
+        :type history_file: str
+        :param warm_start: Positions the swarm is spawned at, the remaining
+        particles are spawned randomly: positions, results, a previous PSO
+        or a MultipleSolving which has been run (see
+        py_opt_collection.warm_start.warm_positions()). Only the first
+        no_particles positions are used. Each one is clipped into the
+        boundaries, and if it is infeasible it is projected onto the linear
+        constraints or replaced by a random position. Default is None.
+        :type warm_start: list[list[number]] | PSO
         :param kwargs:
         """
 
         AlgorithmObject.__init__(self, optimization_object, **kwargs)
-        self.learning_factors = \
+        self.learning_factors = kwargs.get(
+            'learning_factors',
             (kwargs.get('c_1', 2.0), kwargs.get('c_2', 2.0))
+        )
         self.no_particles = kwargs.get('no_particles', 10)
         self.no_iteration_steps = kwargs.get('no_iteration_steps', 50)
 
+        self.inertia = kwargs.get('inertia', 1.0)
+        self.inertia_range = kwargs.get('inertia_range', (0.4, 0.9))
+        self.constriction = kwargs.get('constriction', False)
+        self.velocity_clamp = kwargs.get('velocity_clamp', None)
+        self.velocity_rule = VelocityRule(
+            self.learning_factors, self.boundaries,
+            inertia=self.inertia,
+            inertia_range=self.inertia_range,
+            constriction=self.constriction,
+            velocity_clamp=self.velocity_clamp
+        )
+
+        self.topology = get_topology(kwargs.get('topology', None))
+        self.neighborhoods = None
+
+        self.update_mode = kwargs.get('update_mode', ASYNCHRONOUS)
+        if self.update_mode not in UPDATE_MODES:
+            raise ValueError("Unknown update mode '%s'." % self.update_mode)
+        self.pool = kwargs.get('pool', None)
+
+        self.surrogate = kwargs.get('surrogate', None)
+        self.surrogate_ratio = kwargs.get('surrogate_ratio', 0.2)
+        self.surrogate_min_size = kwargs.get('surrogate_min_size',
+                                             2 * self.no_particles)
+
+        self.local_search = get_local_search(kwargs.get('local_search', None))
+        self.stall_iterations = kwargs.get('stall_iterations', 10)
+        self.stall_tolerance = kwargs.get('stall_tolerance', 0.0)
+
+        self.restart_after = kwargs.get('restart_after', None)
+        self.restart_fraction = kwargs.get('restart_fraction', 1.0)
+        self.population_growth = kwargs.get('population_growth', 1.0)
+        self.max_restarts = kwargs.get('max_restarts', 9)
+        if self.update_mode == STEADY_STATE:
+            for name, feature in (('Surrogate', self.surrogate),
+                                  ('Local search', self.local_search),
+                                  ('Restarts', self.restart_after)):
+                if feature is not None:
+                    raise ValueError('%s not supported in steady_state '
+                                     'update mode.' % name)
+
+        self.backend = kwargs.get('backend', PYTHON)
+        if self.backend not in BACKENDS:
+            raise ValueError("Unknown backend '%s'." % self.backend)
+        self.kernel = None
+
+        self.history_file = kwargs.get('history_file', None)
+        self.history = None
+        if self.history_file is not None and self.population_growth != 1.0:
+            raise ValueError('The history file needs a constant number of '
+                             'particles.')
+
+        self.warm_start = kwargs.get('warm_start', None)
+        if self.warm_start is not None:
+            self.warm_start = warm_positions(self.warm_start)
+            for position in self.warm_start:
+                if len(position) != self.no_dimensions:
+                    raise ValueError('Warm start positions must have %d '
+                                     'dimensions.' % self.no_dimensions)
+
+        self.no_stalled_steps = 0
+        self.stall_reference = None
+        self.no_refinements = 0
+        self.refined_value = None
+        self.no_restarts = 0
+
         self.particles = list()
+        self._steady_state = None
+
+    def _start_solving(self):
+        self.current_iteration_step = 0
+        self.no_stalled_steps = 0
+        self.stall_reference = None
+        self.no_refinements = 0
+        self.refined_value = None
+        self.no_restarts = 0
+        self.velocity_rule.reset()
+        self._open_history()
+        if self.update_mode == STEADY_STATE:
+            self._steady_state = self._steady_state_steps()
+            next(self._steady_state)
+            return
 
-    def solve(self):
-        current_iter_steps = 0
         self._spawn_particles()
+        if self.surrogate is not None:
+            self.surrogate.clear()
+            for particle in self.particles:
+                self.surrogate.add(particle.position, particle.value)
+        self.kernel = create_kernel(self)
         if self.verbose:
             print("Iteration step #%d, best value: %s" % (
-                current_iter_steps, self.best
+                self.current_iteration_step, self.best
             ))
+        self.current_iteration_step += 1
 
-        current_iter_steps += 1
-        while current_iter_steps < self.no_iteration_steps:
-            self._pso_do_iter()
-            if self.verbose:
-                print("Iteration step #%d, best value: %s" % (
-                    current_iter_steps, self.best
-                ))
-            current_iter_steps += 1
-        return self.best
+    def _iterate(self):
+        if self._steady_state is not None:
+            next(self._steady_state)
+            return
+
+        self._pso_do_iter()
+        if self.verbose:
+            print("Iteration step #%d, best value: %s" % (
+                self.current_iteration_step, self.best
+            ))
+        self.current_iteration_step += 1
+
+    def _end_solving(self):
+        if self._steady_state is not None:
+            self._steady_state.close()
+            self._steady_state = None
+        if self.kernel is not None:
+            self.kernel.sync(self)
+            self.kernel = None
+        self._close_history()
 
     def _spawn_particles(self):
-        for _i in range(self.no_particles):
-            particle = Particle(
-                self.optimization_object, self.learning_factors
-            )
-            self.particles.append(particle)
-            if is_better(self.best[0], particle.value,
-                         self.find_max):
-                self.best = (particle.value, deepcopy(particle.position))
+        self.neighborhoods = self.topology.connect(
+            self.no_particles, self.random_generator
+        )
+        self.particles = self._new_particles(self.no_particles,
+                                             self.warm_start or ())
+        if self.update_mode != STEADY_STATE:
+            self._record()
 
-        try:
-            self.snapshots.append(
-                tuple([deepcopy(self.particles), deepcopy(self.best)])
+    def _new_particles(self, no_particles, positions=()):
+        """Spawn particles, evaluated (except in steady_state mode, where
+        the evaluations are submitted by the caller) and taken into account
+        by the best. The first ones are spawned at the given positions."""
+        particles = [
+            Particle(self.optimization_object, self.learning_factors,
+                     self.velocity_rule,
+                     evaluate=self.update_mode == ASYNCHRONOUS,
+                     position=position)
+            for position in _spawn_positions(no_particles, positions)
+        ]
+        if self.update_mode == SYNCHRONOUS:
+            values = self.optimization_object.evaluate_batch(
+                [particle.position for particle in particles], self.pool
             )
-        except AttributeError:
-            pass
+            for particle, value in zip(particles, values):
+                particle.accept(value)
+        if self.update_mode != STEADY_STATE:
+            for particle in particles:
+                self._update_best(particle)
+        return particles
 
     def _pso_do_iter(self):
         """For each iteration step, solve() function will make a call to this
         function."""
+        last_best_value = self.best[0]
+        if self.kernel is not None:
+            no_improved = self.kernel.step(self)
+        elif self.surrogate is not None:
+            no_improved = self._surrogate_update()
+        elif self.update_mode == SYNCHRONOUS:
+            no_improved = self._synchronous_update()
+        else:
+            no_improved = self._asynchronous_update()
+        self._end_iteration_step(last_best_value, no_improved)
+
+    def _end_iteration_step(self, last_best_value, no_improved):
+        """Update the neighborhoods, the velocity rule and the stall counter
+        after the swarm has been updated, then run the local search and the
+        restart if they are due."""
+        improved = self.best[0] != last_best_value
+        if self.topology.rewire(improved):
+            self.neighborhoods = self.topology.connect(
+                len(self.particles), self.random_generator
+            )
+        self.velocity_rule.step(
+            self.current_iteration_step / float(self.no_iteration_steps - 1),
+            no_improved / float(len(self.particles))
+        )
+        if self.stall_reference is None or abs(
+                self.best[0] - self.stall_reference) > self.stall_tolerance:
+            self.stall_reference = self.best[0]
+            self.no_stalled_steps = 0
+        else:
+            self.no_stalled_steps += 1
+        if self.local_search is not None:
+            self._refine_on_stall()
+        if self.restart_after is not None:
+            self._restart_on_stall()
+        self._record()
+
+    def _record(self):
+        """Take the snapshot of the iteration step, and write it into the
+        history file if there is one."""
+        self._take_snapshot(self.particles, self.best)
+        if self.history is None:
+            return
+        if self.kernel is not None:
+            self.kernel.record(self.history)
+        else:
+            self.history.append_swarm(self.particles, self.best)
+
+    def _open_history(self):
+        if self.history_file is not None:
+            self.history = HistoryWriter(
+                self.history_file, self.no_iteration_steps,
+                self.no_particles, self.no_dimensions
+            )
+
+    def _close_history(self):
+        if self.history is not None:
+            self.history.close()
+            self.history = None
+
+    def _refine_on_stall(self):
+        """Once the best has not been improved for stall_iterations steps,
+        the local search is run from the best position. An improvement is
+        handed back to the swarm as the local best of the particle which
+        owned the previous best. A best which has already been refined is
+        not refined again."""
+        if self.no_stalled_steps < self.stall_iterations or \
+                self.best[0] == self.refined_value:
+            return
+        self.no_refinements += 1
+        value, position = self.local_search.refine(self.optimization_object,
+                                                   self.best[1])
+        self.refined_value = value
+        if not is_better(self.best[0], value, self.find_max):
+            return
         for particle in self.particles:
-            particle.update(self.best)
-            if is_better(self.best[0], particle.value,
-                         self.find_max):
-                self.best = (particle.value, deepcopy(particle.position))
+            if particle.best[0] == self.best[0]:
+                particle.best = (value, deepcopy(position))
+                break
+        self.best = (value, deepcopy(position))
+        self.no_stalled_steps = 0
+        if self.profiler is not None:
+            self.profiler.count(BEST_UPDATES)
+
+    def _restart_on_stall(self):
+        """Once the best has not been improved for restart_after steps, the
+        particles with the worst local bests are replaced by new ones, and
+        the swarm grows by population_growth. The best is kept."""
+        if self.no_stalled_steps < self.restart_after or \
+                self.no_restarts >= self.max_restarts:
+            return
+        self.no_stalled_steps = 0
+        self.no_restarts += 1
+
+        size = len(self.particles)
+        order = sorted(range(size),
+                       key=lambda i: self.particles[i].best[0],
+                       reverse=self.find_max)
+        no_kept = size - int(math.ceil(self.restart_fraction * size))
+        new_size = max(int(round(size * self.population_growth)), 1)
+        particles = self._new_particles(max(new_size - no_kept, 0))
+        if self.surrogate is not None:
+            for particle in particles:
+                self.surrogate.add(particle.position, particle.value)
+        self.particles = [self.particles[i]
+                          for i in sorted(order[:no_kept])] + particles
+        self.neighborhoods = self.topology.connect(
+            len(self.particles), self.random_generator
+        )
+        self.velocity_rule.reset()
+
+    def solve_batch(self, no_tries, pool=None, seeds=None):
+        """
+        Run independent trials of the optimization in lockstep, as used by
+        MultipleSolving.run(batched=True). Each trial is a copy of this
+        object with its own random generator (see copy_trial()), updated
+        synchronously. Every iteration step, the positions of all trials are
+        evaluated as one batch through Optimization.evaluate_batch(). With
+        NumPy, the swarms of all the trials are moved together as
+        (tries, particles, dimensions) arrays (see py_opt_collection.batch),
+        unless the configuration needs the Python implementation
+        (constraints, discrete variables, neighborhoods, ...).
+
+        :param no_tries: Number of trials.
+        :type no_tries: int
+        :param pool: Object with a map() function used to evaluate the
+        batches when the optimization has no batch function, default is the
+        pool of this object.
+        :param seeds: Seed of each trial, default is new seeds drawn from the
+        operating system.
+        :type seeds: list[int]
+        :return: Best value and position of each trial.
+        :rtype: list[tuple]
+        """
+
+        pool = self.pool if pool is None else pool
+        if seeds is None:
+            seeds = [None] * no_tries
+        elif len(seeds) != no_tries:
+            raise ValueError('Expecting one seed per trial.')
+        trials = [self.copy_trial(update_mode=SYNCHRONOUS, seed=seed)
+                  for seed in seeds]
+
+        def evaluate(positions):
+            """Values of the particles' positions of every trial."""
+            return self.optimization_object.evaluate_batch(positions, pool)
+
+        return self._solve_lockstep(trials, evaluate)
+
+    def solve_instances(self, parameters, pool=None):
+        """
+        Optimize many instances of a parameterized optimization together.
+        The optimization's functions (optimizing, batch and constraints)
+        receive the instance's parameters as their second argument, see
+        Optimization.bind(). One swarm per instance runs in lockstep, like
+        the trials of solve_batch(). If the optimization has a batch
+        function, every iteration step of all the instances is evaluated by
+        one call of it, with the list of positions and the list of their
+        instances' parameters.
+
+        :param parameters: Parameters of each instance.
+        :type parameters: list
+        :param pool: Object with a map() function used to evaluate the
+        positions when the optimization has no batch function, default is
+        the pool of this object.
+        :return: Best value and position of each instance.
+        :rtype: list[tuple]
+        """
+
+        pool = self.pool if pool is None else pool
+        template = self.optimization_object
+        trials = [
+            self.copy_trial(update_mode=SYNCHRONOUS,
+                            optimization_object=template.bind(instance))
+            for instance in parameters
+        ]
+
+        def evaluate(positions):
+            """Values of the particles' positions of every instance."""
+            if template.batch_func is not None:
+                return list(template.batch_func(
+                    [template.decode(position) for position in positions],
+                    [trial.optimization_object.parameters
+                     for trial in trials for _particle in trial.particles]
+                ))
+            values = list()
+            positions = iter(positions)
+            for trial in trials:
+                values.extend(trial.optimization_object.evaluate_batch(
+                    [next(positions) for _particle in trial.particles], pool
+                ))
+            return values
+
+        return self._solve_lockstep(trials, evaluate)
+
+    def _solve_lockstep(self, trials, evaluate):
+        """Run the trials' swarms in lockstep, evaluate() returns the values
+        of the given positions of all the trials' particles, in order."""
+        # pylint: disable=protected-access
+        if self.update_mode == STEADY_STATE or self.surrogate is not None:
+            raise ValueError('Batched trials do not support steady_state '
+                             'update mode nor surrogate.')
+        for trial in trials:
+            trial.velocity_rule.reset()
+            trial.neighborhoods = trial.topology.connect(
+                trial.no_particles, trial.random_generator
+            )
+            trial.particles = [
+                Particle(trial.optimization_object, trial.learning_factors,
+                         trial.velocity_rule, evaluate=False,
+                         position=position)
+                for position in _spawn_positions(trial.no_particles,
+                                                 trial.warm_start or ())
+            ]
+        self._accept_trials(trials,
+                            evaluate(self._trials_positions(trials)))
+        batch = create_batch(self, trials)
+
+        for step in range(1, self.no_iteration_steps):
+            last_best_values = list()
+            for trial in trials:
+                trial.current_iteration_step = step
+                last_best_values.append(trial.best[0])
+            if batch is not None:
+                no_improved_list = batch.step(trials, evaluate)
+            else:
+                for trial in trials:
+                    trial._move_swarm()
+                no_improved_list = self._accept_trials(
+                    trials, evaluate(self._trials_positions(trials))
+                )
+            for trial, last_best_value, no_improved in zip(
+                    trials, last_best_values, no_improved_list):
+                trial._end_iteration_step(last_best_value, no_improved)
+            if self.verbose:
+                print("Iteration step #%d, best values: %s" % (
+                    step, [trial.best[0] for trial in trials]
+                ))
+        if batch is not None:
+            batch.sync(trials)
+        for trial in trials:
+            trial.stop_reason = MAX_ITERATIONS
+        return [trial.best for trial in trials]
 
+    @staticmethod
+    def _trials_positions(trials):
+        return [particle.position
+                for trial in trials for particle in trial.particles]
+
+    @staticmethod
+    def _accept_trials(trials, values):
+        """Give the values to the trials' particles, in order, then update
+        the trials' bests."""
+        # pylint: disable=protected-access
+        values = iter(values)
+        ret = list()
+        for trial in trials:
+            no_improved = 0
+            for particle in trial.particles:
+                no_improved += particle.accept(next(values))
+                trial._update_best(particle)
+            ret.append(no_improved)
+        return ret
+
+    def _steady_state_steps(self):
+        """Generator running the whole optimization with the evaluations fed
+        to a pool as a work queue, each particle moves again as soon as its
+        own evaluation returns. It yields every time the swarm has done as
+        many evaluations as its size, which counts as one iteration step."""
+        from concurrent.futures import wait, FIRST_COMPLETED
+        self._spawn_particles()
+
+        executor = self.pool if self.pool is not None \
+            else _default_executor(self.optimization_object.func)
+        archive = self.optimization_object.archive
+        budget = self.no_particles * self.no_iteration_steps
+        no_evaluated = no_improved = 0
+        step_best_value = None
+        values = [None] * len(self.particles)
+        pending = dict()
         try:
-            self.snapshots.append(
-                tuple([deepcopy(self.particles), deepcopy(self.best)])
+            for index, particle in enumerate(self.particles):
+                pending[self._submit(executor, particle.position)] = index
+            while pending:
+                done, _not_done = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    particle = self.particles[index]
+                    if archive is not None and not future.archived:
+                        archive.add(particle.position, future.result())
+                    no_improved += particle.accept(future.result())
+                    values[index] = particle.best[0]
+                    self._update_best(particle)
+                    no_evaluated += 1
+
+                    step_ended = no_evaluated % self.no_particles == 0
+                    if step_ended:
+                        self._end_steady_state_step(
+                            no_improved, self.best[0] != step_best_value
+                        )
+                        no_improved = 0
+                        step_best_value = self.best[0]
+                    if no_evaluated + len(pending) < budget:
+                        if self.neighborhoods is None:
+                            particle.move(self.best)
+                        else:
+                            particle.move(self.particles[
+                                self.topology.best_index(
+                                    index, values,
+                                    self.neighborhoods, self.find_max
+                                )
+                            ].best)
+                        pending[self._submit(
+                            executor, particle.position
+                        )] = index
+                    if step_ended:
+                        yield
+        finally:
+            if self.pool is None:
+                executor.shutdown()
+
+    def _submit(self, executor, position):
+        """Submit one evaluation to the executor, archived positions get an
+        already finished future."""
+        archive = self.optimization_object.archive
+        index = None if archive is None else archive.lookup(position)
+        if index is None:
+            future = executor.submit(self.optimization_object.func,
+                                     self.optimization_object.decode(position))
+            future.archived = False
+        else:
+            from concurrent.futures import Future
+            future = Future()
+            future.set_result(archive.values[index])
+            future.archived = True
+        return future
+
+    def _end_steady_state_step(self, no_improved, improved):
+        """Every time the swarm has done as many evaluations as its size, it
+        is counted as one iteration step."""
+        if self.verbose:
+            print("Iteration step #%d, best value: %s" % (
+                self.current_iteration_step, self.best
+            ))
+        if self.current_iteration_step:
+            if self.topology.rewire(improved):
+                self.neighborhoods = self.topology.connect(
+                    self.no_particles, self.random_generator
+                )
+            self.velocity_rule.step(
+                self.current_iteration_step /
+                float(self.no_iteration_steps - 1),
+                no_improved / float(len(self.particles))
+            )
+        self._record()
+        self.current_iteration_step += 1
+
+    def _asynchronous_update(self):
+        """Move and evaluate the particles one by one, the bests are updated
+        as soon as each value arrives."""
+        no_improved = 0
+        # With discrete variables, particles often land on the same
+        # configuration, each of them is evaluated once per iteration step.
+        values_cache = dict() if self.optimization_object.discrete_dims \
+            else None
+        if self.neighborhoods is None:
+            for particle in self.particles:
+                no_improved += self._update_particle(particle, self.best,
+                                                     values_cache)
+                self._update_best(particle)
+            return no_improved
+
+        values = [particle.best[0] for particle in self.particles]
+        for index, particle in enumerate(self.particles):
+            no_improved += self._update_particle(particle, self.particles[
+                self.topology.best_index(
+                    index, values, self.neighborhoods, self.find_max
+                )
+            ].best, values_cache)
+            values[index] = particle.best[0]
+            self._update_best(particle)
+        return no_improved
+
+    def _update_particle(self, particle, social_best, values_cache):
+        """Particle.update(), through the iteration step's cache of values if
+        there is one."""
+        if values_cache is None:
+            return particle.update(social_best)
+        particle.move(social_best)
+        key = tuple(particle.position)
+        if key not in values_cache:
+            values_cache[key] = \
+                self.optimization_object.evaluate(particle.position)
+        return particle.accept(values_cache[key])
+
+    def _synchronous_update(self):
+        """Move the whole swarm toward the last iteration step's bests, then
+        evaluate it as one batch."""
+        self._move_swarm()
+        return self._accept_batch()
+
+    def _surrogate_update(self):
+        """Move the whole swarm, predict the new positions' values with the
+        surrogate and only evaluate the most promising particles. The others
+        keep their moves but, not being evaluated, neither their value nor
+        the bests are updated."""
+        self._move_swarm()
+        if len(self.surrogate) < self.surrogate_min_size:
+            selected = self.particles
+        else:
+            predictions = self.surrogate.predict_batch(
+                [particle.position for particle in self.particles]
             )
-        except AttributeError:
-            pass
+            order = sorted(range(len(self.particles)),
+                           key=lambda i: predictions[i],
+                           reverse=self.find_max)
+            no_selected = max(1, int(math.ceil(
+                self.surrogate_ratio * len(self.particles)
+            )))
+            selected = [self.particles[i] for i in sorted(
+                order[:no_selected]
+            )]
+            for i in order[no_selected:]:
+                self.particles[i].value = None
+
+        values = self.optimization_object.evaluate_batch(
+            [particle.position for particle in selected], self.pool
+        )
+        no_improved = 0
+        for particle, value in zip(selected, values):
+            self.surrogate.add(particle.position, value)
+            no_improved += particle.accept(value)
+            self._update_best(particle)
+        return no_improved
+
+    def _move_swarm(self):
+        """Move every particle toward the last iteration step's bests."""
+        if self.neighborhoods is None:
+            social_bests = [self.best] * len(self.particles)
+        else:
+            social_bests = [
+                self.particles[best_index].best
+                for best_index in self.topology.best_indexes(
+                    [particle.best[0] for particle in self.particles],
+                    self.neighborhoods, self.find_max
+                )
+            ]
+        next_positions = [
+            particle.propose(social_best)
+            for particle, social_best in zip(self.particles, social_bests)
+        ]
+        for particle, next_position, feasible in zip(
+                self.particles, next_positions,
+                self.optimization_object.check_constraints_batch(
+                    next_positions)):
+            particle.position = next_position if feasible \
+                else particle.repair(next_position)
+
+    def _accept_batch(self):
+        """Evaluate the particles' current positions as one batch and update
+        the bests."""
+        values = self.optimization_object.evaluate_batch(
+            [particle.position for particle in self.particles], self.pool
+        )
+        no_improved = 0
+        for particle, value in zip(self.particles, values):
+            no_improved += particle.accept(value)
+            self._update_best(particle)
+        return no_improved
+
+    def _update_best(self, particle):
+        """Replace the global best by the particle's current position if it
+        is better."""
+        self._improve_best(particle.value, particle.position)
+
+
+def _default_executor(func):
+    """Executor of the steady_state mode when no pool is given: a process
+    pool, which runs the evaluations in parallel despite the GIL, if the
+    optimizing function can be pickled, else a thread pool."""
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    try:
+        pickle.dumps(func)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return ThreadPoolExecutor()
+    return ProcessPoolExecutor()
+
+
+def _spawn_positions(no_particles, positions):
+    """Positions of new particles: the given ones first, then None for the
+    randomly spawned ones."""
+    positions = list(positions)[:no_particles]
+    return positions + [None] * (no_particles - len(positions))
@@ -0,0 +1,275 @@
+"""
+This module contains the results store, an SQLite database keeping the
+trials of MultipleSolving runs: the problem, the algorithm and its settings
+(the configuration), the seed, the best value and position, the process
+time and the stop reason of every trial. Large parameter sweeps can then be
+analyzed, or resumed, without running them again.
+
+The configurations are kept once, in their own table, and the trials refer
+to them. The trials are indexed by problem and configuration, the
+aggregates are computed by SQLite.
+"""
+
+import json
+import sqlite3
+from .optimization import _describe
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS configurations (
+    id INTEGER PRIMARY KEY,
+    algorithm TEXT NOT NULL,
+    settings TEXT NOT NULL,
+    UNIQUE (algorithm, settings)
+);
+CREATE TABLE IF NOT EXISTS trials (
+    id INTEGER PRIMARY KEY,
+    problem TEXT NOT NULL,
+    configuration_id INTEGER NOT NULL REFERENCES configurations (id),
+    seed TEXT,
+    value REAL,
+    position TEXT,
+    time REAL,
+    stop_reason TEXT
+);
+CREATE INDEX IF NOT EXISTS trials_problem_configuration
+    ON trials (problem, configuration_id);
+CREATE INDEX IF NOT EXISTS trials_configuration
+    ON trials (configuration_id);
+"""
+
+
+class ResultsStore(object):
+    """SQLite store of the trials of MultipleSolving runs."""
+
+    def __init__(self, path=':memory:'):
+        """
+        :param path: Path of the database file, it is created if it does not
+        exist. Default is an in-memory database.
+        :type path: str
+        """
+
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    def add(self, multiple_solving, problem=None, configuration=None):
+        """
+        Insert the trials of a MultipleSolving object which has been run.
+
+        :param multiple_solving: The MultipleSolving object.
+        :type multiple_solving:
+        py_opt_collection.optimization.MultipleSolving
+        :param problem: Name of the problem, default is the name of the
+        optimizing function.
+        :type problem: str
+        :param configuration: Settings of the algorithm, default is
+        settings(), from the algorithm object.
+        :type configuration: dict
+        :return: Id of the configuration.
+        :rtype: int
+        """
+
+        algorithm_obj = multiple_solving.ori_algorithm_obj
+        if problem is None:
+            problem = _describe(algorithm_obj.optimization_object.func)
+        if configuration is None:
+            configuration = settings(algorithm_obj)
+        return self.add_trials(multiple_solving.trials, problem,
+                               type(algorithm_obj).__name__, configuration)
+
+    def add_trials(self, trials, problem, algorithm, configuration):
+        """
+        Insert trials, in one transaction.
+
+        :param trials: Trials, see MultipleSolving.trials.
+        :type trials: list[dict]
+        :param problem: Name of the problem.
+        :type problem: str
+        :param algorithm: Name of the algorithm.
+        :type algorithm: str
+        :param configuration: Settings of the algorithm, they must be JSON
+        serializable.
+        :type configuration: dict
+        :return: Id of the configuration.
+        :rtype: int
+        """
+
+        with self.connection:
+            configuration_id = self._configuration_id(algorithm,
+                                                      configuration)
+            self.connection.executemany(
+                'INSERT INTO trials (problem, configuration_id, seed, value, '
+                'position, time, stop_reason) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                ((problem, configuration_id,
+                  None if trial['seed'] is None else str(trial['seed']),
+                  trial['value'], json.dumps(trial['position']),
+                  trial['time'], trial['stop_reason']) for trial in trials)
+            )
+        return configuration_id
+
+    def configurations(self, algorithm=None, **settings_filter):
+        """
+        Stored configurations.
+
+        :param algorithm: Only the configurations of this algorithm.
+        :type algorithm: str
+        :param settings_filter: Only the configurations with these settings,
+        no_particles=20 for example.
+        :return: Id, algorithm and settings of each configuration.
+        :rtype: list[tuple]
+        """
+
+        ret = list()
+        for configuration_id, name, text in self.connection.execute(
+                'SELECT id, algorithm, settings FROM configurations '
+                'ORDER BY id'):
+            configuration = json.loads(text)
+            if (algorithm is None or name == algorithm) and all(
+                    key in configuration and configuration[key] == value
+                    for key, value in settings_filter.items()):
+                ret.append((configuration_id, name, configuration))
+        return ret
+
+    def trials(self, problem=None, configuration_id=None, stop_reason=None):
+        """
+        Stored trials.
+
+        :param problem: Only the trials of this problem.
+        :type problem: str
+        :param configuration_id: Only the trials of this configuration, or of
+        these configurations.
+        :type configuration_id: int | list[int]
+        :param stop_reason: Only the trials which stopped for this reason.
+        :type stop_reason: str
+        :return: Generator of the trials, as MultipleSolving.trials' ones
+        with their problem and configuration_id.
+        :rtype: collections.Iterable[dict]
+        """
+
+        where, parameters = _where(problem, configuration_id, stop_reason)
+        for row in self.connection.execute(
+                'SELECT problem, configuration_id, seed, value, position, '
+                'time, stop_reason FROM trials' + where + ' ORDER BY id',
+                parameters):
+            yield {
+                'problem': row[0], 'configuration_id': row[1],
+                'seed': None if row[2] is None else int(row[2]),
+                'value': row[3], 'position': json.loads(row[4]),
+                'time': row[5], 'stop_reason': row[6]
+            }
+
+    def aggregate(self, problem=None, configuration_id=None, target=None,
+                  max_error=0.001):
+        """
+        Statistics of the trials' best values, per problem and
+        configuration.
+
+        :param problem: Only the trials of this problem.
+        :type problem: str
+        :param configuration_id: Only the trials of this configuration, or of
+        these configurations.
+        :type configuration_id: int | list[int]
+        :param target: Known optimum, if given the success rate is the
+        fraction of the trials within max_error of it.
+        :type target: float
+        :param max_error: Tolerance of the success rate.
+        :type max_error: float
+        :return: For each problem and configuration: problem,
+        configuration_id, algorithm, settings, count, mean, variance
+        (sample variance, None for less than 2 trials), minimum, maximum,
+        mean_time and success_rate (None without target).
+        :rtype: list[dict]
+        """
+
+        where, parameters = _where(problem, configuration_id, None)
+        # The variance is computed around the mean of the first pass, as
+        # the mean of the squares loses the precision of large values.
+        rows = self.connection.execute(
+            'WITH means AS (SELECT problem, configuration_id, '
+            'AVG(value) AS mean FROM trials' + where +
+            ' GROUP BY problem, configuration_id) '
+            'SELECT trials.problem, trials.configuration_id, algorithm, '
+            'settings, COUNT(value), mean, '
+            'SUM((value - mean) * (value - mean)), MIN(value), MAX(value), '
+            'AVG(time), AVG(ABS(value - ?) <= ?) '
+            'FROM trials JOIN means '
+            'ON means.problem = trials.problem '
+            'AND means.configuration_id = trials.configuration_id '
+            'JOIN configurations ON configurations.id = '
+            'trials.configuration_id '
+            'GROUP BY trials.problem, trials.configuration_id '
+            'ORDER BY trials.problem, trials.configuration_id',
+            parameters + [target, max_error]
+        )
+        ret = list()
+        for row in rows:
+            count = row[4]
+            ret.append({
+                'problem': row[0], 'configuration_id': row[1],
+                'algorithm': row[2], 'settings': json.loads(row[3]),
+                'count': count, 'mean': row[5],
+                'variance': row[6] / (count - 1) if count > 1 else None,
+                'minimum': row[7], 'maximum': row[8], 'mean_time': row[9],
+                'success_rate': row[10] if target is not None else None
+            })
+        return ret
+
+    def close(self):
+        """Close the database."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _configuration_id(self, algorithm, configuration):
+        text = json.dumps(configuration, sort_keys=True)
+        self.connection.execute(
+            'INSERT OR IGNORE INTO configurations (algorithm, settings) '
+            'VALUES (?, ?)', (algorithm, text)
+        )
+        return self.connection.execute(
+            'SELECT id FROM configurations WHERE algorithm = ? AND '
+            'settings = ?', (algorithm, text)
+        ).fetchone()[0]
+
+
+def settings(algorithm_obj):
+    """
+    Settings of an algorithm object: its public attributes which are numbers,
+    strings, booleans or None.
+
+    :param algorithm_obj: The algorithm object.
+    :type algorithm_obj: py_opt_collection.optimization.AlgorithmObject
+    :rtype: dict
+    """
+
+    return {
+        key: value for key, value in vars(algorithm_obj).items()
+        if not key.startswith('_') and key != 'stop_reason' and
+        (value is None or isinstance(value, (bool, int, float, str)))
+    }
+
+
+def _where(problem, configuration_id, stop_reason):
+    """WHERE clause of the trials' filters, and its parameters."""
+    conditions = list()
+    parameters = list()
+    if problem is not None:
+        conditions.append('problem = ?')
+        parameters.append(problem)
+    if configuration_id is not None:
+        if isinstance(configuration_id, int):
+            configuration_id = [configuration_id]
+        conditions.append('configuration_id IN (%s)' %
+                          ', '.join('?' * len(configuration_id)))
+        parameters.extend(configuration_id)
+    if stop_reason is not None:
+        conditions.append('stop_reason = ?')
+        parameters.append(stop_reason)
+    if not conditions:
+        return '', parameters
+    return ' WHERE ' + ' AND '.join(conditions), parameters
@@ -0,0 +1,209 @@
+"""
+SA stand for Simulated Annealing. This module implements its parallel
+tempering (replica exchange) variant: many Markov chains, the replicas, run
+at different temperatures of a geometric ladder, and replicas at adjacent
+temperatures periodically exchange their states, so good states found by hot
+replicas can sink into cold ones. For more please read
+https://en.wikipedia.org/wiki/Parallel_tempering
+"""
+
+import math
+from .optimization import AlgorithmObject
+from .profiling import INFEASIBLE_REJECTIONS
+from .utils import is_better, numpy_random_state
+
+
+class SimulatedAnnealing(AlgorithmObject):
+    """This class will be the AlgorithmObject for parallel tempering
+    Simulated Annealing. All the replicas move in lockstep: every iteration
+    step, one proposal per replica is built, then they are evaluated as one
+    batch through Optimization.evaluate_batch(). If NumPy is installed, the
+    proposals of all the replicas are drawn and reflected as one array."""
+
+    def __init__(self, optimization_object, **kwargs):
+        """
+
+        :param optimization_object: Initialized Optimization object.
+        :type optimization_object: PyOptCollection.optimization.Optimization
+        :param no_replicas: Number of replicas, default is 8.
+        :type no_replicas: int
+        :param no_iteration_steps: Total number of iteration steps, default
+        is 100.
+        :type no_iteration_steps: int
+        :param temperature_range: Lowest and highest temperatures of the
+        ladder, default is (0.01, 10.0).
+        :type temperature_range: tuple[float]
+        :param cooling: Factor the whole ladder is multiplied by after each
+        iteration step, default is 1.0 (no cooling).
+        :type cooling: float
+        :param step_size: Standard deviation of the moves of the hottest
+        replica, relative to the width of the boundaries. Colder replicas
+        make smaller moves (by the square root of their temperature ratio).
+        Default is 0.1.
+        :type step_size: float
+        :param swap_interval: Number of iteration steps between two rounds of
+        replica exchanges, default is 1.
+        :type swap_interval: int
+        :param pool: Object with a map() function used to evaluate the
+        proposals when the optimization has no batch function.
+        :param kwargs:
+        """
+
+        AlgorithmObject.__init__(self, optimization_object, **kwargs)
+        self.no_replicas = kwargs.get('no_replicas', 8)
+        self.no_iteration_steps = kwargs.get('no_iteration_steps', 100)
+        self.temperature_range = kwargs.get('temperature_range', (0.01, 10.0))
+        self.cooling = kwargs.get('cooling', 1.0)
+        self.step_size = kwargs.get('step_size', 0.1)
+        self.swap_interval = kwargs.get('swap_interval', 1)
+        self.pool = kwargs.get('pool', None)
+        if self.no_replicas < 1:
+            raise ValueError('SimulatedAnnealing needs at least 1 replica.')
+        if not 0 < self.temperature_range[0] <= self.temperature_range[1]:
+            raise ValueError('Invalid temperature range %s.' % (
+                self.temperature_range,
+            ))
+
+        self.temperatures = list()
+        self.positions = list()
+        self.values = list()
+        self.no_accepted = 0
+        self.no_swaps = 0
+        self.random_state = None
+
+    def _start_solving(self):
+        self.current_iteration_step = 0
+        self._spawn_replicas()
+        if self.verbose:
+            print("Iteration step #%d, best value: %s" % (
+                self.current_iteration_step, self.best
+            ))
+        self.current_iteration_step += 1
+
+    def _iterate(self):
+        self._sa_do_iter()
+        if self.current_iteration_step % self.swap_interval == 0:
+            self._exchange_replicas(self.current_iteration_step)
+        self.temperatures = [t * self.cooling for t in self.temperatures]
+        if self.verbose:
+            print("Iteration step #%d, best value: %s" % (
+                self.current_iteration_step, self.best
+            ))
+        self.current_iteration_step += 1
+
+    def _spawn_replicas(self):
+        low, high = self.temperature_range
+        ratio = (high / low) ** (1.0 / max(self.no_replicas - 1, 1))
+        # From the coldest replica to the hottest one.
+        self.temperatures = [low * ratio ** i
+                             for i in range(self.no_replicas)]
+        self.no_accepted = 0
+        self.no_swaps = 0
+
+        self.positions = [self._feasible_random_position()
+                          for _i in range(self.no_replicas)]
+        self.random_state = numpy_random_state(self.random_generator)
+        self.values = self.optimization_object.evaluate_batch(
+            self.positions, self.pool
+        )
+        for value, position in zip(self.values, self.positions):
+            self._improve_best(value, position)
+
+        self._take_snapshot(self.positions, self.values, self.best)
+
+    def _sa_do_iter(self):
+        """For each iteration step, solve() function will make a call to this
+        function."""
+        hottest = self.temperatures[-1]
+        proposals = self._propose_all([
+            self.step_size * math.sqrt(temperature / hottest)
+            for temperature in self.temperatures
+        ])
+        feasible = self.optimization_object.check_constraints_batch(
+            proposals
+        )
+        if self.profiler is not None and not all(feasible):
+            self.profiler.count(INFEASIBLE_REJECTIONS,
+                                feasible.count(False))
+        proposals = [(index, proposal) for index, (proposal, is_feasible)
+                     in enumerate(zip(proposals, feasible)) if is_feasible]
+
+        values = self.optimization_object.evaluate_batch(
+            [proposal for _i, proposal in proposals], self.pool
+        )
+        for (index, proposal), value in zip(proposals, values):
+            if self._accept(self.values[index], value,
+                            1.0 / self.temperatures[index]):
+                self.positions[index] = proposal
+                self.values[index] = value
+                self.no_accepted += 1
+                self._improve_best(value, proposal)
+
+        self._take_snapshot(self.positions, self.values, self.best)
+
+    def _exchange_replicas(self, current_iter_steps):
+        """Try to swap the states of adjacent replicas, alternately starting
+        from the first or the second pair so every pair gets its chance."""
+        start = (current_iter_steps // self.swap_interval) % 2
+        for index in range(start, self.no_replicas - 1, 2):
+            # Exchanging the states of a colder and a hotter replica is
+            # accepted with min(1, exp((E_c - E_h) * (1/T_c - 1/T_h))).
+            if self._accept(self.values[index], self.values[index + 1],
+                            1.0 / self.temperatures[index] -
+                            1.0 / self.temperatures[index + 1]):
+                self.positions[index], self.positions[index + 1] = \
+                    self.positions[index + 1], self.positions[index]
+                self.values[index], self.values[index + 1] = \
+                    self.values[index + 1], self.values[index]
+                self.no_swaps += 1
+
+    def _accept(self, current, proposed, beta):
+        """Metropolis criterion of moving from the current value to the
+        proposed one, at the inverse temperature beta."""
+        if not is_better(proposed, current, self.find_max):
+            return True
+        delta = abs(proposed - current) * beta
+        return delta < 700 and \
+            self.random_generator.random() < math.exp(-delta)
+
+    def _propose_all(self, scales):
+        """Proposals of every replica, drawn as one array if NumPy is
+        installed, else one by one by _propose()."""
+        if self.random_state is None:
+            return [self._propose(position, scale)
+                    for position, scale in zip(self.positions, scales)]
+        # pylint: disable=import-outside-toplevel,import-error
+        import numpy
+        lower = numpy.array([lower for lower, _upper in self.boundaries],
+                            dtype=float)
+        width = numpy.array([upper - lower
+                             for lower, upper in self.boundaries],
+                            dtype=float)
+        values = numpy.array(self.positions, dtype=float) - lower + \
+            self.random_state.standard_normal(
+                (self.no_replicas, self.no_dimensions)
+            ) * numpy.outer(scales, width)
+        # Same reflection as _propose(), for all the dimensions at once.
+        values = numpy.mod(values, numpy.where(width > 0, 2 * width, 1.0))
+        values = numpy.where(values > width, 2 * width - values, values)
+        values = numpy.where(width > 0, values, 0.0) + lower
+        discretize = self.optimization_object.discretize
+        return [discretize(proposal) for proposal in values.tolist()]
+
+    def _propose(self, position, scale):
+        """Gaussian move, reflected back inside the boundaries, with its
+        discrete variables rounded."""
+        proposal = list()
+        for x, (lower, upper) in zip(position, self.boundaries):
+            width = upper - lower
+            value = x + self.random_generator.gauss(0.0, scale * width)
+            if width > 0:
+                # Fold into [lower, lower + 2 * width) then mirror.
+                value = (value - lower) % (2 * width)
+                if value > width:
+                    value = 2 * width - value
+                value += lower
+            else:
+                value = lower
+            proposal.append(value)
+        return self.optimization_object.discretize(proposal)
@@ -0,0 +1,238 @@
+"""
+This module contains the declarative problem specs. A spec describes an
+optimization (variables, objective, constraints) and the settings of its
+solver as plain data, read from a JSON or TOML document:
+
+    {
+        "variables": [
+            {"name": "x", "lower": -5, "upper": 5},
+            {"name": "n", "lower": 1, "upper": 10, "type": "integer"},
+            {"name": "mode", "values": [0.5, 1.5, 4.0]}
+        ],
+        "objective": "(x ** 2 + n - 11) ** 2 * mode",
+        "find_max": false,
+        "constraints": ["x + n <= 12"],
+        "linear_constraints": {"a_ub": [[1, 1, 0]], "b_ub": [12]},
+        "solver": {"algorithm": "pso", "no_particles": 20}
+    }
+
+The objective and the constraints are safe expressions of the variables'
+names (see py_opt_collection.expression) or references to importable
+functions, written {"function": "package.module:function"}, as is the
+optional "batch_objective" (see Optimization's batch_function). The built
+optimization only holds these picklable objects, never closures, so it is
+cheap to ship to worker processes and other nodes.
+"""
+
+import json
+from keyword import iskeyword
+from importlib import import_module
+from .expression import Expression, FUNCTIONS, CONSTANTS
+from .optimization import Optimization, CONTINUOUS, INTEGER
+
+
+SOLVERS = {
+    'pso': 'py_opt_collection.pso:PSO',
+    'mopso': 'py_opt_collection.mopso:MOPSO',
+    'de': 'py_opt_collection.de:DE',
+    'cmaes': 'py_opt_collection.cmaes:CMAES',
+    'sa': 'py_opt_collection.sa:SimulatedAnnealing'
+}
+
+
+class Reference(object):
+    """Importable object written "package.module:attribute". It pickles as
+    its reference only, and is imported again where it is unpickled."""
+
+    def __init__(self, reference):
+        """
+        :param reference: Module and attribute names, separated by a colon.
+        :type reference: str
+        """
+
+        self.reference = reference
+        self.target = resolve(reference)
+
+    def __call__(self, *args):
+        return self.target(*args)
+
+    def __getstate__(self):
+        return {'reference': self.reference}
+
+    def __setstate__(self, state):
+        self.__init__(state['reference'])
+
+    def __repr__(self):
+        return self.reference
+
+
+class ProblemSpec(object):
+    """Checked problem spec, it builds the optimization and its solver."""
+
+    def __init__(self, data):
+        """
+        :param data: Content of the spec.
+        :type data: dict
+        """
+
+        self.data = data
+        self.variables = data.get('variables')
+        if not self.variables:
+            raise ValueError('A spec needs at least one variable.')
+        self.names = [variable.get('name', 'x%d' % i)
+                      for i, variable in enumerate(self.variables)]
+        for name in self.names:
+            if not name.isidentifier() or iskeyword(name) or \
+                    name in FUNCTIONS or name in CONSTANTS:
+                raise ValueError("Invalid variable name '%s'." % name)
+        if len(set(self.names)) != len(self.names):
+            raise ValueError('Variables must have distinct names.')
+        if 'objective' not in data:
+            raise ValueError('A spec needs an objective.')
+
+        self.objective = self._function(data['objective'])
+        self.batch_objective = \
+            Reference(data['batch_objective']['function']) \
+            if 'batch_objective' in data else None
+        self.constraints = [self._function(constraint)
+                            for constraint in data.get('constraints', ())]
+
+    def optimization(self, seed=None):
+        """
+        Build the optimization of the spec.
+
+        :param seed: Seed of the optimization's random generator, default is
+        the spec's seed if it has one.
+        :type seed: int
+        :rtype: py_opt_collection.optimization.Optimization
+        """
+
+        boundaries = list()
+        variable_types = list()
+        for variable in self.variables:
+            if 'values' in variable:
+                boundaries.append(None)
+                variable_types.append(list(variable['values']))
+            else:
+                boundaries.append((variable['lower'], variable['upper']))
+                variable_types.append(variable.get('type', CONTINUOUS))
+                if variable_types[-1] not in (CONTINUOUS, INTEGER):
+                    raise ValueError("Unknown variable type '%s'." %
+                                     variable_types[-1])
+
+        ret = Optimization(
+            optimizing_function=self.objective,
+            batch_function=self.batch_objective,
+            boundaries=boundaries,
+            no_dimensions=len(self.variables),
+            find_max=self.data.get('find_max', False),
+            variable_types=variable_types,
+            seed=seed if seed is not None else self.data.get('seed')
+        )
+        for constraint in self.constraints:
+            ret.add_constraint(constraint)
+        linear_constraints = self.data.get('linear_constraints')
+        if linear_constraints:
+            ret.add_linear_constraints(**linear_constraints)
+        return ret
+
+    def solver(self, optimization_object=None, **kwargs):
+        """
+        Build the solver of the spec, from its "solver" table: the name of
+        the algorithm (see SOLVERS, or a reference to an algorithm class)
+        and its keyword arguments.
+
+        :param optimization_object: Optimization to be solved, default is a
+        new one built from the spec.
+        :type optimization_object:
+        py_opt_collection.optimization.Optimization
+        :param kwargs: Keyword arguments overriding the spec's ones.
+        :rtype: py_opt_collection.optimization.AlgorithmObject
+        """
+
+        settings = dict(self.data.get('solver', ()))
+        settings.update(kwargs)
+        algorithm = settings.pop('algorithm', 'pso')
+        if optimization_object is None:
+            optimization_object = self.optimization()
+        return resolve(SOLVERS.get(algorithm, algorithm))(
+            optimization_object, **settings
+        )
+
+    def to_json(self):
+        """
+        :return: The spec as a JSON document.
+        :rtype: str
+        """
+
+        return json.dumps(self.data, sort_keys=True)
+
+    def _function(self, function):
+        if isinstance(function, str):
+            return Expression(function, self.names)
+        if 'expression' in function:
+            return Expression(function['expression'], self.names)
+        return Reference(function['function'])
+
+
+def resolve(reference):
+    """
+    Import an object from its reference.
+
+    :param reference: Module and attribute names, separated by a colon:
+    "package.module:attribute".
+    :type reference: str
+    :return: The object.
+    """
+
+    module_name, _colon, attribute = reference.partition(':')
+    if not attribute:
+        raise ValueError("Invalid reference '%s', expecting "
+                         "'package.module:attribute'." % reference)
+    ret = import_module(module_name)
+    for name in attribute.split('.'):
+        ret = getattr(ret, name)
+    return ret
+
+
+def parse_spec(text, spec_format='json'):
+    """
+    Parse a spec document.
+
+    :param text: The document.
+    :type text: str
+    :param spec_format: Format of the document, json or toml. TOML needs
+    the tomllib standard module (Python 3.11+) or the tomli package.
+    :type spec_format: str
+    :rtype: ProblemSpec
+    """
+
+    if spec_format == 'json':
+        return ProblemSpec(json.loads(text))
+    if spec_format == 'toml':
+        try:
+            import tomllib as toml  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            try:
+                # pylint: disable=import-outside-toplevel,import-error
+                import tomli as toml
+            except ImportError as error:
+                raise ImportError('TOML specs need Python 3.11+ or the '
+                                  'tomli package.') from error
+        return ProblemSpec(toml.loads(text))
+    raise ValueError("Unknown spec format '%s'." % spec_format)
+
+
+def load_spec(path):
+    """
+    Load a spec file, its format is given by its extension (.json or
+    .toml).
+
+    :param path: Path of the file.
+    :type path: str
+    :rtype: ProblemSpec
+    """
+
+    with open(path, encoding='utf-8') as spec_file:
+        return parse_spec(spec_file.read(),
+                          'toml' if path.endswith('.toml') else 'json')
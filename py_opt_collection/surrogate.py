@@ -0,0 +1,144 @@
+"""
+This module contains cheap surrogate models of expensive optimizing
+functions. A surrogate learns from the positions which have been evaluated
+and predicts the value of new ones, so an algorithm can screen its candidates
+and only spend real evaluations on the most promising of them.
+"""
+
+import math
+from .archive import EvaluationArchive
+from .utils import solve_linear_system
+
+
+class KNNSurrogate(object):
+    """k-nearest neighbors regression: the prediction is the inverse distance
+    weighted mean of the k nearest evaluated positions' values."""
+
+    def __init__(self, no_neighbors=5, archive=None):
+        """
+        :param no_neighbors: Number of nearest evaluated positions used for
+        each prediction, default is 5.
+        :type no_neighbors: int
+        :param archive: Evaluation archive to learn from, usually the
+        optimization's archive which is fed by Optimization.evaluate(). If
+        not given, the surrogate keeps its own archive.
+        :type archive: py_opt_collection.archive.EvaluationArchive
+        """
+
+        self.no_neighbors = no_neighbors
+        self.archive = archive
+        self.is_shared = archive is not None
+
+    def __len__(self):
+        return 0 if self.archive is None else len(self.archive)
+
+    def add(self, position, value):
+        """
+        Add an evaluated position into the model.
+
+        :param position: Evaluated position.
+        :type position: list[number]
+        :param value: Its real value.
+        :type value: number
+        """
+
+        if self.is_shared:
+            # The owner of the archive is in charge of filling it.
+            return
+        if self.archive is None:
+            self.archive = EvaluationArchive(len(position))
+        self.archive.add(position, value)
+
+    def clear(self):
+        """Forget the evaluated positions. A shared archive is kept, its
+        owner is in charge of it."""
+        if not self.is_shared:
+            self.archive = None
+
+    def nearest(self, position):
+        """
+        Find the nearest evaluated positions.
+
+        :param position: Position to look around.
+        :type position: list[number]
+        :return: Distances and indexes of the nearest evaluated positions,
+        from the nearest.
+        :rtype: list[tuple[float, int]]
+        """
+
+        return self.archive.nearest(position, self.no_neighbors)
+
+    def predict(self, position):
+        """
+        Predict the value of a position.
+
+        :param position: Position to be predicted.
+        :type position: list[number]
+        :rtype: float
+        """
+
+        if not self.archive:
+            raise ValueError('The surrogate has no evaluated position.')
+        values = self.archive.values
+        total_weight = total = 0.0
+        for distance, index in self.nearest(position):
+            if distance == 0.0:
+                return values[index]
+            weight = 1.0 / distance ** 2
+            total_weight += weight
+            total += weight * values[index]
+        return total / total_weight
+
+    def predict_batch(self, positions):
+        """
+        Predict the values of many positions.
+
+        :param positions: Positions to be predicted.
+        :type positions: list[list[number]]
+        :rtype: list[float]
+        """
+
+        return [self.predict(position) for position in positions]
+
+
+class RBFSurrogate(KNNSurrogate):
+    """Local radial basis function interpolation: a multiquadric RBF model is
+    fitted on the k nearest evaluated positions of each prediction."""
+
+    def __init__(self, no_neighbors=10, archive=None):
+        """
+        :param no_neighbors: Number of nearest evaluated positions the local
+        model is fitted on, default is 10.
+        :type no_neighbors: int
+        :param archive: Evaluation archive to learn from, see KNNSurrogate.
+        :type archive: py_opt_collection.archive.EvaluationArchive
+        """
+
+        KNNSurrogate.__init__(self, no_neighbors, archive)
+
+    def predict(self, position):
+        if not self.archive:
+            raise ValueError('The surrogate has no evaluated position.')
+        values = self.archive.values
+        nearest = self.nearest(position)
+        if nearest[0][0] == 0.0 or len(nearest) == 1:
+            return values[nearest[0][1]]
+
+        centers = [self.archive.position(index) for _d, index in nearest]
+        shape = sum(distance for distance, _i in nearest) / len(nearest)
+
+        def kernel(point_a, point_b):
+            """Multiquadric kernel."""
+            return math.sqrt(sum(
+                (a - b) ** 2 for a, b in zip(point_a, point_b)
+            ) + shape ** 2)
+
+        try:
+            weights = solve_linear_system(
+                [[kernel(a, b) for b in centers] for a in centers],
+                [values[index] for _d, index in nearest]
+            )
+        except ValueError:
+            return KNNSurrogate.predict(self, position)
+        return sum(weight * kernel(position, center)
+                   for weight, center in zip(weights, centers))
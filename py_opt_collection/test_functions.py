@@ -1,10 +1,26 @@
 """
 This module contains some optimization test functions.
+
+Each test problem is built by a factory, which returns a new Optimization
+object (with its own random generator) together with the known results. The
+HIMMELBLAU and ROSENBROCK module attributes are kept for convenience, their
+problem is only built the first time they are accessed.
 """
 
+from collections.abc import Mapping
 from .optimization import Optimization
 
 
+def himmelblau_function(x):
+    """f(x) = (x^2 + y - 11)^2 + (x + y^2 -7)^2"""
+    return (x[0]**2 + x[1] - 11)**2 + (x[0] + x[1]**2 - 7)**2
+
+
+def rosenbrock_function(x):
+    """f(x) = (1 - x)^2 + 100(y - x^2)^2"""
+    return (1 - x[0]) ** 2 + 100 * (x[1] - x[0] ** 2) ** 2
+
+
 # Himmelblau function
 # Optimizing function: f(x) = (x^2 + y - 11)^2 + (x + y^2 -7)^2
 # Finding: min
@@ -12,21 +28,31 @@ from .optimization import Optimization
 # x: -5 -> 5
 # y: -5 -> 5
 
-HIMMELBLAU = {
-    'optimization': Optimization(
-        optimizing_function=lambda x:
-        (x[0]**2 + x[1] - 11)**2 + (x[0] + x[1]**2 - 7)**2,
-        boundaries=[(-5.0, 5.0), (-5.0, 5.0)],
-        no_dimensions=2,
-        find_max=False
-    ),
-    'results': [
-        (0.0, (3.0, 2.0)),
-        (0.0, (-2.805118, 3.131312)),
-        (0.0, (-3.779310, -3.283186)),
-        (0.0, (3.584428, -1.848126))
-    ]
-}
+def himmelblau(seed=None):
+    """
+    Build the Himmelblau test problem.
+
+    :param seed: Seed of the optimization's random generator.
+    :type seed: int
+    :return: The optimization object and the known results.
+    :rtype: dict
+    """
+
+    return {
+        'optimization': Optimization(
+            optimizing_function=himmelblau_function,
+            boundaries=[(-5.0, 5.0), (-5.0, 5.0)],
+            no_dimensions=2,
+            find_max=False,
+            seed=seed
+        ),
+        'results': [
+            (0.0, (3.0, 2.0)),
+            (0.0, (-2.805118, 3.131312)),
+            (0.0, (-3.779310, -3.283186)),
+            (0.0, (3.584428, -1.848126))
+        ]
+    }
 
 
 # Rosenbrock function
@@ -36,15 +62,52 @@ HIMMELBLAU = {
 # - x: -3 -> 3
 # - y: -3 -> 3
 
-ROSENBROCK = {
-    'optimization': Optimization(
-        optimizing_function=lambda x:
-        (1 - x[0]) ** 2 + 100 * (x[1] - x[0] ** 2) ** 2,
-        boundaries=[(-3.0, 3.0), (-3.0, 3.0)],
-        no_dimensions=2,
-        find_max=False
-    ),
-    'results': [
-        (1.36e-10, (1.0, 1.0))
-    ]
-}
+def rosenbrock(seed=None):
+    """
+    Build the Rosenbrock test problem.
+
+    :param seed: Seed of the optimization's random generator.
+    :type seed: int
+    :return: The optimization object and the known results.
+    :rtype: dict
+    """
+
+    return {
+        'optimization': Optimization(
+            optimizing_function=rosenbrock_function,
+            boundaries=[(-3.0, 3.0), (-3.0, 3.0)],
+            no_dimensions=2,
+            find_max=False,
+            seed=seed
+        ),
+        'results': [
+            (1.36e-10, (1.0, 1.0))
+        ]
+    }
+
+
+class LazyProblem(Mapping):
+    """Read-only mapping of a test problem, built by its factory the first
+    time one of its items is accessed."""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._problem = None
+
+    def _get_problem(self):
+        if self._problem is None:
+            self._problem = self.factory()
+        return self._problem
+
+    def __getitem__(self, key):
+        return self._get_problem()[key]
+
+    def __iter__(self):
+        return iter(self._get_problem())
+
+    def __len__(self):
+        return len(self._get_problem())
+
+
+HIMMELBLAU = LazyProblem(himmelblau)
+ROSENBROCK = LazyProblem(rosenbrock)
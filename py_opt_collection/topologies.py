@@ -0,0 +1,240 @@
+"""
+This module contains the neighborhood topologies of swarm based algorithms.
+A topology decides which particles share their local bests with each other:
+the global topology lets every particle follow the best of the whole swarm,
+while local topologies (ring, von Neumann, random) slow down the spreading
+of information, which helps on multimodal problems.
+"""
+
+import math
+from collections import deque
+from .utils import is_better
+
+
+class GlobalTopology(object):
+    """Every particle is connected to every other particles."""
+
+    name = 'global'
+
+    def connect(self, no_particles, random_generator):
+        """
+        Build the neighborhoods of a swarm.
+
+        :param no_particles: Number of particles of the swarm.
+        :type no_particles: int
+        :param random_generator: Random generator of the optimization.
+        :type random_generator: random.Random
+        :return: Indexes of each particle's neighbors, None if the topology
+        does not need them.
+        :rtype: list[list[int]]
+        """
+
+        # pylint: disable=unused-argument
+        return None
+
+    def best_indexes(self, values, neighborhoods, find_max):
+        """
+        Find the best neighbor of every particle at once.
+
+        :param values: Local best values of the particles.
+        :type values: list[number]
+        :param neighborhoods: Neighborhoods returned by connect().
+        :type neighborhoods: list[list[int]]
+        :param find_max: Is this optimization used to find Max.
+        :type find_max: bool
+        :return: Index of the best neighbor of each particle.
+        :rtype: list[int]
+        """
+
+        if neighborhoods is None:
+            best_index = _arg_best(values, range(len(values)), find_max)
+            return [best_index] * len(values)
+        return [_arg_best(values, neighborhood, find_max)
+                for neighborhood in neighborhoods]
+
+    def best_index(self, index, values, neighborhoods, find_max):
+        """
+        Find the best neighbor of one particle.
+
+        :param index: Index of the particle.
+        :type index: int
+        :param values: Local best values of the particles.
+        :type values: list[number]
+        :param neighborhoods: Neighborhoods returned by connect().
+        :type neighborhoods: list[list[int]]
+        :param find_max: Is this optimization used to find Max.
+        :type find_max: bool
+        :rtype: int
+        """
+
+        if neighborhoods is None:
+            return _arg_best(values, range(len(values)), find_max)
+        return _arg_best(values, neighborhoods[index], find_max)
+
+    def rewire(self, improved):
+        """
+        Tell if the neighborhoods should be built again after an iteration
+        step.
+
+        :param improved: The swarm's best has been improved in the last
+        iteration step or not.
+        :type improved: bool
+        :rtype: bool
+        """
+
+        # pylint: disable=unused-argument
+        return False
+
+
+class RingTopology(GlobalTopology):
+    """Particles are placed on a ring, each of them is connected to the
+    no_neighbors particles on each side."""
+
+    name = 'ring'
+
+    def __init__(self, no_neighbors=1):
+        """
+        :param no_neighbors: Number of neighbors on each side, default 1.
+        :type no_neighbors: int
+        """
+
+        self.no_neighbors = no_neighbors
+
+    def connect(self, no_particles, random_generator):
+        return [
+            [(i + offset) % no_particles
+             for offset in range(-self.no_neighbors, self.no_neighbors + 1)]
+            for i in range(no_particles)
+        ]
+
+    def best_indexes(self, values, neighborhoods, find_max):
+        # Sliding window arg-best over the circular list of values. The deque
+        # keeps the window's candidates, the best one at its front, so the
+        # whole swarm is done in O(n) regardless of the window's width. Ties
+        # are broken by the particles' indexes, as by best_index().
+        no_particles = len(values)
+        width = 2 * self.no_neighbors + 1
+        if width >= no_particles:
+            return GlobalTopology.best_indexes(
+                self, values, None, find_max
+            )
+        ret = [0] * no_particles
+        candidates = deque()
+        for j in range(no_particles + width - 1):
+            while candidates and _is_preferred(
+                    values, (j - self.no_neighbors) % no_particles,
+                    (candidates[-1] - self.no_neighbors) % no_particles,
+                    find_max):
+                candidates.pop()
+            candidates.append(j)
+            if candidates[0] <= j - width:
+                candidates.popleft()
+            if j >= width - 1:
+                ret[j - width + 1] = \
+                    (candidates[0] - self.no_neighbors) % no_particles
+        return ret
+
+
+class VonNeumannTopology(GlobalTopology):
+    """Particles are placed on a torus grid, each of them is connected to
+    the particles above, below, on the left and on the right."""
+
+    name = 'von_neumann'
+
+    def connect(self, no_particles, random_generator):
+        no_rows = int(math.sqrt(no_particles))
+        while no_particles % no_rows:
+            no_rows -= 1
+        no_columns = no_particles // no_rows
+        neighborhoods = list()
+        for i in range(no_particles):
+            row, column = divmod(i, no_columns)
+            neighborhoods.append(sorted(set([
+                i,
+                ((row - 1) % no_rows) * no_columns + column,
+                ((row + 1) % no_rows) * no_columns + column,
+                row * no_columns + (column - 1) % no_columns,
+                row * no_columns + (column + 1) % no_columns
+            ])))
+        return neighborhoods
+
+
+class RandomTopology(GlobalTopology):
+    """Each particle informs itself and no_informed random particles."""
+
+    name = 'random'
+
+    def __init__(self, no_informed=3):
+        """
+        :param no_informed: Number of particles informed by each particle,
+        default is 3.
+        :type no_informed: int
+        """
+
+        self.no_informed = no_informed
+
+    def connect(self, no_particles, random_generator):
+        neighborhoods = [[i] for i in range(no_particles)]
+        for i in range(no_particles):
+            for _j in range(self.no_informed):
+                informed = random_generator.randrange(no_particles)
+                if informed != i:
+                    neighborhoods[informed].append(i)
+        return neighborhoods
+
+
+class DynamicTopology(RandomTopology):
+    """Random topology which is re-built every time an iteration step does
+    not improve the swarm's best."""
+
+    name = 'dynamic'
+
+    def rewire(self, improved):
+        return not improved
+
+
+TOPOLOGIES = {
+    topology.name: topology
+    for topology in [GlobalTopology, RingTopology, VonNeumannTopology,
+                     RandomTopology, DynamicTopology]
+}
+
+
+def get_topology(topology):
+    """
+    Get a topology object from its name.
+
+    :param topology: Name of the topology (global, ring, von_neumann,
+    random or dynamic) or an initialized topology object.
+    :type topology: str | GlobalTopology
+    :rtype: GlobalTopology
+    """
+
+    if topology is None:
+        return GlobalTopology()
+    if isinstance(topology, str):
+        if topology not in TOPOLOGIES:
+            raise ValueError("Unknown topology '%s'." % topology)
+        return TOPOLOGIES[topology]()
+    return topology
+
+
+def _arg_best(values, indexes, find_max):
+    best_index = None
+    for index in indexes:
+        if best_index is None or \
+                _is_preferred(values, index, best_index, find_max):
+            best_index = index
+    return best_index
+
+
+def _is_preferred(values, index, other, find_max):
+    """The particle at index is a better neighbor than the other one: it
+    has a better value, or the same value and a lower index. Particles which
+    have not been evaluated yet (None) are the worst."""
+    value, other_value = values[index], values[other]
+    if value is None or other_value is None:
+        return other_value is None and (value is not None or index < other)
+    if value == other_value:
+        return index < other
+    return is_better(other_value, value, find_max)
@@ -1,5 +1,7 @@
 """This module contains support functions and classes for other modules."""
 
+from importlib.util import find_spec
+
 
 def is_better(ori_value, comparing_value, is_greater):
     """
@@ -21,3 +23,137 @@ def is_better(ori_value, comparing_value, is_greater):
                 (not is_greater and comparing_value >= ori_value):
             return False
     return True
+
+
+def numpy_random_state(random_generator):
+    """
+    Create a NumPy random generator seeded from a random generator, to draw
+    arrays of random numbers at once.
+
+    :param random_generator: Random generator of the algorithm.
+    :type random_generator: random.Random
+    :return: The NumPy random generator, None if NumPy is not installed (the
+    random generator is then left untouched).
+    :rtype: numpy.random.RandomState
+    """
+
+    if find_spec('numpy') is None:
+        return None
+    # pylint: disable=import-outside-toplevel,import-error,no-member
+    import numpy
+    return numpy.random.RandomState(random_generator.getrandbits(32))
+
+
+def solve_linear_system(matrix, vector):
+    """
+    Solve the linear system matrix * x = vector by Gaussian elimination with
+    partial pivoting.
+
+    :param matrix: Square matrix, as a list of rows.
+    :type matrix: list[list[number]]
+    :param vector: Right hand side.
+    :type vector: list[number]
+    :return: The solution x.
+    :rtype: list[float]
+    """
+
+    size = len(vector)
+    rows = [list(map(float, matrix[i])) + [float(vector[i])]
+            for i in range(size)]
+    for col in range(size):
+        pivot = col
+        for i in range(col + 1, size):
+            if abs(rows[i][col]) > abs(rows[pivot][col]):
+                pivot = i
+        if rows[pivot][col] == 0.0:
+            raise ValueError('Singular matrix.')
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for i in range(col + 1, size):
+            factor = rows[i][col] / rows[col][col]
+            if factor:
+                for j in range(col, size + 1):
+                    rows[i][j] -= factor * rows[col][j]
+    ret = [0.0] * size
+    for i in reversed(range(size)):
+        ret[i] = (rows[i][size] - sum(
+            rows[i][j] * ret[j] for j in range(i + 1, size)
+        )) / rows[i][i]
+    return ret
+
+
+def symmetric_eigen(matrix, tolerance=1e-12, max_sweeps=50):
+    """
+    Eigen decomposition of a symmetric matrix by the cyclic Jacobi method.
+
+    :param matrix: Symmetric matrix, as a list of rows.
+    :type matrix: list[list[number]]
+    :param tolerance: Stop when the off-diagonal part is smaller than this,
+    relatively to the whole matrix.
+    :type tolerance: float
+    :param max_sweeps: Maximum number of sweeps over the off-diagonal
+    elements.
+    :type max_sweeps: int
+    :return: Eigenvalues and eigenvectors (as columns of a matrix).
+    :rtype: (list[float], list[list[float]])
+    """
+
+    size = len(matrix)
+    rows = [list(map(float, row)) for row in matrix]
+    vectors = [[float(i == j) for j in range(size)] for i in range(size)]
+    total = sum(value ** 2 for row in rows for value in row)
+    for _sweep in range(max_sweeps):
+        off_diagonal = sum(rows[i][j] ** 2
+                           for i in range(size) for j in range(size)
+                           if i != j)
+        if off_diagonal <= tolerance ** 2 * total:
+            break
+        for p in range(size - 1):
+            for q in range(p + 1, size):
+                if rows[p][q] == 0.0:
+                    continue
+                theta = (rows[q][q] - rows[p][p]) / (2.0 * rows[p][q])
+                tangent = (1.0 if theta >= 0 else -1.0) / \
+                    (abs(theta) + (theta ** 2 + 1.0) ** 0.5)
+                cosine = 1.0 / (tangent ** 2 + 1.0) ** 0.5
+                sine = tangent * cosine
+                for k in range(size):
+                    row_p, row_q = rows[p][k], rows[q][k]
+                    rows[p][k] = cosine * row_p - sine * row_q
+                    rows[q][k] = sine * row_p + cosine * row_q
+                for k in range(size):
+                    col_p, col_q = rows[k][p], rows[k][q]
+                    rows[k][p] = cosine * col_p - sine * col_q
+                    rows[k][q] = sine * col_p + cosine * col_q
+                    vec_p, vec_q = vectors[k][p], vectors[k][q]
+                    vectors[k][p] = cosine * vec_p - sine * vec_q
+                    vectors[k][q] = sine * vec_p + cosine * vec_q
+    return [rows[i][i] for i in range(size)], vectors
+
+
+def dominates(values_a, values_b, find_max):
+    """
+    Pareto dominance between the values of two positions of a multi
+    objective optimization: values_a dominates values_b if it is not worse
+    on any objective and better on at least one of them.
+
+    :param values_a: Values of the first position.
+    :type values_a: tuple[number]
+    :param values_b: Values of the second position.
+    :type values_b: tuple[number]
+    :param find_max: Look for the max of every objective, or a list telling
+    it for each objective.
+    :type find_max: bool | list[bool]
+    :return: values_a dominates values_b or not.
+    :rtype: bool
+    """
+
+    if isinstance(find_max, bool):
+        find_max = [find_max] * len(values_a)
+    ret = False
+    for value_a, value_b, is_greater in zip(values_a, values_b, find_max):
+        if value_a == value_b:
+            continue
+        if (value_a > value_b) != is_greater:
+            return False
+        ret = True
+    return ret
@@ -0,0 +1,81 @@
+"""
+This module contains the helpers of warm starts: a problem which has
+slightly changed since its last solve (new prices, new resources, a horizon
+rolled forward) is solved again from the solutions of the previous solve
+instead of from random positions. See the warm_start argument of PSO, and
+Optimization.import_archive() to reuse the previous evaluations.
+"""
+
+
+def warm_positions(source):
+    """
+    Positions to warm start a swarm from, the best ones first.
+
+    :param source: A previous PSO (the global best and its particles' local
+    best positions), a MultipleSolving which has been run (its results'
+    positions), a list of results (value and position) or a list of
+    positions.
+    :rtype: list[list[number]]
+    """
+
+    particles = getattr(source, 'particles', None)
+    if particles is not None:
+        ranked = sorted([particle for particle in particles
+                         if particle.best[0] is not None],
+                        key=lambda particle: particle.best[0],
+                        reverse=source.find_max)
+        ret = [list(particle.best[1]) for particle in ranked]
+        if source.best[1] is not None and list(source.best[1]) not in ret:
+            ret.insert(0, list(source.best[1]))
+        return ret
+    source = getattr(source, 'results', source)
+    return [list(item[1]) if isinstance(item, tuple) else list(item)
+            for item in source]
+
+
+def shift_horizon(positions, period_size, no_added=1, no_dropped=None,
+                  fill=None, newest_first=False):
+    """
+    Roll the positions of a multi-period problem forward: the variables of
+    the oldest periods are dropped and the ones of new periods are added.
+
+    :param positions: Positions made of the variables of consecutive
+    periods, period_size variables per period, from the oldest period to the
+    newest one (or from the newest to the oldest with newest_first, like the
+    ProducePeriod chains of the production planning example).
+    :type positions: list[list[number]]
+    :param period_size: Number of variables of one period.
+    :type period_size: int
+    :param no_added: Number of new periods.
+    :type no_added: int
+    :param no_dropped: Number of oldest periods to be dropped, default is
+    no_added (the horizon keeps its length), 0 extends the horizon.
+    :type no_dropped: int
+    :param fill: Variables of the new periods, default is a copy of the
+    newest kept period's ones.
+    :type fill: list[number]
+    :param newest_first: The newest period's variables come first.
+    :type newest_first: bool
+    :return: The shifted positions.
+    :rtype: list[list[number]]
+    """
+
+    if no_dropped is None:
+        no_dropped = no_added
+    ret = list()
+    for position in positions:
+        if len(position) % period_size:
+            raise ValueError('The positions must be made of whole periods.')
+        periods = [list(position[i:i + period_size])
+                   for i in range(0, len(position), period_size)]
+        if newest_first:
+            periods.reverse()
+        periods = periods[no_dropped:]
+        if fill is None and not periods:
+            raise ValueError('No period is left to fill the new ones from.')
+        new_period = list(fill) if fill is not None else periods[-1]
+        periods.extend(list(new_period) for _i in range(no_added))
+        if newest_first:
+            periods.reverse()
+        ret.append([x for period in periods for x in period])
+    return ret
@@ -0,0 +1,93 @@
+"""Test py_opt_collection.archive module."""
+
+import math
+from random import Random
+from concurrent.futures import ThreadPoolExecutor
+from py_opt_collection.archive import EvaluationArchive
+from py_opt_collection.optimization import Optimization
+from py_opt_collection.pso import PSO
+from py_opt_collection.surrogate import RBFSurrogate
+
+
+def _distance(position_a, position_b):
+    return math.sqrt(sum((a - b) ** 2 for a, b in zip(position_a, position_b)))
+
+
+class TestEvaluationArchive(object):
+    """Tests for py_opt_collection.archive.EvaluationArchive class."""
+
+    def test_add(self):
+        archive = EvaluationArchive(2)
+        assert len(archive) == 0
+        assert archive.add([1.0, 2.0], 5.0) == 0
+        assert archive.add([3.0, 4.0], 6.0, feasible=False) == 1
+        assert len(archive) == 2
+        assert archive.position(1) == [3.0, 4.0]
+        assert archive.values.tolist() == [5.0, 6.0]
+        assert archive.feasible.tolist() == [1, 0]
+
+    def test_lookup(self):
+        archive = EvaluationArchive(2, tolerance=0.1)
+        assert archive.lookup([0.0, 0.0]) is None
+        archive.add([1.0, 2.0], 5.0)
+        assert archive.lookup([1.0, 2.0]) == 0
+        assert archive.lookup([1.05, 2.0]) == 0
+        assert archive.lookup([1.05, 2.0], tolerance=0.0) is None
+        assert archive.lookup([1.2, 2.0]) is None
+
+    def test_nearest_and_within(self):
+        random_generator = Random(2018)
+        archive = EvaluationArchive(3)
+        points = list()
+        for _i in range(500):
+            point = [random_generator.uniform(-1, 1) for _d in range(3)]
+            points.append(point)
+            archive.add(point, 0.0)
+        for _i in range(20):
+            query = [random_generator.uniform(-1, 1) for _d in range(3)]
+            expected = sorted(
+                (_distance(query, point), i) for i, point in enumerate(points)
+            )
+            assert archive.nearest(query, 7) == expected[:7]
+            assert archive.within(query, 0.3) == sorted(
+                i for d, i in expected if d <= 0.3
+            )
+
+
+class TestArchivedEvaluation(object):
+    """Tests for the evaluations going through the archive."""
+
+    def test_evaluate(self, fix_optimization_object_kwargs):
+        opt_object = Optimization(**fix_optimization_object_kwargs)
+        profiler = opt_object.enable_profiling()
+        archive = opt_object.enable_archive()
+        assert opt_object.enable_archive() is archive
+
+        value = opt_object.evaluate([0.5])
+        assert opt_object.evaluate([0.5]) == value
+        assert opt_object.evaluate_batch(
+            [[0.5], [1.0], [1.0], [2.0]]
+        ) == [value, opt_object.func.__wrapped__([1.0]),
+              opt_object.func.__wrapped__([1.0]),
+              opt_object.func.__wrapped__([2.0])]
+        assert len(archive) == 3
+        assert profiler.report()['objective_calls']['count'] == 3
+
+    def test_pso(self, fix_optimization_object):
+        archive = fix_optimization_object.enable_archive()
+        fix_optimization_object.random_generator.seed(2018)
+        pso = PSO(optimization_object=fix_optimization_object,
+                  no_particles=10,
+                  no_iteration_steps=10,
+                  surrogate=RBFSurrogate(archive=archive))
+        pso.solve()
+        assert len(archive) == len(pso.surrogate) > 10
+
+        size = len(archive)
+        pso = PSO(optimization_object=fix_optimization_object,
+                  no_particles=10,
+                  no_iteration_steps=10,
+                  update_mode='steady_state',
+                  pool=ThreadPoolExecutor(2))
+        pso.solve()
+        assert size < len(archive) <= size + 100
@@ -0,0 +1,100 @@
+"""Test py_opt_collection.batch module."""
+
+import pytest
+from py_opt_collection import batch
+from py_opt_collection.optimization import MultipleSolving, Optimization
+from py_opt_collection.pso import PSO
+from py_opt_collection.test_functions import himmelblau
+
+
+def test_create_batch():
+    """Only supported configurations get a vectorized state."""
+    pytest.importorskip('numpy')
+    optimization = himmelblau()['optimization']
+    constrained = himmelblau()['optimization']
+    constrained.add_constraint(lambda x: x[0] > 0)
+    for pso, supported in [
+            (PSO(optimization_object=optimization), True),
+            (PSO(optimization_object=constrained), False),
+            (PSO(optimization_object=optimization, topology='ring'), False),
+            (PSO(optimization_object=optimization, historical=True), False)]:
+        trials = [pso.copy_trial(update_mode='synchronous')
+                  for _i in range(2)]
+        for trial in trials:
+            trial._spawn_particles()
+        assert (batch.create_batch(pso, trials) is not None) == supported
+
+    # The trials of solve_instances(), bound to their instance's parameters,
+    # are vectorized too: evaluate() passes the parameters.
+    parameterized = Optimization(
+        optimizing_function=lambda x, parameters: (x[0] - parameters) ** 2,
+        boundaries=[(-3, 3)],
+        no_dimensions=1
+    )
+    pso = PSO(optimization_object=parameterized)
+    trials = [pso.copy_trial(update_mode='synchronous',
+                             optimization_object=parameterized.bind(instance))
+              for instance in [1, 2]]
+    for trial in trials:
+        trial._spawn_particles()
+    assert batch.create_batch(pso, trials) is not None
+
+
+def test_step():
+    pytest.importorskip('numpy')
+    evaluated = list()
+    optimization = Optimization(
+        optimizing_function=lambda x: (x[0] - 1) ** 2 + (x[1] + 2) ** 2,
+        boundaries=[(-3, 3), (-3, 3)],
+        no_dimensions=2
+    )
+    pso = PSO(optimization_object=optimization,
+              no_particles=15,
+              no_iteration_steps=60,
+              inertia=0.7,
+              velocity_clamp=0.2)
+    trials = [pso.copy_trial(update_mode='synchronous', seed=seed)
+              for seed in range(4)]
+    for trial in trials:
+        trial._spawn_particles()
+    trials_batch = batch.create_batch(pso, trials)
+    assert trials_batch.positions.shape == (4, 15, 2)
+
+    def evaluate(positions):
+        evaluated.append(len(positions))
+        return optimization.evaluate_batch(positions)
+
+    no_improved = trials_batch.step(trials, evaluate)
+    assert evaluated == [4 * 15]
+    assert len(no_improved) == 4
+    assert all(0 <= count <= 15 for count in no_improved)
+    assert all(abs(v) <= 0.2 * 6 for v in trials_batch.velocities.ravel())
+    assert all(-3 <= x <= 3 for x in trials_batch.positions.ravel())
+    for i, trial in enumerate(trials):
+        assert trial.best[0] <= trials_batch.best_values[i].min()
+    trials_batch.sync(trials)
+    assert trials[1].particles[2].position == \
+        trials_batch.positions[1, 2].tolist()
+
+    # Moves leaving the boundaries are repaired like Particle.repair():
+    # halved, then drawn again, not clipped.
+    trials_batch.positions[:, :, 0] = 3.0
+    trials_batch.velocities[:, :, 0] = 1.0
+    trials_batch._keep_inside()
+    assert all(-3 <= x <= 3 for x in trials_batch.positions.ravel())
+    assert (trials_batch.velocities[:, :, 0] <= 0.0).all()
+    assert (trials_batch.velocities[:, :, 0] < 0.0).any()
+
+    # Same trials, same results: each trial has its own random stream.
+    results = pso.solve_batch(4, seeds=[1, 2, 3, 4])
+    assert pso.solve_batch(4, seeds=[1, 2, 3, 4]) == results
+    for value, position in results:
+        assert value == pytest.approx(0.0, abs=1e-6)
+        assert value == optimization.func(position)
+
+    # Unseeded trials: enough iteration steps for all of them to converge.
+    pso.no_iteration_steps = 100
+    ms = MultipleSolving(pso, 6)
+    ms.run(batched=True)
+    assert len(ms.results) == 6
+    assert ms.stat['mean'] == pytest.approx(0.0, abs=1e-6)
@@ -0,0 +1,140 @@
+"""Test py_opt_collection.cmaes 's classes."""
+
+import pytest
+from py_opt_collection.cmaes import CMAES, _CMAState
+from py_opt_collection.optimization import Optimization, MultipleSolving
+from py_opt_collection.test_functions import HIMMELBLAU
+
+
+def sphere(position):
+    return sum(x ** 2 for x in position)
+
+
+class TestCMAES(object):
+    """Tests for py_opt_collection.cmaes.CMAES class."""
+
+    def test___init__(self, fix_optimization_object):
+        cma_1 = CMAES(optimization_object=fix_optimization_object,
+                      population_size=12,
+                      no_iteration_steps=30,
+                      sigma=0.5,
+                      separable=True,
+                      restarts='ipop')
+        assert cma_1.optimization_object == fix_optimization_object
+        assert cma_1.population_size == 12
+        assert cma_1.no_iteration_steps == 30
+        assert cma_1.sigma == 0.5
+        assert cma_1.separable
+        assert cma_1.restarts == 'ipop'
+
+        cma_2 = CMAES(optimization_object=fix_optimization_object)
+        assert cma_2.population_size == 4
+        assert cma_2.sigma == pytest.approx(1.8)
+        with pytest.raises(ValueError):
+            CMAES(optimization_object=fix_optimization_object,
+                  restarts='lrpop')
+
+    def test_solve(self, fix_optimization_object, capsys):
+        fix_optimization_object.random_generator.seed(2018)
+        cma_1 = CMAES(optimization_object=fix_optimization_object,
+                      population_size=10,
+                      no_iteration_steps=30,
+                      historical=True,
+                      verbose=True)
+        result = cma_1.solve()
+        assert isinstance(result, tuple)
+        assert result[0] <= -4.13
+        assert fix_optimization_object.check_constraints(result[1])
+        assert cma_1.snapshots.__len__() == 30
+        # The first result comes before the first generation.
+        assert len(list(cma_1.iter_solve())) == 31
+        out, err = capsys.readouterr()
+        for i in range(30):
+            assert out.find("Iteration step #%d" % i) > -1
+
+    def test_sphere(self):
+        for separable in [False, True]:
+            optimization = Optimization(optimizing_function=sphere,
+                                        boundaries=[(-5, 5)] * 6,
+                                        no_dimensions=6,
+                                        find_max=False,
+                                        seed=2018)
+            cma_1 = CMAES(optimization_object=optimization,
+                          no_iteration_steps=150,
+                          separable=separable)
+            cma_1.solve()
+            assert cma_1.best[0] < 1e-6
+            for x, (lower, upper) in zip(cma_1.best[1],
+                                         optimization.boundaries):
+                assert lower <= x <= upper
+
+    def test_vectorized(self):
+        pytest.importorskip('numpy')
+        optimization = Optimization(optimizing_function=sphere,
+                                    boundaries=[(-5, 5)] * 30,
+                                    no_dimensions=30,
+                                    find_max=False,
+                                    seed=2018)
+        cma_1 = CMAES(optimization_object=optimization,
+                      no_iteration_steps=400)
+        cma_1.solve()
+        assert cma_1.state.vectorized
+        assert cma_1.best[0] < 1e-6
+
+        # The NumPy state is updated as the Python one.
+        states = list()
+        for vectorized in [True, False]:
+            optimization.random_generator.seed(7)
+            states.append(_CMAState(cma_1, 12, 0.5, vectorized=vectorized))
+        for _i in range(3):
+            steps = states[0].sample()
+            for state in states:
+                state.update([step for step, _position in steps])
+            assert states[0].mean == pytest.approx(states[1].mean)
+            assert states[0].p_s == pytest.approx(states[1].p_s)
+            for row_0, row_1 in zip(states[0].covariance.tolist(),
+                                    states[1].covariance):
+                assert row_0 == pytest.approx(row_1)
+        assert sorted(states[0].eigen_scales.tolist()) == \
+            pytest.approx(sorted(states[1].eigen_scales))
+
+    def test_variable_types(self):
+        optimization = Optimization(
+            optimizing_function=lambda x: (x[0] - 7) ** 2 + (x[1] - 2) ** 2,
+            boundaries=[(-20, 20), (-5.5, 5.5)],
+            no_dimensions=2,
+            variable_types=['integer', 'integer'],
+            seed=2018
+        )
+        cma_1 = CMAES(optimization_object=optimization,
+                      no_iteration_steps=50)
+        assert cma_1.solve() == (0, [7, 2])
+        for position in [cma_1.best[1]]:
+            assert all(isinstance(x, int) for x in position)
+
+    def test_restarts(self):
+        for restarts in ['ipop', 'bipop']:
+            HIMMELBLAU['optimization'].random_generator.seed(2018)
+            cma_1 = CMAES(optimization_object=HIMMELBLAU['optimization'],
+                          no_iteration_steps=300,
+                          restarts=restarts,
+                          max_restarts=3)
+            cma_1.solve()
+            assert cma_1.no_restarts == 3
+            assert cma_1.best[0] < 1e-6
+
+    def test_deterministic(self, fix_optimization_object):
+        results = list()
+        for _i in range(2):
+            fix_optimization_object.random_generator.seed(2018)
+            results.append(CMAES(optimization_object=fix_optimization_object,
+                                 no_iteration_steps=10).solve())
+        assert results[0] == results[1]
+
+    def test_multiple_solving(self, fix_optimization_object):
+        cma_1 = CMAES(optimization_object=fix_optimization_object,
+                      no_iteration_steps=20)
+        ms = MultipleSolving(cma_1, 5)
+        ms.run()
+        assert ms.is_run
+        assert len(ms.results) == 5
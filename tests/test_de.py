@@ -0,0 +1,128 @@
+"""Test py_opt_collection.de 's classes."""
+
+import pytest
+from py_opt_collection.de import DE
+from py_opt_collection.optimization import Optimization, MultipleSolving
+from py_opt_collection.test_functions import HIMMELBLAU
+
+
+class TestDE(object):
+    """Tests for py_opt_collection.de.DE class."""
+
+    def test___init__(self, fix_optimization_object):
+        de_1 = DE(optimization_object=fix_optimization_object,
+                  no_individuals=15,
+                  no_iteration_steps=30,
+                  strategy='best/1/bin',
+                  differential_weight=0.7,
+                  crossover_rate=0.5)
+        assert de_1.optimization_object == fix_optimization_object
+        assert de_1.no_individuals == 15
+        assert de_1.no_iteration_steps == 30
+        assert de_1.strategy == 'best/1/bin'
+        assert de_1.differential_weight == 0.7
+        assert de_1.crossover_rate == 0.5
+        assert isinstance(de_1.population, list)
+
+        with pytest.raises(ValueError):
+            DE(optimization_object=fix_optimization_object,
+               strategy='rand/2/exp')
+        with pytest.raises(ValueError):
+            DE(optimization_object=fix_optimization_object,
+               no_individuals=3)
+
+    def test_solve(self, fix_optimization_object, capsys):
+        for strategy in ['rand/1/bin', 'best/1/bin', 'current-to-best/1/bin']:
+            fix_optimization_object.random_generator.seed(2018)
+            de_1 = DE(optimization_object=fix_optimization_object,
+                      no_individuals=20,
+                      no_iteration_steps=30,
+                      strategy=strategy,
+                      historical=True,
+                      verbose=True)
+            result = de_1.solve()
+            assert isinstance(result, tuple)
+            assert result[0] <= -4.13
+            assert fix_optimization_object.check_constraints(result[1])
+            assert de_1.snapshots.__len__() == 30
+            for position in de_1.population:
+                assert fix_optimization_object.check_constraints(position)
+        out, err = capsys.readouterr()
+        for i in range(30):
+            assert out.find("Iteration step #%d" % i) > -1
+
+    def test_infeasible(self, fix_optimization_object):
+        profiler = fix_optimization_object.enable_profiling()
+        DE(optimization_object=fix_optimization_object,
+           no_iteration_steps=10).solve()
+        # Infeasible trials are rejected, not repaired.
+        assert profiler.report()['infeasible_rejections']['count'] > 0
+        assert 'repair_retries' not in profiler.report()
+
+        fix_optimization_object.add_constraint(lambda x: False)
+        with pytest.raises(ValueError):
+            DE(optimization_object=fix_optimization_object).solve()
+
+    def test_deterministic(self, fix_optimization_object):
+        results = list()
+        for _i in range(2):
+            fix_optimization_object.random_generator.seed(2018)
+            results.append(DE(optimization_object=fix_optimization_object,
+                              no_iteration_steps=10).solve())
+        assert results[0] == results[1]
+
+    def test_vectorized(self):
+        pytest.importorskip('numpy')
+        for strategy in ['rand/1/bin', 'best/1/bin', 'current-to-best/1/bin']:
+            optimization = Optimization(
+                optimizing_function=lambda x: sum(v ** 2 for v in x),
+                boundaries=[(-5, 5)] * 4,
+                no_dimensions=4,
+                seed=2018
+            )
+            de_1 = DE(optimization_object=optimization,
+                      no_iteration_steps=150,
+                      strategy=strategy)
+            de_1.solve()
+            assert de_1.random_state is not None
+            assert de_1.best[0] < 1e-4
+
+        # The trials stay inside the boundaries, with or without NumPy.
+        de_1.differential_weight = 5.0
+        for random_state in [de_1.random_state, None]:
+            de_1.random_state = random_state
+            trials = de_1._make_trials(0)
+            assert len(trials) == de_1.no_individuals
+            for trial in trials:
+                assert all(-5 <= x <= 5 for x in trial)
+
+    def test_variable_types(self):
+        optimization = Optimization(
+            optimizing_function=lambda x: (x[0] - 7) ** 2 + (x[1] - 2) ** 2,
+            boundaries=[(-20, 20), (-5.5, 5.5)],
+            no_dimensions=2,
+            variable_types=['integer', 'integer'],
+            seed=2018
+        )
+        de_1 = DE(optimization_object=optimization, no_iteration_steps=30)
+        assert de_1.solve() == (0, [7, 2])
+        for position in de_1.population:
+            assert all(isinstance(x, int) for x in position)
+
+    def test_himmelblau(self):
+        HIMMELBLAU['optimization'].random_generator.seed(2018)
+        de_1 = DE(optimization_object=HIMMELBLAU['optimization'],
+                  no_individuals=30,
+                  no_iteration_steps=100)
+        de_1.solve()
+        assert de_1.best[0] < 1e-6
+
+    def test_multiple_solving(self, fix_optimization_object):
+        de_1 = DE(optimization_object=fix_optimization_object,
+                  no_individuals=10,
+                  no_iteration_steps=20,
+                  strategy='current-to-best/1/bin')
+        ms = MultipleSolving(de_1, 5)
+        ms.run()
+        assert ms.is_run
+        assert len(ms.results) == 5
@@ -0,0 +1,92 @@
+"""Test py_opt_collection.expression module."""
+
+import math
+import pickle
+import pytest
+from py_opt_collection.expression import Expression
+
+
+class TestExpression(object):
+    """Tests for py_opt_collection.expression.Expression class."""
+
+    def test___call__(self):
+        expression = Expression('(x ** 2 + y - 11) ** 2 + sqrt(abs(y))',
+                                ['x', 'y'])
+        assert expression([3.0, 4.0]) == 2.0 ** 2 + 2.0
+        assert Expression('x + y <= 5 and not x < 0', ['x', 'y'])([1, 4])
+        assert Expression('x if x > 0 else -x * pi',
+                          ['x'])([-1]) == math.pi
+        assert repr(expression) == '(x ** 2 + y - 11) ** 2 + sqrt(abs(y))'
+
+    def test_compile(self):
+        """Constants are folded and repeated subexpressions are evaluated
+        once, but not out of a condition."""
+        expression = Expression(
+            '(x * y + 1) ** 2 + sqrt(x * y + 1) * 2 ** 3 * cos(pi)',
+            ['x', 'y', 'z']
+        )
+        assert expression.scalar_source.count('(x * y)') == 1
+        assert '_t0 = ((x * y) + 1)' in expression.scalar_source
+        assert '* 8) * (-1.0)' in expression.scalar_source
+        assert 'pi' not in expression.scalar_source
+        assert 'z' not in expression.scalar_source
+        assert expression([1, 3, 0]) == 16 - 16.0
+
+        expression = Expression('sqrt(x) + sqrt(x) if x >= 0 else -1',
+                                ['x'])
+        assert '_t0' not in expression.scalar_source
+        assert expression([-4]) == -1
+        assert Expression('log(0) * x if x else 0', ['x'])([0]) == 0
+
+        # Huge integer powers are not computed while parsing.
+        expression = Expression('x + 9 ** 9 ** 9 - 2 ** 10', ['x'])
+        assert '(9 ** 387420489)' in expression.scalar_source
+        assert '1024' in expression.scalar_source
+
+    def test_evaluate_batch(self):
+        pytest.importorskip('numpy')
+        expression = Expression(
+            'min(x, y, 2) if x > 0 and y < 1 < x else -abs(x) - 2 ** 3',
+            ['x', 'y']
+        )
+        assert expression.vectorized
+        positions = [[3, 0], [-1, 0], [0.5, 0.2], [1.5, 2]]
+        assert expression.evaluate_batch(positions) == \
+            [expression(position) for position in positions]
+        assert Expression('2 * pi', ['x']).evaluate_batch([[1], [2]]) == \
+            [2 * math.pi] * 2
+
+    @pytest.mark.parametrize('source', [
+        'log(abs(x) + 1, 2) + log(y + 3, 10)',
+        'x or 3',
+        'x and y',
+        '-(x - 1 and y)',
+        '-(x > 1) + 2 * (not y)',
+        '(x > 0 or y) * 4 - (x and y > 1 and 5)',
+        'not x or y < 1 <= x',
+        'round(x * 3.3, 1) + floor(y) - ceil(x) + atan2(y, x + 10)',
+        'min(x, y, 0.5) * max(x, 2) + pow(abs(y), 1.5) + x % 2 - y // 3'
+    ])
+    def test_batch_matches_scalar(self, source):
+        pytest.importorskip('numpy')
+        expression = Expression(source, ['x', 'y'])
+        positions = [[3, 0], [-1, 0], [0, 0], [1, 2.5], [0.5, -2], [2, 1]]
+        assert expression.evaluate_batch(positions) == pytest.approx(
+            [expression(position) for position in positions]
+        )
+
+    def test_unsafe(self):
+        for source in ['__import__("os")', 'x.real', 'open("f")',
+                       '[x for x in y]', 'x[0]', '"text"', 'z + 1',
+                       'lambda: 1', 'x +', 'x(1)', '_t0']:
+            with pytest.raises(ValueError):
+                Expression(source, ['x', 'y'])
+        for name in ['_x', 'sqrt', 'pi', 'if', '1x']:
+            with pytest.raises(ValueError):
+                Expression('1', [name])
+
+    def test_pickle(self):
+        expression = Expression('x * y', ['x', 'y'])
+        data = pickle.dumps(expression)
+        assert b'x * y' in data
+        assert pickle.loads(data)([2, 3]) == 6
@@ -0,0 +1,70 @@
+"""Test py_opt_collection.history module."""
+
+import math
+import pytest
+from py_opt_collection.history import HistoryWriter, HistoryReader, \
+    columns
+
+
+def test_columns():
+    assert columns(3, 2) == [
+        ('positions', 6), ('velocities', 6), ('values', 3),
+        ('best_values', 3), ('best_positions', 6), ('global_best_value', 1),
+        ('global_best_position', 2)
+    ]
+
+
+class TestHistory(object):
+    """Tests for HistoryWriter and HistoryReader classes."""
+
+    def test_write_read(self, tmpdir):
+        path = str(tmpdir.join('run.history'))
+        with HistoryWriter(path, 5, 2, 3) as writer:
+            for step in range(3):
+                writer.append(
+                    [step + 0.1 * i for i in range(6)], [-1.0] * 6,
+                    [step, None], [step, step + 1.0], [0.5] * 6,
+                    -step, [step, 1.0, 2.0]
+                )
+            # Partially written runs can be read.
+            with HistoryReader(path) as reader:
+                assert len(reader) == 3
+            with pytest.raises(ValueError):
+                writer.append([0.0] * 5, [0.0] * 6, [0, 0], [0, 0],
+                              [0.0] * 6, 0, [0.0] * 3)
+
+        with HistoryReader(path) as reader:
+            assert (reader.capacity, reader.no_particles,
+                    reader.no_dimensions) == (5, 2, 3)
+            assert reader.position(1, 1).tolist() == \
+                pytest.approx([1.3, 1.4, 1.5])
+            assert reader.position(-1, 0, 'velocities').tolist() == [-1.0] * 3
+            values = reader.column('values', 2)
+            assert values[0] == 2.0 and math.isnan(values[1])
+            assert reader.column('global_best_value', 2).tolist() == [-2.0]
+            for step, position in enumerate(reader.trajectory(0)):
+                assert position == pytest.approx([step, step + 0.1,
+                                                  step + 0.2])
+            with pytest.raises(IndexError):
+                reader.column('values', 3)
+            # Release the views before the file is closed.
+            del values
+
+    def test_not_history(self, tmpdir):
+        path = tmpdir.join('other.bin')
+        path.write_binary(b'\0' * 128)
+        with pytest.raises(ValueError):
+            HistoryReader(str(path))
+
+    def test_as_array(self, tmpdir):
+        numpy = pytest.importorskip('numpy')
+        path = str(tmpdir.join('run.history'))
+        with HistoryWriter(path, 4, 2, 3) as writer:
+            writer.append(numpy.arange(6.0), numpy.zeros((2, 3)), [1, 2],
+                          [1, 2], [0.0] * 6, 1.0, [0.0, 1.0, 2.0])
+        with HistoryReader(path) as reader:
+            positions = reader.as_array('positions')
+            assert positions.shape == (1, 2, 3)
+            assert positions[0, 1].tolist() == [3.0, 4.0, 5.0]
+            assert reader.as_array('global_best_value').tolist() == [1.0]
+            del positions
@@ -0,0 +1,118 @@
+"""Test py_opt_collection.jit module."""
+
+import gc
+import functools
+import weakref
+import pytest
+from py_opt_collection import jit
+from py_opt_collection.optimization import Optimization
+from py_opt_collection.pso import PSO
+from py_opt_collection.test_functions import himmelblau, \
+    rosenbrock_function
+
+
+def test_backend():
+    """The numba backend gives the same kind of results as the Python one,
+    and falls back silently when it can not be used."""
+    for update_mode in ['asynchronous', 'synchronous']:
+        pso = PSO(optimization_object=himmelblau()['optimization'],
+                  no_particles=20,
+                  no_iteration_steps=50,
+                  inertia=0.7,
+                  update_mode=update_mode,
+                  backend='numba')
+        value, position = pso.solve()
+        assert value <= 1e-3
+        assert pso.kernel is None
+        assert pso.particles[0].value is not None
+        assert pso.optimization_object.func(position) == \
+            pytest.approx(value)
+
+    with pytest.raises(ValueError):
+        PSO(optimization_object=himmelblau()['optimization'],
+            backend='cuda')
+
+
+def test_create_kernel():
+    """Only supported configurations get a kernel."""
+    optimization = himmelblau()['optimization']
+    assert jit.create_kernel(PSO(optimization_object=optimization)) is None
+    constrained = himmelblau()['optimization']
+    constrained.add_constraint(lambda x: x[0] > 0)
+    for pso in [PSO(optimization_object=constrained, backend='numba'),
+                PSO(optimization_object=optimization, backend='numba',
+                    topology='ring'),
+                PSO(optimization_object=optimization, backend='numba',
+                    historical=True),
+                PSO(optimization_object=optimization, backend='numba',
+                    update_mode='steady_state')]:
+        pso.neighborhoods = pso.topology.connect(pso.no_particles,
+                                                 pso.random_generator)
+        assert jit.create_kernel(pso) is None
+
+
+def test_kernel():
+    pytest.importorskip('numba')
+    assert jit.is_available()
+    optimization = Optimization(
+        optimizing_function='(1 - x0) ** 2 + 100 * (x1 - x0 ** 2) ** 2',
+        boundaries=[(-3, 3), (-3, 3)],
+        no_dimensions=2,
+        seed=11
+    )
+    pso = PSO(optimization_object=optimization,
+              no_particles=30,
+              no_iteration_steps=2,
+              inertia=0.7,
+              velocity_clamp=0.2,
+              update_mode='synchronous',
+              backend='numba')
+    pso.solve()
+    pso.no_iteration_steps = 100
+    pso._spawn_particles()
+    kernel = jit.create_kernel(pso)
+    assert kernel is not None
+    no_improved = kernel.step(pso)
+    assert 0 <= no_improved <= 30
+    assert pso.best[0] == kernel.best_value[0]
+    assert all(abs(v) <= 0.2 * 6 for v in kernel.velocities.ravel())
+    assert all(-3 <= x <= 3 for x in kernel.positions.ravel())
+
+    value, position = pso.solve()
+    assert value <= 1e-4
+    assert jit.compile_objective(rosenbrock_function) is not None
+    assert jit.compile_objective(lambda x: {}[x]) is None
+    # Objectives are compiled without being called, and must return a
+    # number.
+    assert jit.compile_objective(lambda x: 1.0 / x[0]) is not None
+    assert jit.compile_objective(lambda x: x) is None
+
+    # Other callables than functions are not compiled, the Python
+    # implementation is used.
+    objective = functools.partial(lambda x, y: (x[0] - y) ** 2, y=1.0)
+    assert jit.compile_objective(objective) is None
+    pso = PSO(optimization_object=Optimization(
+        optimizing_function=objective,
+        boundaries=[(-3, 3)],
+        no_dimensions=1
+    ), no_iteration_steps=20, update_mode='synchronous', backend='numba')
+    value, _position = pso.solve()
+    assert value <= 1e-3
+    assert pso.kernel is None
+
+
+def test_cache():
+    """The compiled objectives do not keep the objectives alive."""
+    pytest.importorskip('numba')
+    numpy = pytest.importorskip('numpy')
+
+    def objective(x):
+        return x[0] ** 2
+
+    compiled = jit.compile_objective(objective)
+    assert jit.compile_objective(objective) is compiled
+    reference = weakref.ref(objective)
+    del objective
+    gc.collect()
+    assert reference() is None
+    assert compiled(numpy.array([3.0])) == 9.0
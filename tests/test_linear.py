@@ -0,0 +1,81 @@
+"""Test py_opt_collection.linear 's classes."""
+
+import pytest
+from random import Random
+from py_opt_collection.linear import LinearConstraints
+
+
+class TestLinearConstraints(object):
+    """Tests for py_opt_collection.linear.LinearConstraints class."""
+
+    def test_add(self):
+        constraints = LinearConstraints(2)
+        constraints.add(a_ub=[[1, 1], [0, 1]], b_ub=[1, 2])
+        constraints.add(a_eq=[[1, -1]], b_eq=[0])
+        assert len(constraints) == 3
+        assert constraints.a_ub == [[1.0, 1.0], [0.0, 1.0]]
+        assert constraints.b_eq == [0.0]
+        with pytest.raises(ValueError):
+            constraints.add(a_ub=[[1, 1]], b_ub=[1, 2])
+        with pytest.raises(ValueError):
+            constraints.add(a_ub=[[1, 1, 1]], b_ub=[1])
+        with pytest.raises(ValueError):
+            constraints.add(a_eq=[[1, 1]])
+
+    def test_check_batch(self):
+        constraints = LinearConstraints(2)
+        constraints.add(a_ub=[[1, 1]], b_ub=[1], a_eq=[[1, -1]], b_eq=[0])
+        assert constraints.check_batch(
+            [[0.5, 0.5], [0.2, 0.2], [0.6, 0.6], [0.1, 0.2]]
+        ) == [True, True, False, False]
+        assert constraints.check([0.5, 0.5 + 1e-12])
+
+        # Same results with or without NumPy.
+        constraints.add(a_ub=[[-1, 2]], b_ub=[0.4])
+        random_generator = Random(3)
+        positions = [[random_generator.choice([0.1, 0.2, 0.4, 0.6]),
+                      random_generator.choice([0.1, 0.2, 0.4])]
+                     for _i in range(30)]
+        assert constraints.check_batch(positions) == \
+            [constraints.check(position) for position in positions]
+        assert constraints.check_batch([]) == []
+        assert LinearConstraints(2).check_batch([[1, 2], [3, 4]]) == \
+            [True, True]
+
+    def test_project(self):
+        boundaries = [(0, 3), (0, 3)]
+        constraints = LinearConstraints(2)
+        constraints.add(a_ub=[[1, 1]], b_ub=[1])
+        position = constraints.project([2.0, 2.0], boundaries)
+        assert position == pytest.approx([0.5, 0.5])
+        # Dykstra's projection onto the intersection, not a feasible point
+        # of the last projected set.
+        position = constraints.project([3.0, -1.0], boundaries)
+        assert position == pytest.approx([1.0, 0.0])
+        assert constraints.project([0.2, 0.3], boundaries) == [0.2, 0.3]
+
+        constraints.add(a_eq=[[1, -2]], b_eq=[0])
+        position = constraints.project([3.0, 0.0], boundaries)
+        assert constraints.check(position)
+        assert position == pytest.approx([2 / 3.0, 1 / 3.0], abs=1e-6)
+
+    def test_sample(self):
+        boundaries = [(0, 10), (0, 10), (0, 10)]
+        constraints = LinearConstraints(3)
+        constraints.add(a_ub=[[1, 1, 0]], b_ub=[4],
+                        a_eq=[[1, 1, 1]], b_eq=[6])
+        random_generator = Random(7)
+        samples = [constraints.sample(random_generator, boundaries)
+                   for _i in range(50)]
+        for position in samples:
+            assert constraints.check(position)
+            assert all(0 <= x <= 10 for x in position)
+        # The samples spread over the polytope.
+        assert min(position[2] for position in samples) < 2.5
+        assert max(position[2] for position in samples) > 4.5
+
+        # Without feasible position, the best projection is returned.
+        constraints.add(a_ub=[[0, 0, 1]], b_ub=[-1])
+        position = constraints.sample(random_generator, boundaries)
+        assert not constraints.check(position)
+        assert all(0 <= x <= 10 for x in position)
@@ -0,0 +1,89 @@
+"""Test py_opt_collection.local_search 's classes and functions."""
+
+import pytest
+from py_opt_collection.local_search import LocalSearch, NelderMead, \
+    PatternSearch, LBFGSB, get_local_search
+from py_opt_collection.optimization import Optimization
+
+
+def fix_sphere_optimization(find_max=False):
+    """Sphere centered on (2, 2), but x is bounded in [-1, 1] and x + y
+    must be lesser/equal than 2."""
+    sign = -1 if find_max else 1
+    optimization = Optimization(
+        optimizing_function=lambda x:
+        sign * ((x[0] - 2) ** 2 + (x[1] - 2) ** 2),
+        boundaries=[(-1.0, 1.0), (-3.0, 3.0)],
+        no_dimensions=2,
+        find_max=find_max
+    )
+    optimization.add_constraint(lambda x: x[0] + x[1] <= 2)
+    return optimization
+
+
+class TestLocalSearch(object):
+    """Tests for the local searches."""
+
+    def test_rosenbrock(self):
+        optimization = Optimization(
+            optimizing_function=lambda x:
+            (1 - x[0]) ** 2 + 100 * (x[1] - x[0] ** 2) ** 2,
+            boundaries=[(-3.0, 3.0), (-3.0, 3.0)],
+            no_dimensions=2
+        )
+        value, position = NelderMead().refine(optimization, [0.5, 0.3])
+        assert value < 1e-12
+        assert position == pytest.approx([1.0, 1.0], abs=1e-5)
+
+        value, position = PatternSearch(max_evaluations=1000).refine(
+            optimization, [0.5, 0.3]
+        )
+        assert value < optimization.func([0.5, 0.3])
+
+    def test_bounds_and_constraints(self):
+        for find_max in [False, True]:
+            optimization = fix_sphere_optimization(find_max)
+            for local_search in [NelderMead(), PatternSearch()]:
+                value, position = local_search.refine(optimization,
+                                                      [-0.5, 0.0])
+                assert -1.0 <= position[0] <= 1.0
+                assert optimization.check_constraints(position)
+                assert abs(value) < abs(optimization.func([-0.5, 0.0]))
+
+            # The optimum is on both the boundary and the constraint.
+            value, position = NelderMead().refine(optimization, [-0.5, 0.0])
+            assert position == pytest.approx([1.0, 1.0], abs=1e-3)
+            assert abs(value) == pytest.approx(2.0, abs=1e-5)
+
+    def test_max_evaluations(self):
+        optimization = fix_sphere_optimization()
+        calls = list()
+        func = optimization.func
+        optimization.func = lambda x: calls.append(x) or func(x)
+        NelderMead(max_evaluations=20).refine(optimization, [-0.5, 0.0])
+        assert len(calls) <= 20
+
+    def test_lbfgsb(self):
+        try:
+            import scipy  # noqa: F401 pylint: disable=unused-import
+        except ImportError:
+            with pytest.raises(ImportError):
+                LBFGSB()
+            return
+        optimization = fix_sphere_optimization()
+        value, position = LBFGSB().refine(optimization, [-0.5, 0.0])
+        assert -1.0 <= position[0] <= 1.0
+        assert optimization.check_constraints(position)
+        assert value < optimization.func([-0.5, 0.0])
+
+    def test_get_local_search(self):
+        assert isinstance(get_local_search('nelder_mead'), NelderMead)
+        assert isinstance(get_local_search('pattern_search'), PatternSearch)
+        local_search = NelderMead(tolerance=1e-6)
+        assert get_local_search(local_search) is local_search
+        assert get_local_search(None) is None
+        with pytest.raises(ValueError):
+            get_local_search('newton')
+        # The base class has no search.
+        with pytest.raises(TypeError):
+            LocalSearch()
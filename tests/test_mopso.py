@@ -0,0 +1,64 @@
+"""Test py_opt_collection.mopso 's classes."""
+
+import pytest
+from py_opt_collection.mopso import MOPSO
+from py_opt_collection.optimization import Optimization
+from py_opt_collection.utils import dominates
+
+
+def fix_schaffer_optimization(find_max=False):
+    """Schaffer's function N. 1: f_1 = x^2, f_2 = (x - 2)^2, its Pareto
+    front is x in [0, 2]. With find_max, the first objective is negated and
+    maximized."""
+    sign = -1 if find_max else 1
+    return Optimization(
+        optimizing_function=lambda x: (sign * x[0] ** 2, (x[0] - 2) ** 2),
+        boundaries=[(-10.0, 10.0)],
+        no_dimensions=1,
+        find_max=[True, False] if find_max else False,
+        seed=2018
+    )
+
+
+class TestMOPSO(object):
+    """Tests for py_opt_collection.mopso.MOPSO class."""
+
+    def test___init__(self):
+        optimization = fix_schaffer_optimization()
+        mopso = MOPSO(optimization_object=optimization,
+                      no_particles=20,
+                      no_iteration_steps=30,
+                      c_1=1.5,
+                      c_2=0.5,
+                      archive_size=40)
+        assert mopso.no_particles == 20
+        assert mopso.no_iteration_steps == 30
+        assert mopso.learning_factors == (1.5, 0.5)
+        assert mopso.archive_size == 40
+
+        optimization.enable_archive()
+        with pytest.raises(ValueError):
+            MOPSO(optimization_object=optimization)
+
+    def test_solve(self, capsys):
+        for find_max in [False, True]:
+            optimization = fix_schaffer_optimization(find_max)
+            mopso = MOPSO(optimization_object=optimization,
+                          no_iteration_steps=40,
+                          archive_size=30,
+                          historical=True,
+                          verbose=True)
+            front = mopso.solve()
+            assert 10 <= len(front) <= 30
+            assert len(mopso.snapshots) == 40
+            for values, position in front:
+                assert -1e-3 <= position[0] <= 2 + 1e-3
+                assert values == optimization.func(position)
+                for other, _position in front:
+                    assert not dominates(other, values,
+                                         optimization.find_max)
+            positions = sorted(position[0] for _values, position in front)
+            assert positions[0] < 0.1 and positions[-1] > 1.9
+        out, err = capsys.readouterr()
+        for i in range(40):
+            assert out.find("Iteration step #%d" % i) > -1
@@ -48,6 +48,15 @@ class TestOptimization(object):
         rand_val_6 = opt_object_custom_seed_2.random_generator.random()
 
         assert rand_val_3 == rand_val_5 and rand_val_4 == rand_val_6
+        assert opt_object_custom_seed_1.seed == 235918
+
+        # Without a seed, each object draws its own and keeps it.
+        opt_object_2 = Optimization(**fix_optimization_object_kwargs)
+        assert opt_object.seed != opt_object_2.seed
+        opt_object_3 = Optimization(seed=opt_object_2.seed,
+                                    **fix_optimization_object_kwargs)
+        assert opt_object_2.random_generator.random() == \
+            opt_object_3.random_generator.random()
 
     def test_add_constraints(self,
                              fix_optimization_object_kwargs,
@@ -90,6 +99,154 @@ class TestOptimization(object):
         assert opt_object.check_constraints([-1.8])
         assert opt_object.check_constraints([0.9])
 
+    def test_linear_constraints(self, fix_optimization_object_kwargs):
+        """Test add_linear_constraints() and check_constraints_batch()."""
+
+        opt_object = Optimization(optimizing_function=sum,
+                                  boundaries=[(0, 5), (0, 5)],
+                                  no_dimensions=2)
+        opt_object.add_constraint(lambda x: x[0] != 1.0)
+        linear_constraints = opt_object.add_linear_constraints(
+            a_ub=[[1, 1]], b_ub=[4]
+        )
+        assert opt_object.add_linear_constraints(
+            a_eq=[[1, -1]], b_eq=[0]
+        ) is linear_constraints
+        assert len(linear_constraints) == 2
+        positions = [[2, 2], [3, 3], [1, 2], [1, 1], [-1, -1]]
+        assert opt_object.check_constraints_batch(positions) == \
+            [opt_object.check_constraints(position)
+             for position in positions] == \
+            [True, False, False, False, False]
+
+    def test_evaluate_batch(self, fix_optimization_object_kwargs):
+        """Test evaluate_batch() with and without batch function."""
+
+        positions = [[-1.0], [0.0], [2.0]]
+        opt_object = Optimization(**fix_optimization_object_kwargs)
+        values = [opt_object.func(p) for p in positions]
+        assert opt_object.evaluate_batch(positions) == values
+        assert opt_object.evaluate_batch(positions, Pool(2)) == values
+
+        opt_object = Optimization(
+            batch_function=lambda xs: [0.0] * len(xs),
+            **fix_optimization_object_kwargs
+        )
+        assert opt_object.evaluate_batch(positions) == [0.0] * 3
+        profiler = opt_object.enable_profiling()
+        opt_object.evaluate_batch(positions)
+        assert profiler.report()['objective_calls']['count'] == 3
+
+    def test_import_archive(self, fix_optimization_object_kwargs):
+        """Test import_archive(), the imported positions are validated
+        again."""
+
+        previous = Optimization(**fix_optimization_object_kwargs)
+        previous.enable_archive()
+        previous.evaluate_batch([[-1.0], [0.5], [2.0], [2.5]])
+
+        opt_object = Optimization(**dict(fix_optimization_object_kwargs,
+                                         boundaries=[(-3, 2.2)]))
+        opt_object.add_constraint(lambda x: x[0] < 1.0)
+        assert opt_object.import_archive(previous.archive) == 3
+        assert opt_object.archive.feasible.tolist() == [1, 1, 0]
+        # Already imported positions are skipped.
+        assert opt_object.import_archive(previous.archive) == 0
+
+        opt_object = Optimization(**fix_optimization_object_kwargs)
+        assert opt_object.import_archive(
+            previous.archive,
+            transform=lambda x: None if x[0] > 0 else [x[0] + 0.5]
+        ) == 1
+        assert opt_object.archive.position(0) == [-0.5]
+        assert opt_object.archive.values[0] == previous.func([-1.0])
+
+    def test_variable_types(self):
+        """Test integer and categorical variables: boundaries, discretize(),
+        decode(), and the evaluations which only see decoded values, once
+        per configuration in a batch."""
+
+        calls = list()
+        opt_object = Optimization(
+            optimizing_function=lambda x: calls.append(x) or x[0] * x[2],
+            boundaries=[(0.5, 5.5), (-1, 1), None],
+            no_dimensions=3,
+            variable_types=['integer', 'continuous', [1.5, 2.5, 10.0]]
+        )
+        opt_object.add_constraint(lambda x: x[2] != 10.0)
+        assert opt_object.boundaries == [(1, 5), (-1, 1), (0, 2)]
+        assert opt_object.discrete_dims == [0, 2]
+        assert opt_object.discretize([2.6, 0.3, 0.4]) == [3, 0.3, 0]
+        assert opt_object.discretize([9.0, 0.3, -4]) == [5, 0.3, 0]
+        assert opt_object.decode([2.6, 0.3, 1.2]) == [3, 0.3, 2.5]
+        assert opt_object.check_constraints([2, 0.3, 1])
+        assert not opt_object.check_constraints([2, 0.3, 2])
+
+        values = opt_object.evaluate_batch(
+            [[2.6, 0.3, 1.2], [3.1, 0.3, 0.9], [2.2, 0.3, 0.0]]
+        )
+        assert values == [7.5, 7.5, 3.0]
+        assert calls == [[3, 0.3, 2.5], [2, 0.3, 1.5]]
+        assert opt_object.evaluate([2.6, 0.3, 1.2]) == 7.5
+
+        continuous = Optimization(optimizing_function=sum,
+                                  boundaries=[(0.5, 5.5)])
+        position = [2.6]
+        assert continuous.discretize(position) is position
+        assert continuous.decode(position) is position
+
+        with pytest.raises(ValueError):
+            Optimization(optimizing_function=sum,
+                         boundaries=[(0, 1), (0, 1)],
+                         no_dimensions=2,
+                         variable_types=['integer'])
+
+    def test_formulas(self):
+        """Test formulas as optimizing function and constraints."""
+
+        opt_object = Optimization(
+            optimizing_function='(1 - x0) ** 2 + 100 * (x1 - x0 ** 2) ** 2',
+            boundaries=[(-3, 3), (-3, 3)],
+            no_dimensions=2
+        )
+        opt_object.add_constraint('x0 + x1 <= 1')
+        assert opt_object.evaluate([1, 1]) == 0
+        assert opt_object.evaluate([0, 1]) == 101
+        assert not opt_object.check_constraints([1, 1])
+        assert opt_object.check_constraints([0, 1])
+        if opt_object.func.vectorized:
+            assert opt_object.batch_func == opt_object.func.evaluate_batch
+        else:
+            assert opt_object.batch_func is None
+        assert opt_object.evaluate_batch([[1, 1], [0, 1]]) == [0, 101]
+        assert repr(opt_object).find('100 * (x1 - x0 ** 2)') != -1
+
+    def test_bind(self):
+        """Test bind(): the instance's functions receive its parameters,
+        it has its own archive, the template is left unchanged."""
+
+        def func(x, parameters):
+            return (x[0] - parameters['target']) ** 2
+
+        template = Optimization(
+            optimizing_function=func,
+            batch_function=lambda xs, ps: [func(x, p)
+                                           for x, p in zip(xs, ps)],
+            boundaries=[(-3, 3)]
+        )
+        template.add_constraint(lambda x, params: x[0] <= params['cap'])
+        template.enable_archive()
+        instance = template.bind({'target': 1.0, 'cap': 2.0})
+        assert instance.parameters == {'target': 1.0, 'cap': 2.0}
+        assert template.parameters is None
+        assert instance.evaluate([3.0]) == 4.0
+        assert instance.evaluate_batch([[0.0], [1.0]]) == [1.0, 0.0]
+        assert instance.check_constraints([1.5])
+        assert not instance.check_constraints([2.5])
+        assert len(instance.archive) == 3
+        assert len(template.archive) == 0
+        assert template.func is func
+
     def test___repr__(self,
                       fix_optimization_object_kwargs,
                       fix_optimization_constraint_1):
@@ -97,10 +254,18 @@ class TestOptimization(object):
 
         opt_object = Optimization(**fix_optimization_object_kwargs)
         opt_object.add_constraint(fix_optimization_constraint_1)
+        opt_object.add_linear_constraints(a_ub=[[1]], b_ub=[2])
+        opt_object.enable_profiling()
         print_string = opt_object.__repr__()
-        print_string.find("x[0] ** 4 + x[0] ** 3 - 3 * (x[0] ** 2) + 1")
-        print_string.find("x0: (-3, 3)")
-        print_string.find("x[0]**4 + x[0]**3 - 2*(x[0] ** 2) + 2 >= 0")
+        assert print_string.find(
+            fix_optimization_object_kwargs['optimizing_function'].__qualname__
+        ) != -1
+        assert print_string.find("x0: (-3, 3)") != -1
+        assert print_string.find(
+            fix_optimization_constraint_1.__qualname__
+        ) != -1
+        assert print_string.find("1 linear constraints") != -1
+        assert repr(opt_object.bind(2.5)).find("bound to 2.5") != -1
 
 
 class TestOptimizationMixin(object):
@@ -170,6 +335,29 @@ class TestAlgorithmObject(object):
         assert isinstance(result, tuple)
         assert isinstance(result[0], float)
         assert isinstance(result[1], list)
+        assert algorithm_obj.stop_reason == 'max_iterations'
+
+    def test_iter_solve(self, fix_optimization_object):
+        algorithm_obj = AlgorithmObject(fix_optimization_object,
+                                        no_iteration_steps=3)
+        results = list(algorithm_obj.iter_solve())
+        assert len(results) == 3
+        assert algorithm_obj.stop_reason == 'max_iterations'
+
+        steps = algorithm_obj.iter_solve()
+        next(steps)
+        steps.close()
+        assert algorithm_obj.stop_reason == 'interrupted'
+
+        for _i in range(3):
+            algorithm_obj.step()
+        assert algorithm_obj.stop_reason == 'max_iterations'
+        algorithm_obj.step()
+        assert algorithm_obj.stop_reason is None
+
+        algorithm_obj.solve(time_budget=0)
+        assert algorithm_obj.current_iteration_step == 1
+        assert algorithm_obj.stop_reason == 'time_budget'
 
 
 class TestMultipleSolving(object):
@@ -190,6 +378,11 @@ class TestMultipleSolving(object):
         ms = MultipleSolving(fix_algorithm_object, 20)
         ms.run()
         assert ms.is_run
+        assert len(ms.trials) == 20
+        assert len(set(trial['seed'] for trial in ms.trials)) == 20
+        assert ms.trials[0]['stop_reason'] == 'max_iterations'
+        assert sorted(trial['value'] for trial in ms.trials) == \
+            ms.results_value_only
         assert not (
                 fix_algorithm_object.find_max !=
                 (ms.results_value_only[0] > ms.results_value_only[-1])
@@ -205,6 +398,11 @@ class TestMultipleSolving(object):
                 (ms.results_value_only[0] > ms.results_value_only[-1])
         )
 
+    def test_run_batched(self, fix_algorithm_object):
+        ms = MultipleSolving(fix_algorithm_object, 20)
+        with pytest.raises(ValueError):
+            ms.run(batched=True)
+
     def test_best_result(self, fix_algorithm_object):
         ms = MultipleSolving(fix_algorithm_object, 20)
         with pytest.raises(AttributeError):
@@ -0,0 +1,86 @@
+"""Test py_opt_collection.pareto 's classes."""
+
+from random import Random
+from py_opt_collection.pareto import ParetoArchive
+from py_opt_collection.utils import dominates
+
+
+def brute_force_front(points, find_max):
+    """Non-dominated and distinct values of points, by pairwise scans."""
+    ret = set()
+    for values in points:
+        if not any(dominates(other, values, find_max) for other in points):
+            ret.add(values)
+    return ret
+
+
+class TestParetoArchive(object):
+    """Tests for py_opt_collection.pareto.ParetoArchive class."""
+
+    def test___init__(self):
+        archive = ParetoArchive([True, False], capacity=20)
+        assert archive.find_max == [True, False]
+        assert archive.capacity == 20
+        assert len(archive) == 0
+        assert archive.front == []
+
+    def test_add(self):
+        archive = ParetoArchive(False)
+        assert archive.add((2, 2), [0])
+        assert not archive.add((2, 2), [1])
+        assert not archive.add((3, 2), [2])
+        assert archive.add((1, 3), [3])
+        assert archive.add((3, 1), [4])
+        assert archive.front == [((1, 3), [3]), ((2, 2), [0]), ((3, 1), [4])]
+        # Dominates the two last positions.
+        assert archive.add((2, 1), [5])
+        assert archive.front == [((1, 3), [3]), ((2, 1), [5])]
+
+    def test_add_random(self):
+        random_generator = Random(2018)
+        for find_max in [False, [True, False], [False, True, False]]:
+            no_objectives = 2 if isinstance(find_max, bool) \
+                else len(find_max)
+            archive = ParetoArchive(find_max, capacity=1000)
+            points = list()
+            for i in range(300):
+                values = tuple(random_generator.randint(0, 50)
+                               for _j in range(no_objectives))
+                points.append(values)
+                archive.add(values, [i])
+            assert set(archive.values) == brute_force_front(points,
+                                                            find_max)
+            assert len(archive.values) == len(set(archive.values))
+
+    def test_pruning(self):
+        archive = ParetoArchive(False, capacity=5)
+        for i in range(11):
+            archive.add((i / 10.0, 1 - i / 10.0), [i])
+        assert len(archive) == 5
+        # The extremes are never pruned.
+        assert archive.values[0] == (0.0, 1.0)
+        assert archive.values[-1] == (1.0, 0.0)
+        keys = [values[0] for values in archive.values]
+        assert keys == sorted(keys)
+
+    def test_crowding_distances(self):
+        archive = ParetoArchive(False)
+        for values in [(0, 4), (1, 3), (3, 1), (4, 0)]:
+            archive.add(values, [0])
+        distances = archive.crowding_distances()
+        assert distances[0] == distances[-1] == float('inf')
+        assert distances[1] == distances[2] == 1.5
+
+        archive = ParetoArchive(False)
+        for values in [(0, 4, 1), (1, 3, 2), (4, 0, 0)]:
+            archive.add(values, [0])
+        assert archive.crowding_distances()[1] == float('inf')
+
+    def test_select(self):
+        archive = ParetoArchive(False)
+        for i in range(10):
+            archive.add((i, 9 - i), [i])
+        random_generator = Random(2018)
+        for _i in range(20):
+            values, position = archive.select(random_generator)
+            assert (values, position) in archive.front
@@ -0,0 +1,78 @@
+"""Test py_opt_collection.profiling module."""
+
+from copy import deepcopy
+from py_opt_collection.profiling import Profiler, OBJECTIVE_CALLS, \
+    CONSTRAINT_CALLS, REPAIR_RETRIES, BEST_UPDATES, SNAPSHOTS
+from py_opt_collection.pso import PSO
+
+
+class TestProfiler(object):
+    """Tests for py_opt_collection.profiling.Profiler class."""
+
+    def test_count_and_report(self):
+        profiler = Profiler()
+        profiler.count('a')
+        profiler.count('a', 2)
+        with profiler.measure('b'):
+            pass
+        report = profiler.report()
+        assert report['a']['count'] == 3
+        assert report['a']['total_time'] is None
+        assert report['b']['count'] == 1
+        assert report['b']['total_time'] >= 0.0
+        profiler.reset()
+        assert profiler.report() == dict()
+
+    def test_wrap(self):
+        profiler = Profiler()
+        func = profiler.wrap('calls', lambda x: x * 2)
+        assert func(2) == 4
+        assert func(3) == 6
+        assert profiler.report()['calls']['count'] == 2
+
+    def test_to_openmetrics(self):
+        profiler = Profiler()
+        profiler.count(REPAIR_RETRIES, 4)
+        profiler.add_time(OBJECTIVE_CALLS, 0.5)
+        text = profiler.to_openmetrics(prefix='pso')
+        assert '# TYPE pso_repair_retries counter' in text
+        assert 'pso_repair_retries_total 4' in text
+        assert 'pso_objective_calls_seconds_total 0.5' in text
+        assert text.endswith('# EOF\n')
+
+    def test_deepcopy(self):
+        profiler = Profiler()
+        assert deepcopy(profiler) is profiler
+
+
+class TestProfiling(object):
+    """Tests for the profiling of Optimization and AlgorithmObject."""
+
+    def test_enable_disable(self, fix_optimization_object):
+        ori_func = fix_optimization_object.func
+        profiler = fix_optimization_object.enable_profiling()
+        assert fix_optimization_object.enable_profiling() is profiler
+        fix_optimization_object.func([0.5])
+        fix_optimization_object.check_constraints([0.5])
+        assert profiler.report()[OBJECTIVE_CALLS]['count'] == 1
+        assert profiler.report()[CONSTRAINT_CALLS]['count'] == 2
+
+        fix_optimization_object.disable_profiling()
+        assert fix_optimization_object.profiler is None
+        assert fix_optimization_object.func == ori_func
+        fix_optimization_object.check_constraints([0.5])
+        assert profiler.report()[CONSTRAINT_CALLS]['count'] == 2
+
+    def test_pso(self, fix_optimization_object):
+        fix_optimization_object.random_generator.seed(1234)
+        pso = PSO(optimization_object=fix_optimization_object,
+                  no_particles=10,
+                  no_iteration_steps=20,
+                  historical=True,
+                  profiling=True)
+        pso.solve()
+        report = pso.profiler.report()
+        assert report[OBJECTIVE_CALLS]['count'] == 10 * 20
+        assert report[CONSTRAINT_CALLS]['count'] >= 10 * 20
+        assert report[BEST_UPDATES]['count'] >= 1
+        assert report[SNAPSHOTS]['count'] == 20
@@ -1,9 +1,57 @@
 """Test py_opt_collection.pso 's classes."""
 
+import time
+import pytest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from copy import copy
+from multiprocessing.dummy import Pool
+from py_opt_collection.history import HistoryReader
+from py_opt_collection.optimization import Optimization, MultipleSolving
 from py_opt_collection.pso import \
-    Particle, PSO
+    VelocityRule, Particle, PSO, _default_executor
 from py_opt_collection.test_functions import \
-    HIMMELBLAU, ROSENBROCK
+    HIMMELBLAU, ROSENBROCK, rosenbrock_function
+
+
+class TestVelocityRule(object):
+    """Tests for py_opt_collection.pso.VelocityRule class."""
+
+    def test_original_rule(self):
+        rule = VelocityRule((2.0, 1.0), [(-1, 1), (-1, 1)])
+        velocity = rule.apply([0.5, -0.5], [0.0, 0.0],
+                              [1.0, 1.0], [-1.0, 2.0], 0.5, 0.25)
+        assert velocity == [0.5 + 1.0 - 0.25, -0.5 + 1.0 + 0.5]
+
+    def test_inertia(self):
+        rule = VelocityRule((2.0, 2.0), [(-1, 1)], inertia=0.5)
+        assert rule.apply([1.0], [0.0], [0.0], [0.0], 1.0, 1.0) == [0.5]
+
+        rule = VelocityRule((2.0, 2.0), [(-1, 1)], inertia=(0.9, 0.4))
+        assert rule.weight == 0.9
+        rule.step(0.5, 0.0)
+        assert abs(rule.weight - 0.65) < 1e-12
+        rule.reset()
+        assert rule.weight == 0.9
+
+        rule = VelocityRule((2.0, 2.0), [(-1, 1)], inertia='adaptive',
+                            inertia_range=(0.2, 1.0))
+        rule.step(0.5, 0.5)
+        assert abs(rule.weight - 0.6) < 1e-12
+
+        with pytest.raises(ValueError):
+            VelocityRule((2.0, 2.0), [(-1, 1)], inertia='unknown')
+
+    def test_constriction(self):
+        rule = VelocityRule((2.05, 2.05), [(-1, 1)], constriction=True)
+        assert abs(rule.constriction_factor - 0.729843788) < 1e-8
+        with pytest.raises(ValueError):
+            VelocityRule((2.0, 2.0), [(-1, 1)], constriction=True)
+
+    def test_velocity_clamp(self):
+        rule = VelocityRule((2.0, 2.0), [(-1, 1), (0, 10)],
+                            velocity_clamp=0.5)
+        assert rule.clamp([3.0, -3.0]) == [1.0, -3.0]
+        assert rule.clamp([3.0, -6.0]) == [1.0, -5.0]
 
 
 class TestParticle(object):
@@ -96,6 +144,453 @@ class TestPSO(object):
         for i in range(20):
             assert out.find("Iteration step #%d" % i) > -1
 
+    def test_velocity_variants(self, fix_optimization_object):
+        for kwargs in [{'inertia': (0.9, 0.4), 'velocity_clamp': 0.2},
+                       {'inertia': 'adaptive'},
+                       {'c_1': 2.05, 'c_2': 2.05, 'constriction': True}]:
+            fix_optimization_object.random_generator.seed(2018)
+            pso = PSO(optimization_object=fix_optimization_object,
+                      no_particles=20,
+                      no_iteration_steps=50,
+                      **kwargs)
+            result = pso.solve()
+            assert fix_optimization_object.check_constraints(result[1])
+            assert result[0] <= -4.0
+
+    def test_update_modes(self, fix_optimization_object):
+        results = list()
+        for update_mode in ['asynchronous', 'synchronous',
+                            'synchronous', 'asynchronous']:
+            fix_optimization_object.random_generator.seed(2018)
+            pso = PSO(optimization_object=fix_optimization_object,
+                      no_particles=20,
+                      no_iteration_steps=30,
+                      inertia=0.7,
+                      update_mode=update_mode)
+            results.append(pso.solve())
+            assert fix_optimization_object.check_constraints(pso.best[1])
+            assert pso.best[0] <= -4.0
+        # Deterministic given a seed.
+        assert results[0] == results[3]
+        assert results[1] == results[2]
+
+        with pytest.raises(ValueError):
+            PSO(optimization_object=fix_optimization_object,
+                update_mode='unknown')
+
+    def test_synchronous_batch(self, fix_optimization_object_kwargs):
+        batch_sizes = list()
+        func = fix_optimization_object_kwargs['optimizing_function']
+
+        def batch_function(positions):
+            batch_sizes.append(len(positions))
+            return [func(position) for position in positions]
+
+        opt_object = Optimization(batch_function=batch_function,
+                                  seed=2018,
+                                  **fix_optimization_object_kwargs)
+        pso = PSO(optimization_object=opt_object,
+                  no_particles=15,
+                  no_iteration_steps=10,
+                  update_mode='synchronous',
+                  topology='ring')
+        pso.solve()
+        assert batch_sizes == [15] * 10
+
+        opt_object = Optimization(seed=2018,
+                                  **fix_optimization_object_kwargs)
+        pso = PSO(optimization_object=opt_object,
+                  no_particles=15,
+                  no_iteration_steps=10,
+                  update_mode='synchronous',
+                  pool=Pool(2))
+        assert pso.solve()[0] <= -4.0
+
+    def test_steady_state(self, fix_optimization_object):
+        calls = list()
+        func = fix_optimization_object.func
+
+        def slow_function(x):
+            # Skewed runtime: positions on the left are slower.
+            time.sleep(0.002 if x[0] < 0 else 0.0)
+            calls.append(x)
+            return func(x)
+
+        fix_optimization_object.func = slow_function
+        fix_optimization_object.random_generator.seed(2018)
+        pso = PSO(optimization_object=fix_optimization_object,
+                  no_particles=10,
+                  no_iteration_steps=20,
+                  update_mode='steady_state',
+                  historical=True,
+                  pool=ThreadPoolExecutor(4))
+        result = pso.solve()
+        assert len(calls) == 10 * 20
+        assert len(pso.snapshots) == 20
+        assert fix_optimization_object.check_constraints(result[1])
+        assert result[0] <= -4.0
+
+        pso = PSO(optimization_object=fix_optimization_object,
+                  no_particles=10,
+                  no_iteration_steps=5,
+                  update_mode='steady_state',
+                  topology='ring')
+        pso.solve()
+        assert len(calls) == 10 * 20 + 10 * 5
+
+        # Without pool, picklable functions are evaluated in processes.
+        assert isinstance(_default_executor(slow_function),
+                          ThreadPoolExecutor)
+        executor = _default_executor(rosenbrock_function)
+        assert isinstance(executor, ProcessPoolExecutor)
+        executor.shutdown()
+        optimization = Optimization(optimizing_function=rosenbrock_function,
+                                    boundaries=[(-3, 3), (-3, 3)],
+                                    no_dimensions=2)
+        value, position = PSO(optimization_object=optimization,
+                              no_particles=10,
+                              no_iteration_steps=20,
+                              inertia=0.7,
+                              update_mode='steady_state').solve()
+        assert value == rosenbrock_function(position)
+
+    def test_local_search(self):
+        optimization = ROSENBROCK['optimization']
+        optimization.random_generator.seed(2018)
+        pso = PSO(optimization_object=optimization,
+                  no_particles=20,
+                  no_iteration_steps=100,
+                  inertia=(0.9, 0.4),
+                  local_search='nelder_mead',
+                  stall_iterations=5)
+        result = pso.solve()
+        assert pso.no_refinements >= 1
+        assert result[0] < 1e-15
+        assert result[0] == optimization.func(result[1])
+        assert min(particle.best[0] for particle in pso.particles) == \
+            result[0]
+
+        with pytest.raises(ValueError):
+            PSO(optimization_object=optimization,
+                local_search='nelder_mead',
+                update_mode='steady_state')
+
+    def test_variable_types(self):
+        calls = list()
+        algorithms = list()
+
+        def function(x):
+            calls.append((algorithms[-1].current_iteration_step, tuple(x)))
+            return (x[0] - 7) ** 2 + (x[1] - 2) ** 2 + \
+                {'low': 3.0, 'mid': 0.0, 'high': 1.0}[x[2]]
+
+        optimization = Optimization(
+            optimizing_function=function,
+            boundaries=[(-20, 20), (-5.5, 5.5), None],
+            no_dimensions=3,
+            variable_types=['integer', 'integer', ['low', 'mid', 'high']],
+            seed=2018
+        )
+        for update_mode in ['asynchronous', 'synchronous']:
+            pso = PSO(optimization_object=optimization,
+                      no_particles=20,
+                      no_iteration_steps=30,
+                      inertia=0.7,
+                      update_mode=update_mode,
+                      historical=True)
+            algorithms.append(pso)
+            calls[:] = []
+            result = pso.solve()
+            assert result[0] <= 1.0
+            assert result[1][:2] == [7, 2]
+            for particles, _best in pso.snapshots:
+                for particle in particles:
+                    assert isinstance(particle.position[0], int)
+                    assert particle.position[2] in [0, 1, 2]
+            # Each configuration is evaluated at most once per step.
+            assert len(calls) == len(set(calls))
+            assert len(calls) < 20 * 30
+
+    def test_restarts(self, fix_optimization_object):
+        fix_optimization_object.random_generator.seed(2018)
+        archive = fix_optimization_object.enable_archive()
+        for update_mode in ['asynchronous', 'synchronous']:
+            pso = PSO(optimization_object=fix_optimization_object,
+                      no_particles=5,
+                      no_iteration_steps=60,
+                      inertia=0.7,
+                      update_mode=update_mode,
+                      restart_after=3,
+                      stall_tolerance=1e-3,
+                      population_growth=2.0,
+                      max_restarts=3,
+                      historical=True)
+            result = pso.solve()
+            assert pso.no_restarts == 3
+            assert len(pso.particles) == 5 * 2 ** 3
+            assert result[0] <= -4.13
+            assert fix_optimization_object.archive is archive
+            # The best is kept across restarts.
+            best_values = [best[0] for _particles, best in pso.snapshots]
+            assert best_values == sorted(best_values, reverse=True)
+            for particle in pso.particles:
+                assert fix_optimization_object.check_constraints(
+                    particle.position
+                )
+
+        pso = PSO(optimization_object=fix_optimization_object,
+                  no_particles=10,
+                  no_iteration_steps=1,
+                  restart_after=0,
+                  restart_fraction=0.5,
+                  max_restarts=1)
+        pso.solve()
+        kept = sorted(pso.particles,
+                      key=lambda particle: particle.best[0])[:5]
+        pso._restart_on_stall()
+        pso._restart_on_stall()
+        assert pso.no_restarts == 1
+        assert len(pso.particles) == 10
+        assert all(particle in pso.particles for particle in kept)
+
+        with pytest.raises(ValueError):
+            PSO(optimization_object=fix_optimization_object,
+                restart_after=5,
+                update_mode='steady_state')
+
+    def test_solve_batch(self, fix_optimization_object_kwargs):
+        batches = list()
+        func = fix_optimization_object_kwargs['optimizing_function']
+
+        def batch_function(positions):
+            batches.append(len(positions))
+            return [func(position) for position in positions]
+
+        optimization = Optimization(batch_function=batch_function,
+                                    **fix_optimization_object_kwargs)
+        pso = PSO(optimization_object=optimization,
+                  no_particles=10,
+                  no_iteration_steps=20,
+                  inertia=0.7,
+                  topology='ring')
+        results = pso.solve_batch(8)
+        assert batches == [8 * 10] * 20
+        assert len(results) == 8
+        # Trials have independent random generators.
+        assert len(set(result[0] for result in results)) > 1
+        for value, position in results:
+            assert value == func(position)
+            assert value <= -4.0
+
+        ms = MultipleSolving(pso, 8)
+        ms.run(batched=True)
+        assert ms.is_run
+        assert len(ms.results) == 8
+        assert len(ms.totals_time) == 8
+        assert ms.results_value_only == sorted(ms.results_value_only)
+        assert ms.stat['mean'] <= -4.0
+        assert len(set(trial['seed'] for trial in ms.trials)) == 8
+
+        with pytest.raises(ValueError):
+            PSO(optimization_object=optimization,
+                update_mode='steady_state').solve_batch(2)
+
+    def test_linear_constraints(self):
+        # Production planning: maximize 40 x + 50 y with linear resources.
+        optimization = Optimization(
+            optimizing_function=lambda x: x[0] * 40 + x[1] * 50,
+            boundaries=[(0, 100), (0, 100)],
+            no_dimensions=2,
+            find_max=True,
+            seed=5
+        )
+        optimization.add_linear_constraints(a_ub=[[1, 1], [3, 4], [0, 1]],
+                                            b_ub=[50, 180, 40])
+        profiler = optimization.enable_profiling()
+        for update_mode in ('asynchronous', 'synchronous'):
+            pso = PSO(optimization_object=optimization,
+                      no_particles=10,
+                      no_iteration_steps=30,
+                      inertia=0.7,
+                      update_mode=update_mode)
+            value, position = pso.solve()
+            assert value >= 2290.0
+            assert optimization.check_constraints(position)
+            for particle in pso.particles:
+                assert optimization.check_constraints(particle.position)
+        # Infeasible moves are repaired by projection.
+        assert profiler.report()['projections']['count'] > 0
+        assert 'spawn_rerolls' not in profiler.report()
+
+        # Equalities are kept by the spawns and the repairs.
+        optimization = Optimization(optimizing_function=lambda x: x[0] * x[1],
+                                    boundaries=[(0, 10), (0, 10)],
+                                    no_dimensions=2,
+                                    find_max=True)
+        optimization.add_linear_constraints(a_eq=[[1, 1]], b_eq=[10])
+        pso = PSO(optimization_object=optimization,
+                  no_particles=10,
+                  no_iteration_steps=30,
+                  inertia=0.7)
+        value, position = pso.solve()
+        assert value == pytest.approx(25.0, abs=1e-3)
+        assert sum(position) == pytest.approx(10.0)
+
+        # No integer position satisfies the equality: the spawns give up.
+        optimization = Optimization(optimizing_function=lambda x: x[0] * x[1],
+                                    boundaries=[(0, 10), (0, 10)],
+                                    no_dimensions=2,
+                                    variable_types=['integer', 'integer'])
+        optimization.add_linear_constraints(a_eq=[[2, 2]], b_eq=[9])
+        pso = PSO(optimization_object=optimization, no_particles=2)
+        with pytest.raises(ValueError):
+            pso.solve()
+
+    def test_history_file(self, tmpdir):
+        path = str(tmpdir.join('run.history'))
+        for update_mode in ('asynchronous', 'synchronous', 'steady_state'):
+            pso = PSO(optimization_object=HIMMELBLAU['optimization'],
+                      no_particles=8,
+                      no_iteration_steps=15,
+                      update_mode=update_mode,
+                      history_file=path)
+            best = pso.solve()
+            assert pso.history is None
+            with HistoryReader(path) as reader:
+                assert len(reader) == 15
+                assert reader.no_particles == 8
+                assert reader.column('global_best_value', -1).tolist() == \
+                    [best[0]]
+                assert reader.trajectory(3, 'best_positions')[-1] == \
+                    pso.particles[3].best[1]
+        with pytest.raises(ValueError):
+            PSO(optimization_object=HIMMELBLAU['optimization'],
+                restart_after=5, population_growth=2.0, history_file=path)
+
+    def test_iter_solve(self, tmpdir):
+        def new_pso(seed, **kwargs):
+            kwargs.setdefault('no_iteration_steps', 20)
+            return PSO(optimization_object=Optimization(
+                optimizing_function=ROSENBROCK['optimization'].func,
+                boundaries=[(-3, 3), (-3, 3)],
+                no_dimensions=2,
+                seed=seed
+            ), no_particles=10, **kwargs)
+
+        expected = new_pso(7).solve()
+        # Step-wise solves, interleaved, give the same results.
+        pso_1, pso_2 = new_pso(7), new_pso(7)
+        steps = pso_1.iter_solve()
+        bests = list()
+        for _i in range(20):
+            bests.append(next(steps))
+            assert pso_2.step() == bests[-1]
+        assert pso_2.stop_reason == 'max_iterations'
+        assert pso_1.stop_reason is None
+        assert list(steps) == []
+        assert pso_1.stop_reason == 'max_iterations'
+        assert bests[-1] == expected
+        assert [best[0] for best in bests] == \
+            sorted([best[0] for best in bests], reverse=True)
+
+        # Stopping a solve releases its history file.
+        pso = new_pso(7, history_file=str(tmpdir.join('run.history')))
+        steps = pso.iter_solve()
+        for _i in range(5):
+            next(steps)
+        steps.close()
+        assert pso.stop_reason == 'interrupted'
+        assert pso.history is None
+
+        # A solve paused by step() is stopped, not finished, by solve().
+        for update_mode in ('synchronous', 'steady_state'):
+            pso = new_pso(7, update_mode=update_mode, no_iteration_steps=5000)
+            pso.step()
+            pso.step()
+            started = time.time()
+            pso.solve(time_budget=0.05)
+            assert time.time() - started < 0.5
+            assert pso.stop_reason == 'time_budget'
+
+        pso = new_pso(7, update_mode='steady_state')
+        assert len(list(pso.iter_solve())) == 20
+        pso.solve(time_budget=0)
+        assert pso.stop_reason == 'time_budget'
+        assert pso.current_iteration_step == 1
+        assert pso.best[0] is not None
+
+    def test_warm_start(self):
+        optimization = ROSENBROCK['optimization']
+        cold = PSO(optimization_object=optimization,
+                   no_particles=20,
+                   no_iteration_steps=60)
+        cold.solve()
+
+        # The swarm is spawned at the previous solutions, the best one is
+        # found again without any iteration step.
+        warm = PSO(optimization_object=optimization,
+                   no_particles=20,
+                   no_iteration_steps=1,
+                   warm_start=cold)
+        assert len(warm.warm_start) == 20
+        assert warm.warm_start[0] == cold.best[1]
+        assert warm.solve()[0] <= cold.best[0]
+        assert [particle.position for particle in warm.particles] == \
+            warm.warm_start
+
+        # Positions outside the boundaries are clipped, missing ones are
+        # spawned randomly.
+        warm = PSO(optimization_object=optimization,
+                   no_particles=5,
+                   no_iteration_steps=1,
+                   warm_start=[[10.0, -10.0], [1.0, 1.0]])
+        warm.solve()
+        assert warm.particles[0].position == [3, -3]
+        assert warm.best == (0.0, [1.0, 1.0])
+        for value, _position in warm.solve_batch(3):
+            assert value == 0.0
+        with pytest.raises(ValueError):
+            PSO(optimization_object=optimization, warm_start=[[1.0]])
+
+    def test_solve_instances(self):
+        batches = list()
+
+        def func(x, parameters):
+            return (x[0] - parameters[0]) ** 2 + (x[1] - parameters[1]) ** 2
+
+        def batch_function(positions, parameters):
+            batches.append(len(positions))
+            return [func(x, p) for x, p in zip(positions, parameters)]
+
+        optimization = Optimization(optimizing_function=func,
+                                    batch_function=batch_function,
+                                    boundaries=[(-5, 5), (-5, 5)],
+                                    no_dimensions=2)
+        pso = PSO(optimization_object=optimization,
+                  no_particles=10,
+                  no_iteration_steps=50,
+                  inertia=0.7)
+        instances = [(1.0, 2.0), (-3.0, 0.5), (4.0, -4.0)]
+        results = pso.solve_instances(instances)
+        assert batches == [3 * 10] * 50
+        assert len(results) == 3
+        for (value, position), instance in zip(results, instances):
+            assert value == func(position, instance)
+            assert value <= 1e-2
+
+        # Without batch function, each instance is evaluated on its own.
+        optimization.batch_func = None
+        results = pso.solve_instances(instances, Pool(2))
+        for (value, position), instance in zip(results, instances):
+            assert value <= 1e-2
+
+    def test___copy__(self, fix_optimization_object):
+        pso_1 = PSO(optimization_object=fix_optimization_object,
+                    c_1=1.5, c_2=0.5, inertia=0.7)
+        pso_2 = copy(pso_1)
+        assert pso_2.learning_factors == (1.5, 0.5)
+        assert pso_2.inertia == 0.7
+
     def test_himmelblau(self):
         pso = PSO(optimization_object=HIMMELBLAU['optimization'],
                   no_particles=140,
@@ -0,0 +1,74 @@
+"""Test py_opt_collection.results_store module."""
+
+import pytest
+from py_opt_collection.optimization import MultipleSolving
+from py_opt_collection.pso import PSO
+from py_opt_collection.results_store import ResultsStore, settings
+from py_opt_collection.test_functions import HIMMELBLAU
+
+
+def _trials(values):
+    return [{'seed': 2 ** 64 - i, 'value': value, 'position': [value, 0.5],
+             'time': 0.25, 'stop_reason': 'max_iterations'}
+            for i, value in enumerate(values)]
+
+
+class TestResultsStore(object):
+    """Tests for py_opt_collection.results_store.ResultsStore class."""
+
+    def test_add_trials(self):
+        with ResultsStore() as store:
+            first = store.add_trials(_trials([1.0, 2.0, 3.0]), 'sphere',
+                                     'PSO', {'no_particles': 10})
+            second = store.add_trials(_trials([4.0]), 'sphere', 'PSO',
+                                      {'no_particles': 20})
+            # The same configuration is stored once.
+            assert store.add_trials(_trials([5.0]), 'other', 'PSO',
+                                    {'no_particles': 10}) == first
+            assert first != second
+
+            assert [c[0] for c in store.configurations(no_particles=20)] == \
+                [second]
+            assert store.configurations('DE') == []
+
+            trials = list(store.trials('sphere', first))
+            assert [trial['value'] for trial in trials] == [1.0, 2.0, 3.0]
+            assert trials[1]['seed'] == 2 ** 64 - 1
+            assert trials[1]['position'] == [2.0, 0.5]
+            assert len(list(store.trials(configuration_id=[first]))) == 4
+            assert list(store.trials(stop_reason='time_budget')) == []
+
+            stats = store.aggregate('sphere', target=1.5, max_error=0.6)
+            assert len(stats) == 2
+            assert stats[0]['settings'] == {'no_particles': 10}
+            assert stats[0]['count'] == 3
+            assert stats[0]['mean'] == pytest.approx(2.0)
+            assert stats[0]['variance'] == pytest.approx(1.0)
+            assert (stats[0]['minimum'], stats[0]['maximum']) == (1.0, 3.0)
+            assert stats[0]['mean_time'] == pytest.approx(0.25)
+            assert stats[0]['success_rate'] == pytest.approx(2 / 3.0)
+            assert stats[1]['variance'] is None
+            assert store.aggregate('other')[0]['success_rate'] is None
+
+    def test_add(self, tmpdir):
+        path = str(tmpdir.join('results.sqlite'))
+        pso = PSO(optimization_object=HIMMELBLAU['optimization'],
+                  no_particles=8,
+                  no_iteration_steps=10)
+        ms = MultipleSolving(pso, 4)
+        ms.run()
+        assert settings(pso)['no_particles'] == 8
+        with ResultsStore(path) as store:
+            configuration_id = store.add(ms, problem='himmelblau')
+        with ResultsStore(path) as store:
+            trials = list(store.trials('himmelblau'))
+            assert [trial['configuration_id'] for trial in trials] == \
+                [configuration_id] * 4
+            assert sorted(trial['value'] for trial in trials) == \
+                ms.results_value_only
+            assert store.aggregate()[0]['algorithm'] == 'PSO'
+
+        # A stored trial is reproduced from its seed.
+        trial = trials[0]
+        assert pso.copy_trial(seed=trial['seed']).solve()[0] == \
+            trial['value']
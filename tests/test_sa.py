@@ -0,0 +1,120 @@
+"""Test py_opt_collection.sa 's classes."""
+
+import pytest
+from py_opt_collection.sa import SimulatedAnnealing
+from py_opt_collection.optimization import Optimization, MultipleSolving
+from py_opt_collection.test_functions import HIMMELBLAU
+
+
+class TestSimulatedAnnealing(object):
+    """Tests for py_opt_collection.sa.SimulatedAnnealing class."""
+
+    def test___init__(self, fix_optimization_object):
+        sa_1 = SimulatedAnnealing(optimization_object=fix_optimization_object,
+                                  no_replicas=6,
+                                  no_iteration_steps=30,
+                                  temperature_range=(0.1, 5.0),
+                                  cooling=0.99,
+                                  step_size=0.2,
+                                  swap_interval=5)
+        assert sa_1.optimization_object == fix_optimization_object
+        assert sa_1.no_replicas == 6
+        assert sa_1.no_iteration_steps == 30
+        assert sa_1.temperature_range == (0.1, 5.0)
+        assert sa_1.cooling == 0.99
+        assert sa_1.step_size == 0.2
+        assert sa_1.swap_interval == 5
+        assert isinstance(sa_1.positions, list)
+
+        with pytest.raises(ValueError):
+            SimulatedAnnealing(optimization_object=fix_optimization_object,
+                               no_replicas=0)
+        with pytest.raises(ValueError):
+            SimulatedAnnealing(optimization_object=fix_optimization_object,
+                               temperature_range=(1.0, 0.1))
+
+    def test_solve(self, fix_optimization_object, capsys):
+        fix_optimization_object.random_generator.seed(2018)
+        sa_1 = SimulatedAnnealing(optimization_object=fix_optimization_object,
+                                  no_replicas=6,
+                                  no_iteration_steps=100,
+                                  historical=True,
+                                  verbose=True)
+        result = sa_1.solve()
+        assert isinstance(result, tuple)
+        assert result[0] <= -4.1
+        assert fix_optimization_object.check_constraints(result[1])
+        assert sa_1.snapshots.__len__() == 100
+        assert sa_1.temperatures[0] == pytest.approx(0.01)
+        assert sa_1.temperatures[-1] == pytest.approx(10.0)
+        assert sa_1.no_accepted > 0
+        assert sa_1.no_swaps > 0
+        for position in sa_1.positions:
+            assert fix_optimization_object.check_constraints(position)
+        out, err = capsys.readouterr()
+        for i in range(100):
+            assert out.find("Iteration step #%d" % i) > -1
+
+    def test_deterministic(self, fix_optimization_object):
+        results = list()
+        for _i in range(2):
+            fix_optimization_object.random_generator.seed(2018)
+            results.append(SimulatedAnnealing(
+                optimization_object=fix_optimization_object,
+                no_iteration_steps=10
+            ).solve())
+        assert results[0] == results[1]
+
+    def test_vectorized(self):
+        pytest.importorskip('numpy')
+        optimization = Optimization(
+            optimizing_function=lambda x: (x[0] - 1) ** 2 + (x[1] + 2) ** 2,
+            boundaries=[(-5, 5), (-5, 5), (2, 2)],
+            no_dimensions=3,
+            seed=2018
+        )
+        sa_1 = SimulatedAnnealing(optimization_object=optimization,
+                                  no_iteration_steps=300)
+        sa_1.solve()
+        assert sa_1.random_state is not None
+        assert sa_1.best[0] < 1e-2
+
+        # Large moves are reflected inside the boundaries, with or without
+        # NumPy.
+        for random_state in [sa_1.random_state, None]:
+            sa_1.random_state = random_state
+            proposals = sa_1._propose_all([3.0] * sa_1.no_replicas)
+            assert len(proposals) == sa_1.no_replicas
+            for proposal in proposals:
+                assert all(-5 <= x <= 5 for x in proposal[:2])
+                assert proposal[2] == 2
+
+    def test_variable_types(self):
+        optimization = Optimization(
+            optimizing_function=lambda x: (x[0] - 7) ** 2 + (x[1] - 2) ** 2,
+            boundaries=[(-20, 20), (-5.5, 5.5)],
+            no_dimensions=2,
+            variable_types=['integer', 'integer'],
+            seed=2018
+        )
+        sa_1 = SimulatedAnnealing(optimization_object=optimization,
+                                  no_iteration_steps=200)
+        assert sa_1.solve() == (0, [7, 2])
+        for position in sa_1.positions:
+            assert all(isinstance(x, int) for x in position)
+
+    def test_himmelblau(self):
+        HIMMELBLAU['optimization'].random_generator.seed(2018)
+        sa_1 = SimulatedAnnealing(optimization_object=HIMMELBLAU[
+            'optimization'
+        ], no_replicas=10, no_iteration_steps=400, cooling=0.99)
+        sa_1.solve()
+        assert sa_1.best[0] < 1e-2
+
+    def test_multiple_solving(self, fix_optimization_object):
+        sa_1 = SimulatedAnnealing(optimization_object=fix_optimization_object,
+                                  no_iteration_steps=20)
+        ms = MultipleSolving(sa_1, 5)
+        ms.run()
+        assert ms.is_run
+        assert len(ms.results) == 5
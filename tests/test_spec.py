@@ -0,0 +1,134 @@
+"""Test py_opt_collection.spec module."""
+
+import json
+import pickle
+import sys
+import pytest
+from multiprocessing import Pool
+from py_opt_collection.pso import PSO
+from py_opt_collection.spec import ProblemSpec, Reference, parse_spec, \
+    load_spec, resolve
+
+
+SPEC = {
+    'variables': [
+        {'name': 'x', 'lower': -5, 'upper': 5},
+        {'name': 'n', 'lower': 0.5, 'upper': 10.5, 'type': 'integer'},
+        {'name': 'mode', 'values': [0.5, 1.5, 4.0]}
+    ],
+    'objective': '(x - 1) ** 2 + (n - 3) ** 2 + mode',
+    'constraints': ['x + n <= 12', {'expression': 'x >= -4'}],
+    'linear_constraints': {'a_ub': [[1, 1, 0]], 'b_ub': [12]},
+    'seed': 7,
+    'solver': {'algorithm': 'pso', 'no_particles': 10,
+               'no_iteration_steps': 30, 'inertia': 0.7}
+}
+
+
+def batch_objective(positions):
+    """Importable batch function of the tests."""
+    return [sum(position) for position in positions]
+
+
+class TestProblemSpec(object):
+    """Tests for py_opt_collection.spec.ProblemSpec class."""
+
+    def test_optimization(self):
+        optimization = ProblemSpec(SPEC).optimization()
+        assert optimization.boundaries == [(-5, 5), (1, 10), (0, 2)]
+        assert optimization.variable_types == \
+            ['continuous', 'integer', [0.5, 1.5, 4.0]]
+        assert optimization.seed == 7
+        assert optimization.evaluate([2.0, 4, 1]) == 1.0 + 1 + 1.5
+        assert optimization.check_constraints([2.0, 4, 1])
+        assert not optimization.check_constraints([-4.5, 4, 1])
+        assert not optimization.check_constraints([4.0, 9, 1])
+        assert len(optimization.linear_constraints) == 1
+        assert ProblemSpec(SPEC).optimization(seed=3).seed == 3
+
+    def test_solver(self):
+        spec = ProblemSpec(SPEC)
+        pso = spec.solver()
+        assert isinstance(pso, PSO)
+        assert pso.no_particles == 10
+        value, position = pso.solve()
+        assert value <= 0.6
+        assert spec.solver(no_particles=4).no_particles == 4
+
+    def test_references(self):
+        data = dict(SPEC, objective={'function': 'math:fsum'},
+                    batch_objective={
+                        'function': 'tests.test_spec:batch_objective'
+                    })
+        optimization = ProblemSpec(data).optimization()
+        assert optimization.evaluate([1.5, 2, 0]) == 4.0
+        assert optimization.evaluate_batch([[1.5, 2, 0]]) == [4.0]
+        assert resolve('os.path:join') is __import__('os').path.join
+        with pytest.raises(ValueError):
+            resolve('os.path.join')
+        reference = pickle.loads(pickle.dumps(Reference('math:fsum')))
+        assert reference([1, 2]) == 3.0
+
+    def test_invalid(self):
+        for data in [dict(SPEC, variables=[]),
+                     dict(SPEC, variables=[{'name': 'sqrt', 'lower': 0,
+                                            'upper': 1}]),
+                     dict(SPEC, variables=[{'name': 'x', 'lower': 0,
+                                            'upper': 1}] * 2),
+                     dict(SPEC, objective='y + 1')]:
+            with pytest.raises(ValueError):
+                ProblemSpec(data)
+        data = dict(SPEC, variables=[{'lower': 0, 'upper': 1,
+                                      'type': 'complex'}],
+                    objective='x0', constraints=[], linear_constraints=None)
+        with pytest.raises(ValueError):
+            ProblemSpec(data).optimization()
+
+    def test_pickle(self):
+        """Optimizations built from a spec pickle without any closure and
+        are evaluated in worker processes."""
+        optimization = ProblemSpec(SPEC).optimization()
+        copied = pickle.loads(pickle.dumps(optimization))
+        assert copied.evaluate([2.0, 4, 1]) == 3.5
+        assert copied.random_generator.random() == \
+            optimization.random_generator.random()
+        positions = [[2.0, 4, 1], [0.0, 3, 0], [1.0, 3, 2]]
+        with Pool(2) as pool:
+            assert optimization.evaluate_batch(positions, pool) == \
+                [3.5, 1.5, 4.0]
+        assert 'Optimization Function' in repr(optimization)
+        assert '(x - 1) ** 2' in repr(optimization)
+
+
+def test_parse_spec(tmpdir):
+    text = json.dumps(SPEC)
+    assert parse_spec(text).data == SPEC
+    assert json.loads(parse_spec(text).to_json()) == SPEC
+    path = tmpdir.join('problem.json')
+    path.write(text)
+    assert load_spec(str(path)).data == SPEC
+    with pytest.raises(ValueError):
+        parse_spec(text, 'yaml')
+
+    toml = '\n'.join([
+        'objective = "x * y"',
+        'find_max = true',
+        '[[variables]]',
+        'name = "x"',
+        'lower = 0',
+        'upper = 2',
+        '[[variables]]',
+        'name = "y"',
+        'lower = 0',
+        'upper = 3',
+        '[solver]',
+        'algorithm = "de"'
+    ])
+    path = tmpdir.join('problem.toml')
+    path.write(toml)
+    if sys.version_info < (3, 11):
+        pytest.importorskip('tomli')
+    spec = load_spec(str(path))
+    assert spec.names == ['x', 'y']
+    assert spec.optimization().evaluate([2, 3]) == 6
+    assert type(spec.solver()).__name__ == 'DE'
@@ -0,0 +1,90 @@
+"""Test py_opt_collection.surrogate module."""
+
+import pytest
+from py_opt_collection.optimization import Optimization
+from py_opt_collection.pso import PSO
+from py_opt_collection.surrogate import KNNSurrogate, RBFSurrogate
+
+
+def _sphere(x):
+    return sum(v ** 2 for v in x)
+
+
+class TestKNNSurrogate(object):
+    """Tests for py_opt_collection.surrogate.KNNSurrogate class."""
+
+    def test_predict(self):
+        surrogate = KNNSurrogate(no_neighbors=2)
+        with pytest.raises(ValueError):
+            surrogate.predict([0.0])
+        surrogate.add([0.0], 0.0)
+        surrogate.add([1.0], 1.0)
+        surrogate.add([3.0], 9.0)
+        assert len(surrogate) == 3
+        assert surrogate.predict([1.0]) == 1.0
+        assert surrogate.predict([0.5]) == 0.5
+        assert [d[1] for d in surrogate.nearest([2.9])] == [2, 1]
+        assert surrogate.predict_batch([[0.0], [3.0]]) == [0.0, 9.0]
+
+
+class TestRBFSurrogate(object):
+    """Tests for py_opt_collection.surrogate.RBFSurrogate class."""
+
+    def test_predict(self):
+        surrogate = RBFSurrogate(no_neighbors=9)
+        for i in range(-2, 3):
+            for j in range(-2, 3):
+                surrogate.add([i, j], _sphere([i, j]))
+        assert surrogate.predict([1, 1]) == 2
+        assert abs(surrogate.predict([0.5, 0.5]) - 0.5) < 0.2
+        assert abs(surrogate.predict([1.5, -0.5]) - 2.5) < 0.3
+
+        # Duplicated positions fall back to k-nearest neighbors.
+        surrogate = RBFSurrogate(no_neighbors=2)
+        surrogate.add([1.0], 1.0)
+        surrogate.add([1.0], 1.0)
+        assert surrogate.predict([0.0]) == 1.0
+        surrogate.clear()
+        assert len(surrogate) == 0
+
+
+class TestSurrogatePSO(object):
+    """Tests for PSO with surrogate screening."""
+
+    def test_solve(self):
+        results = dict()
+        for surrogate in [None, RBFSurrogate()]:
+            opt_object = Optimization(
+                optimizing_function=_sphere,
+                boundaries=[(-5.0, 5.0)] * 3,
+                no_dimensions=3,
+                seed=2018
+            )
+            pso = PSO(optimization_object=opt_object,
+                      no_particles=20,
+                      no_iteration_steps=40,
+                      inertia=0.7,
+                      surrogate=surrogate,
+                      surrogate_ratio=0.2,
+                      profiling=True)
+            pso.solve()
+            results[surrogate is None] = (
+                pso.best[0],
+                pso.profiler.report()['objective_calls']['count']
+            )
+        assert results[True][1] == 20 * 40
+        assert results[False][1] < results[True][1] / 3.0
+        assert results[False][0] < 1e-2
+
+        # Each solve, and each trial, starts with an empty surrogate.
+        size = len(pso.surrogate)
+        pso.solve()
+        assert len(pso.surrogate) == size
+        trial = pso.copy_trial()
+        trial.solve()
+        assert len(trial.surrogate) == size
+
+        with pytest.raises(ValueError):
+            PSO(optimization_object=opt_object,
+                update_mode='steady_state',
+                surrogate=KNNSurrogate())
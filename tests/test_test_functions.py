@@ -0,0 +1,48 @@
+"""Test py_opt_collection.test_functions module."""
+
+import subprocess
+import sys
+from py_opt_collection import test_functions
+from py_opt_collection.test_functions import himmelblau, rosenbrock, \
+    LazyProblem
+
+
+def test_factories():
+    """Each call builds a new problem, with its own random generator."""
+    for factory in [himmelblau, rosenbrock]:
+        problem_1 = factory(seed=2018)
+        problem_2 = factory(seed=2018)
+        assert problem_1['optimization'] is not problem_2['optimization']
+        assert problem_1['optimization'].random_generator.random() == \
+            problem_2['optimization'].random_generator.random()
+        for value, position in problem_1['results']:
+            assert abs(problem_1['optimization'].func(position) - value) \
+                < 1e-9
+
+
+def test_lazy_problem():
+    calls = list()
+
+    def factory():
+        calls.append(1)
+        return himmelblau()
+
+    problem = LazyProblem(factory)
+    assert calls == []
+    assert problem['optimization'] is problem['optimization']
+    assert sorted(problem) == ['optimization', 'results']
+    assert len(problem) == 2
+    assert calls == [1]
+    assert isinstance(test_functions.HIMMELBLAU, LazyProblem)
+
+
+def test_light_import():
+    """Importing the package's modules does not load the heavy standard
+    modules, nor build any problem."""
+    code = "import sys\n" \
+           "from py_opt_collection import test_functions, pso, de\n" \
+           "assert test_functions.HIMMELBLAU._problem is None\n" \
+           "for name in ['inspect', 'statistics', 'concurrent.futures',\n" \
+           "             'numpy', 'scipy']:\n" \
+           "    assert name not in sys.modules, name\n"
+    subprocess.check_call([sys.executable, '-c', code])
@@ -0,0 +1,88 @@
+"""Test py_opt_collection.topologies module."""
+
+import pytest
+from random import Random
+from py_opt_collection.topologies import GlobalTopology, RingTopology, \
+    VonNeumannTopology, RandomTopology, DynamicTopology, get_topology
+from py_opt_collection.pso import PSO
+from py_opt_collection.test_functions import HIMMELBLAU
+
+
+VALUES = [5, 3, 8, 1, 9, 7, 2, 6]
+
+
+class TestTopologies(object):
+    """Tests for the topology classes."""
+
+    def test_global(self):
+        topology = GlobalTopology()
+        neighborhoods = topology.connect(len(VALUES), Random(1))
+        assert neighborhoods is None
+        assert topology.best_indexes(VALUES, neighborhoods, False) == \
+            [3] * len(VALUES)
+        assert topology.best_index(0, VALUES, neighborhoods, True) == 4
+        assert not topology.rewire(False)
+
+    def test_ring(self):
+        topology = RingTopology()
+        neighborhoods = topology.connect(len(VALUES), Random(1))
+        assert neighborhoods[0] == [7, 0, 1]
+        assert topology.best_indexes(VALUES, neighborhoods, False) == \
+            [1, 1, 3, 3, 3, 6, 6, 6]
+        assert topology.best_indexes(VALUES, neighborhoods, True) == \
+            [7, 2, 2, 4, 4, 4, 5, 7]
+        for i in range(len(VALUES)):
+            assert topology.best_index(i, VALUES, neighborhoods, False) == \
+                topology.best_indexes(VALUES, neighborhoods, False)[i]
+
+        topology = RingTopology(no_neighbors=4)
+        assert topology.best_indexes(VALUES, None, False) == \
+            [3] * len(VALUES)
+
+        # Ties are broken by the lowest index, even across the end of the
+        # ring, by both functions.
+        topology = RingTopology()
+        values = [0, 3, 3, 3, 3, 0, None, 1]
+        neighborhoods = topology.connect(len(values), Random(1))
+        for find_max, expected in [(False, [0, 0, 1, 2, 5, 5, 5, 0]),
+                                   (True, [1, 1, 1, 2, 3, 4, 7, 7])]:
+            assert topology.best_indexes(values, neighborhoods,
+                                         find_max) == expected
+            for i in range(len(values)):
+                assert topology.best_index(i, values, neighborhoods,
+                                           find_max) == expected[i]
+
+    def test_von_neumann(self):
+        topology = VonNeumannTopology()
+        neighborhoods = topology.connect(len(VALUES), Random(1))
+        # 2 x 4 grid
+        assert neighborhoods[0] == [0, 1, 3, 4]
+        assert neighborhoods[5] == [1, 4, 5, 6]
+        assert topology.best_indexes(VALUES, neighborhoods, False)[5] == 6
+
+    def test_random(self):
+        topology = RandomTopology(no_informed=2)
+        neighborhoods = topology.connect(len(VALUES), Random(1))
+        for i, neighborhood in enumerate(neighborhoods):
+            assert i in neighborhood
+        assert DynamicTopology().rewire(False)
+        assert not DynamicTopology().rewire(True)
+
+    def test_get_topology(self):
+        assert isinstance(get_topology(None), GlobalTopology)
+        assert isinstance(get_topology('ring'), RingTopology)
+        topology = RingTopology(2)
+        assert get_topology(topology) is topology
+        with pytest.raises(ValueError):
+            get_topology('star')
+
+    def test_pso(self):
+        HIMMELBLAU['optimization'].random_generator.seed(2018)
+        for topology in ['ring', 'von_neumann', 'random', 'dynamic']:
+            pso = PSO(optimization_object=HIMMELBLAU['optimization'],
+                      no_particles=30,
+                      no_iteration_steps=60,
+                      inertia=(0.9, 0.4),
+                      topology=topology)
+            pso.solve()
+            assert pso.best[0] < 1e-2
@@ -1,6 +1,8 @@
 """Test py_opt_collection.utils module."""
 
-from py_opt_collection.utils import is_better
+import pytest
+from py_opt_collection.utils import is_better, solve_linear_system, \
+    dominates
 
 
 def test_is_better():
@@ -39,3 +41,28 @@ def test_is_better():
             assert is_better(i, j, False)
         for j in greater_equal_comparing_values:
             assert not is_better(i, j, False)
+
+
+def test_solve_linear_system():
+    """Test utils.solve_linear_system() function, including a system which
+    needs pivoting and a singular one."""
+
+    solution = solve_linear_system([[0, 2, 1], [1, 1, 1], [2, 1, 0]],
+                                   [7, 6, 4])
+    for value, expected in zip(solution, [1.0, 2.0, 3.0]):
+        assert abs(value - expected) < 1e-12
+    with pytest.raises(ValueError):
+        solve_linear_system([[1, 2], [2, 4]], [1, 2])
+
+
+def test_dominates():
+    """Test utils.dominates() function, with a common and a per objective
+    find_max."""
+
+    assert dominates((1, 2), (2, 2), False)
+    assert not dominates((2, 2), (1, 2), False)
+    assert not dominates((1, 2), (1, 2), False)
+    assert not dominates((1, 3), (2, 2), False)
+    assert dominates((2, 2), (1, 2), True)
+    assert dominates((5, 1), (4, 2), [True, False])
+    assert not dominates((5, 3), (4, 2), [True, False])
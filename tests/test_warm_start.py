@@ -0,0 +1,28 @@
+"""Test py_opt_collection.warm_start module."""
+
+import pytest
+from py_opt_collection.warm_start import warm_positions, shift_horizon
+
+
+def test_warm_positions():
+    positions = [[1.0, 2.0], [3.0, 4.0]]
+    assert warm_positions(positions) == positions
+    assert warm_positions([(0.5, [1.0, 2.0]), (0.7, (3.0, 4.0))]) == \
+        positions
+
+
+def test_shift_horizon():
+    positions = [[1, 2, 3, 4, 5, 6]]
+    assert shift_horizon(positions, 2) == [[3, 4, 5, 6, 5, 6]]
+    assert shift_horizon(positions, 2, fill=[0, 0]) == [[3, 4, 5, 6, 0, 0]]
+    assert shift_horizon(positions, 2, newest_first=True) == \
+        [[1, 2, 1, 2, 3, 4]]
+    # Extend the horizon by one period.
+    assert shift_horizon(positions, 3, no_dropped=0) == \
+        [[1, 2, 3, 4, 5, 6, 4, 5, 6]]
+    assert shift_horizon(positions, 2, no_added=0, no_dropped=1) == \
+        [[3, 4, 5, 6]]
+    with pytest.raises(ValueError):
+        shift_horizon(positions, 4)
+    with pytest.raises(ValueError):
+        shift_horizon(positions, 6)